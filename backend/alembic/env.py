@@ -11,9 +11,12 @@ from alembic import context
 from sqlmodel import SQLModel
 # Ensure all models are imported so SQLModel.metadata contains them
 from app.models.user_models import User # noqa
-from app.models.pantry_models import PantryItem # noqa
+from app.models.pantry_models import PantryExpiryAlert, PantryItem, PantryItemTombstone # noqa
 from app.models.recipe_models import Recipe, RecipeIngredient # noqa
 from app.models.user_preference_models import UserPreference # noqa
+from app.models.collection_version_models import CollectionVersion # noqa
+from app.models.ingredient_models import Ingredient # noqa
+from app.models.recipe_stats_models import RecipeStats # noqa
 
 
 # this is the Alembic Config object, which provides
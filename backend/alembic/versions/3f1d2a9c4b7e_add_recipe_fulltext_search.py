@@ -0,0 +1,80 @@
+"""add_recipe_fulltext_search
+
+Revision ID: 3f1d2a9c4b7e
+Revises: 7775bfacd9f6
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1d2a9c4b7e'
+down_revision: Union[str, None] = '7775bfacd9f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# SQLite: external-content FTS5 table kept in sync by triggers, as created by
+# app.db.fulltext for new databases (frozen copy at this revision)
+SQLITE_UPGRADE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS recipe_fts USING fts5("
+    "recipe_name, instructions, content='recipe', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS recipe_fts_ai AFTER INSERT ON recipe BEGIN "
+    "INSERT INTO recipe_fts(rowid, recipe_name, instructions) "
+    "VALUES (new.id, new.recipe_name, new.instructions); END",
+    "CREATE TRIGGER IF NOT EXISTS recipe_fts_ad AFTER DELETE ON recipe BEGIN "
+    "INSERT INTO recipe_fts(recipe_fts, rowid, recipe_name, instructions) "
+    "VALUES ('delete', old.id, old.recipe_name, old.instructions); END",
+    "CREATE TRIGGER IF NOT EXISTS recipe_fts_au AFTER UPDATE OF recipe_name, instructions ON recipe BEGIN "
+    "INSERT INTO recipe_fts(recipe_fts, rowid, recipe_name, instructions) "
+    "VALUES ('delete', old.id, old.recipe_name, old.instructions); "
+    "INSERT INTO recipe_fts(rowid, recipe_name, instructions) "
+    "VALUES (new.id, new.recipe_name, new.instructions); END",
+    # Index the recipes that already exist
+    "INSERT INTO recipe_fts(recipe_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS recipe_fts_au",
+    "DROP TRIGGER IF EXISTS recipe_fts_ad",
+    "DROP TRIGGER IF EXISTS recipe_fts_ai",
+    "DROP TABLE IF EXISTS recipe_fts",
+]
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for statement in SQLITE_UPGRADE:
+            op.execute(statement)
+        return
+    if dialect != 'postgresql':
+        return
+    # Generated tsvector (Portuguese + English, name weighted above instructions)
+    # served by a GIN index. Replaces the leading-wildcard ilike recipe search.
+    op.execute(
+        "ALTER TABLE recipe ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        "GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('portuguese', coalesce(recipe_name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(recipe_name, '')), 'A') || "
+        "setweight(to_tsvector('portuguese', coalesce(instructions, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(instructions, '')), 'B')"
+        ") STORED"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_recipe_search_vector ON recipe USING GIN (search_vector)")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for statement in SQLITE_DOWNGRADE:
+            op.execute(statement)
+        return
+    if dialect != 'postgresql':
+        return
+    op.execute("DROP INDEX IF EXISTS ix_recipe_search_vector")
+    op.execute("ALTER TABLE recipe DROP COLUMN IF EXISTS search_vector")
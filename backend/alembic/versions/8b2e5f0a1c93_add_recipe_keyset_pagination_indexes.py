@@ -0,0 +1,33 @@
+"""add_recipe_keyset_pagination_indexes
+
+Revision ID: 8b2e5f0a1c93
+Revises: 3f1d2a9c4b7e
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e5f0a1c93'
+down_revision: Union[str, None] = '3f1d2a9c4b7e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # (owner, sort key, id) indexes for keyset pagination of GET /recipes
+    op.create_index('ix_recipe_owner_created_at_id', 'recipe', ['created_by_user_id', 'created_at', 'id'])
+    op.create_index('ix_recipe_owner_calories_id', 'recipe', ['created_by_user_id', 'estimated_calories', 'id'])
+    op.create_index('ix_recipe_owner_prep_time_id', 'recipe', ['created_by_user_id', 'preparation_time_minutes', 'id'])
+    op.create_index('ix_recipe_owner_name_id', 'recipe', ['created_by_user_id', 'recipe_name', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_recipe_owner_name_id', table_name='recipe')
+    op.drop_index('ix_recipe_owner_prep_time_id', table_name='recipe')
+    op.drop_index('ix_recipe_owner_calories_id', table_name='recipe')
+    op.drop_index('ix_recipe_owner_created_at_id', table_name='recipe')
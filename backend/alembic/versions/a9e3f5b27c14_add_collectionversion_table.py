@@ -0,0 +1,32 @@
+"""add_collectionversion_table
+
+Revision ID: a9e3f5b27c14
+Revises: d4a7c2e91f60
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9e3f5b27c14'
+down_revision: Union[str, None] = 'd4a7c2e91f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Per-user recipe / pantry version counters backing ETags
+    op.create_table('collectionversion',
+        sa.Column('scope', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('scope')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('collectionversion')
@@ -0,0 +1,44 @@
+"""add_recipe_stats
+
+Revision ID: b7d3e9f41a26
+Revises: f2c9a7d15e38
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d3e9f41a26'
+down_revision: Union[str, None] = 'f2c9a7d15e38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'recipe_stats',
+        sa.Column('recipe_id', sa.Integer(), nullable=False),
+        sa.Column('views', sa.Integer(), nullable=False),
+        sa.Column('imports', sa.Integer(), nullable=False),
+        sa.Column('cooked', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['recipe_id'], ['recipe.id'], ),
+        sa.PrimaryKeyConstraint('recipe_id')
+    )
+    op.create_index(op.f('ix_recipe_stats_views'), 'recipe_stats', ['views'], unique=False)
+    op.create_index(op.f('ix_recipe_stats_imports'), 'recipe_stats', ['imports'], unique=False)
+    op.create_index(op.f('ix_recipe_stats_cooked'), 'recipe_stats', ['cooked'], unique=False)
+    # Imports are counted on the canonical recipe of a source (crud_recipe.get_source_recipe_id)
+    op.create_index('ix_recipe_source_id', 'recipe', ['source_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_recipe_source_id', table_name='recipe')
+    op.drop_index(op.f('ix_recipe_stats_cooked'), table_name='recipe_stats')
+    op.drop_index(op.f('ix_recipe_stats_imports'), table_name='recipe_stats')
+    op.drop_index(op.f('ix_recipe_stats_views'), table_name='recipe_stats')
+    op.drop_table('recipe_stats')
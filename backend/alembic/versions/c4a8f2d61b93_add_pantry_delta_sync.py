@@ -0,0 +1,49 @@
+"""add_pantry_delta_sync
+
+Revision ID: c4a8f2d61b93
+Revises: b7d3e9f41a26
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a8f2d61b93'
+down_revision: Union[str, None] = 'b7d3e9f41a26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows get version 0: they are part of every client's first full
+    # snapshot, and any later write stamps them with a real version.
+    op.add_column('pantryitem', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.add_column('pantryitem', sa.Column('version', sa.Integer(), nullable=False, server_default=sa.text('0')))
+    op.execute("UPDATE pantryitem SET updated_at = added_at")
+    with op.batch_alter_table('pantryitem') as batch_op:
+        batch_op.alter_column('updated_at', existing_type=sa.DateTime(), nullable=False)
+    op.create_index('ix_pantryitem_user_version', 'pantryitem', ['user_id', 'version'], unique=False)
+
+    op.create_table(
+        'pantryitemtombstone',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('item_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_pantryitemtombstone_user_version', 'pantryitemtombstone', ['user_id', 'version'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_pantryitemtombstone_user_version', table_name='pantryitemtombstone')
+    op.drop_table('pantryitemtombstone')
+    op.drop_index('ix_pantryitem_user_version', table_name='pantryitem')
+    op.drop_column('pantryitem', 'version')
+    op.drop_column('pantryitem', 'updated_at')
@@ -0,0 +1,80 @@
+"""add_recipeingredient_normalized_name
+
+Revision ID: d4a7c2e91f60
+Revises: 8b2e5f0a1c93
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+import re
+import unicodedata
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a7c2e91f60'
+down_revision: Union[str, None] = '8b2e5f0a1c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+# Frozen copy of app.core.text.normalize_ingredient_name at this revision, so that
+# replaying the migration backfills the same values if the application's version
+# changes later
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize_ingredient_name(value: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    folded = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _WHITESPACE_RE.sub(" ", folded.casefold()).strip()
+
+
+def upgrade() -> None:
+    op.add_column('recipeingredient', sa.Column('normalized_name', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+    op.create_index(op.f('ix_recipeingredient_normalized_name'), 'recipeingredient', ['normalized_name'], unique=False)
+
+    # Backfill with the normalization the application applies on write
+    bind = op.get_bind()
+    ingredients = sa.table(
+        'recipeingredient',
+        sa.column('id', sa.Integer),
+        sa.column('ingredient_name', sa.String),
+        sa.column('normalized_name', sa.String),
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(ingredients.c.id, ingredients.c.ingredient_name)
+            .where(ingredients.c.id > last_id)
+            .order_by(ingredients.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            ingredients.update()
+            .where(ingredients.c.id == sa.bindparam('row_id'))
+            .values(normalized_name=sa.bindparam('name')),
+            [{'row_id': row.id, 'name': _normalize_ingredient_name(row.ingredient_name)} for row in rows]
+        )
+        last_id = rows[-1].id
+
+    # Trigram index for the substring match of the ingredient filter
+    if bind.dialect.name == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_recipeingredient_normalized_name_trgm "
+            "ON recipeingredient USING GIN (normalized_name gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_recipeingredient_normalized_name_trgm")
+    op.drop_index(op.f('ix_recipeingredient_normalized_name'), table_name='recipeingredient')
+    op.drop_column('recipeingredient', 'normalized_name')
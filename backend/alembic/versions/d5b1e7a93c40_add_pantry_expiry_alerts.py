@@ -0,0 +1,41 @@
+"""add_pantry_expiry_alerts
+
+Revision ID: d5b1e7a93c40
+Revises: c4a8f2d61b93
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5b1e7a93c40'
+down_revision: Union[str, None] = 'c4a8f2d61b93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The (user_id, expiration_date) index on pantryitem already exists
+    # (ix_pantryitem_user_expiration); this only adds the daily scan's table.
+    op.create_table(
+        'pantryexpiryalert',
+        sa.Column('item_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('expiration_date', sa.Date(), nullable=False),
+        sa.Column('entered_on', sa.Date(), nullable=False),
+        sa.ForeignKeyConstraint(['item_id'], ['pantryitem.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('item_id')
+    )
+    op.create_index(op.f('ix_pantryexpiryalert_user_id'), 'pantryexpiryalert', ['user_id'], unique=False)
+    op.create_index(op.f('ix_pantryexpiryalert_entered_on'), 'pantryexpiryalert', ['entered_on'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_pantryexpiryalert_entered_on'), table_name='pantryexpiryalert')
+    op.drop_index(op.f('ix_pantryexpiryalert_user_id'), table_name='pantryexpiryalert')
+    op.drop_table('pantryexpiryalert')
@@ -0,0 +1,38 @@
+"""add_hot_query_indexes
+
+Revision ID: e1b8d6a04c27
+Revises: a9e3f5b27c14
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1b8d6a04c27'
+down_revision: Union[str, None] = 'a9e3f5b27c14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Pantry reads filter on the user and sort/filter by expiration
+    op.create_index('ix_pantryitem_user_expiration', 'pantryitem', ['user_id', 'expiration_date'])
+    # Ingredient loads (selectinload, recommendation index) look up by recipe
+    op.create_index(op.f('ix_recipeingredient_recipe_id'), 'recipeingredient', ['recipe_id'])
+    # System recipes in id order; recipes by owner are served by the
+    # ix_recipe_owner_* composites added for keyset pagination
+    op.create_index(
+        'ix_recipe_system_id', 'recipe', ['id'],
+        postgresql_where=sa.text('created_by_user_id IS NULL'),
+        sqlite_where=sa.text('created_by_user_id IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_recipe_system_id', table_name='recipe')
+    op.drop_index(op.f('ix_recipeingredient_recipe_id'), table_name='recipeingredient')
+    op.drop_index('ix_pantryitem_user_expiration', table_name='pantryitem')
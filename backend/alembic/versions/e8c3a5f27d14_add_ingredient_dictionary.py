@@ -0,0 +1,115 @@
+"""add_ingredient_dictionary
+
+Revision ID: e8c3a5f27d14
+Revises: d5b1e7a93c40
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+import re
+import unicodedata
+from typing import Dict, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8c3a5f27d14'
+down_revision: Union[str, None] = 'd5b1e7a93c40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+# Frozen copy of app.core.text.normalize_ingredient_name at this revision, so that
+# replaying the migration backfills the same values if the application's version
+# changes later
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize_ingredient_name(value: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    folded = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _WHITESPACE_RE.sub(" ", folded.casefold()).strip()
+
+
+# (table, column holding the raw name) for every table that references the dictionary
+REFERENCING_TABLES = (('pantryitem', 'item_name'), ('recipeingredient', 'ingredient_name'))
+
+
+def upgrade() -> None:
+    op.create_table(
+        'ingredient',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_ingredient_name'), 'ingredient', ['name'], unique=True)
+
+    for table_name, _ in REFERENCING_TABLES:
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.add_column(sa.Column('canonical_ingredient_id', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key(
+                f'fk_{table_name}_canonical_ingredient_id', 'ingredient', ['canonical_ingredient_id'], ['id']
+            )
+            batch_op.create_index(
+                op.f(f'ix_{table_name}_canonical_ingredient_id'), ['canonical_ingredient_id'], unique=False
+            )
+
+    # Resolve existing rows with the normalization the application uses on
+    # write, one batch of rows (and one dictionary insert) at a time
+    bind = op.get_bind()
+    ingredients = sa.table('ingredient', sa.column('id', sa.Integer), sa.column('name', sa.String))
+    known: Dict[str, int] = {}
+    for table_name, name_column in REFERENCING_TABLES:
+        rows_table = sa.table(
+            table_name,
+            sa.column('id', sa.Integer),
+            sa.column(name_column, sa.String),
+            sa.column('canonical_ingredient_id', sa.Integer),
+        )
+        last_id = 0
+        while True:
+            rows = bind.execute(
+                sa.select(rows_table.c.id, rows_table.c[name_column])
+                .where(rows_table.c.id > last_id)
+                .order_by(rows_table.c.id)
+                .limit(BACKFILL_BATCH_SIZE)
+            ).all()
+            if not rows:
+                break
+            names = {row.id: _normalize_ingredient_name(row[1] or "") for row in rows}
+            missing = sorted({name for name in names.values() if name and name not in known})
+            if missing:
+                known.update(bind.execute(
+                    sa.select(ingredients.c.name, ingredients.c.id).where(ingredients.c.name.in_(missing))
+                ).all())
+                new_names = [name for name in missing if name not in known]
+                if new_names:
+                    bind.execute(ingredients.insert(), [{'name': name} for name in new_names])
+                    known.update(bind.execute(
+                        sa.select(ingredients.c.name, ingredients.c.id).where(ingredients.c.name.in_(new_names))
+                    ).all())
+            updates = [
+                {'row_id': row_id, 'ingredient_id': known[name]}
+                for row_id, name in names.items() if name
+            ]
+            if updates:
+                bind.execute(
+                    rows_table.update()
+                    .where(rows_table.c.id == sa.bindparam('row_id'))
+                    .values(canonical_ingredient_id=sa.bindparam('ingredient_id')),
+                    updates
+                )
+            last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    for table_name, _ in reversed(REFERENCING_TABLES):
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_index(op.f(f'ix_{table_name}_canonical_ingredient_id'))
+            batch_op.drop_constraint(f'fk_{table_name}_canonical_ingredient_id', type_='foreignkey')
+            batch_op.drop_column('canonical_ingredient_id')
+    op.drop_index(op.f('ix_ingredient_name'), table_name='ingredient')
+    op.drop_table('ingredient')
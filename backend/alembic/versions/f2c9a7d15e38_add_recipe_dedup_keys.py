@@ -0,0 +1,127 @@
+"""add_recipe_dedup_keys
+
+Revision ID: f2c9a7d15e38
+Revises: e1b8d6a04c27
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+import hashlib
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Sequence, Set, Tuple, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c9a7d15e38'
+down_revision: Union[str, None] = 'e1b8d6a04c27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+# Attribution line MealDBImportService appends to imported instructions
+MEALDB_ATTRIBUTION_RE = re.compile(r"Recipe imported from The Meal DB \(ID: (\w+)\)")
+
+# Frozen copies of app.core.text.fold_text, folded_words and recipe_content_hash at
+# this revision, so that replaying the migration backfills the same hashes if the
+# application's versions change later
+_WHITESPACE_RE = re.compile(r"\s+")
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _fold_text(value: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    folded = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _WHITESPACE_RE.sub(" ", folded.casefold()).strip()
+
+
+def _folded_words(value: str) -> List[str]:
+    return _WORD_RE.findall(_fold_text(value))
+
+
+def _recipe_content_hash(recipe_name: str, ingredient_names: Iterable[str]) -> str:
+    ingredients = sorted({" ".join(_folded_words(name)) for name in ingredient_names} - {""})
+    content = "\n".join([" ".join(_folded_words(recipe_name)), *ingredients])
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def upgrade() -> None:
+    op.add_column('recipe', sa.Column('content_hash', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=True))
+    op.add_column('recipe', sa.Column('source_id', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=True))
+
+    # Backfill with the fingerprint the application computes on write. Only
+    # the oldest copy of an existing duplicate keeps its keys, so the unique
+    # indexes can be created; the copies themselves are left for users to clean up.
+    bind = op.get_bind()
+    recipes = sa.table(
+        'recipe',
+        sa.column('id', sa.Integer),
+        sa.column('created_by_user_id', sa.Integer),
+        sa.column('recipe_name', sa.String),
+        sa.column('instructions', sa.String),
+        sa.column('content_hash', sa.String),
+        sa.column('source_id', sa.String),
+    )
+    ingredients = sa.table(
+        'recipeingredient',
+        sa.column('recipe_id', sa.Integer),
+        sa.column('ingredient_name', sa.String),
+    )
+    seen: Set[Tuple[str, int, str]] = set()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(recipes.c.id, recipes.c.created_by_user_id, recipes.c.recipe_name, recipes.c.instructions)
+            .where(recipes.c.id > last_id)
+            .order_by(recipes.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        names: Dict[int, list] = {}
+        for recipe_id, name in bind.execute(
+            sa.select(ingredients.c.recipe_id, ingredients.c.ingredient_name)
+            .where(ingredients.c.recipe_id.in_([row.id for row in rows]))
+        ):
+            names.setdefault(recipe_id, []).append(name)
+
+        updates = []
+        for row in rows:
+            owner = row.created_by_user_id or 0
+            content_hash = _recipe_content_hash(row.recipe_name, names.get(row.id, []))
+            match = MEALDB_ATTRIBUTION_RE.search(row.instructions or "")
+            source_id = f"mealdb:{match.group(1)}" if match else None
+            if ("hash", owner, content_hash) in seen:
+                content_hash = None
+            if source_id is not None and ("source", owner, source_id) in seen:
+                source_id = None
+            seen.add(("hash", owner, content_hash))
+            seen.add(("source", owner, source_id))
+            updates.append({'row_id': row.id, 'hash': content_hash, 'source': source_id})
+        bind.execute(
+            recipes.update()
+            .where(recipes.c.id == sa.bindparam('row_id'))
+            .values(content_hash=sa.bindparam('hash'), source_id=sa.bindparam('source')),
+            updates
+        )
+        last_id = rows[-1].id
+
+    op.create_index(
+        'uq_recipe_owner_content_hash', 'recipe',
+        [sa.text('coalesce(created_by_user_id, 0)'), 'content_hash'], unique=True
+    )
+    op.create_index(
+        'uq_recipe_owner_source_id', 'recipe',
+        [sa.text('coalesce(created_by_user_id, 0)'), 'source_id'], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_recipe_owner_source_id', table_name='recipe')
+    op.drop_index('uq_recipe_owner_content_hash', table_name='recipe')
+    op.drop_column('recipe', 'source_id')
+    op.drop_column('recipe', 'content_hash')
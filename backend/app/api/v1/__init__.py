@@ -7,6 +7,7 @@ from app.api.v1.endpoints.gemini import router as gemini_router
 from app.api.v1.endpoints.recommendations import router as recommendations_router
 from app.api.v1.endpoints.user_preferences import router as user_preferences_router
 from app.api.v1.endpoints.mealdb import router as mealdb_router
+from app.api.v1.endpoints.batch import router as batch_router
 
 api_router = APIRouter()
 
@@ -18,3 +19,4 @@ api_router.include_router(gemini_router, prefix="/ai", tags=["ai"])
 api_router.include_router(recommendations_router, prefix="", tags=["recommendations"])
 api_router.include_router(user_preferences_router, prefix="/user", tags=["user-preferences"])
 api_router.include_router(mealdb_router, prefix="/mealdb", tags=["mealdb"])
+api_router.include_router(batch_router, prefix="/batch", tags=["batch"])
@@ -1,5 +1,5 @@
 from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 from sqlmodel import Session
@@ -13,11 +13,21 @@ from app.schemas.token import TokenData
 
 security = HTTPBearer()
 
+# ASGI scope key under which POST /batch passes its (already authenticated)
+# user to its sub-requests; None means the batch itself is anonymous
+BATCH_USER_SCOPE_KEY = "planeats.batch_user"
+
 def get_db() -> Generator[Session, None, None]:
     """Database session dependency"""
     yield from get_db_session()
 
+def _batch_user(request: Request, db: Session) -> Optional[User]:
+    """The batch's user, attached to this request's session without a query"""
+    user = request.scope[BATCH_USER_SCOPE_KEY]
+    return db.merge(user, load=False) if user is not None else None
+
 async def get_current_user(
+    request: Request,
     db: Session = Depends(get_db),
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> User:
@@ -28,6 +38,13 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
+    if BATCH_USER_SCOPE_KEY in request.scope:
+        # Sub-request of POST /batch: the token was already checked once
+        user = _batch_user(request, db)
+        if user is None:
+            raise credentials_exception
+        return user
+    
     try:
         payload = jwt.decode(
             credentials.credentials, 
@@ -59,10 +76,13 @@ async def get_current_active_user(
     return current_user
 
 def get_current_user_optional(
+    request: Request,
     db: Session = Depends(get_db),
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))
 ) -> Optional[User]:
     """Get current user if token is provided, otherwise return None"""
+    if BATCH_USER_SCOPE_KEY in request.scope:
+        return _batch_user(request, db)
     if not credentials:
         return None
     
@@ -0,0 +1,150 @@
+import asyncio
+import json
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from fastapi import APIRouter, Depends, Request
+
+from app.api.v1.deps import BATCH_USER_SCOPE_KEY, get_current_user_optional
+from app.models.user_models import User
+from app.schemas.batch import BatchRequest, BatchResponse, BatchSubRequest, BatchSubResponse
+
+router = APIRouter()
+
+API_PREFIX = "/api/v1"
+BATCH_PATH = f"{API_PREFIX}/batch"
+
+# Headers a sub-request may not set itself
+_RESERVED_HEADERS = {"authorization", "host", "content-length", "content-type"}
+
+
+def _split_path(path: str) -> Tuple[str, str]:
+    """Absolute API path and query string of a sub-request path"""
+    path, _, query_string = path.partition("?")
+    if not path.startswith("/"):
+        path = "/" + path
+    if path != API_PREFIX and not path.startswith(API_PREFIX + "/"):
+        path = API_PREFIX + path
+    return path, query_string
+
+
+async def _dispatch(request: Request, sub_request: BatchSubRequest, user: Optional[User]) -> BatchSubResponse:
+    """Run one sub-request through the application in-process and capture its response"""
+    path, query_string = _split_path(sub_request.path)
+    if path.rstrip("/") == BATCH_PATH:
+        return BatchSubResponse(
+            id=sub_request.id, status=400, headers={}, body={"detail": "Batch requests cannot be nested"}
+        )
+
+    status_code, response_headers, raw = await _call_app(request, sub_request, path, query_string, user)
+    if status_code in (307, 308):
+        # Trailing-slash redirects: follow them here instead of making the client do it
+        location = urlsplit(response_headers.get("location", ""))
+        if location.path.startswith(API_PREFIX + "/") and location.netloc in ("", request.url.netloc):
+            status_code, response_headers, raw = await _call_app(
+                request, sub_request, location.path, location.query, user
+            )
+
+    content = None
+    if raw:
+        if response_headers.get("content-type", "").startswith("application/json"):
+            content = json.loads(raw)
+        else:
+            content = raw.decode("utf-8", errors="replace")
+    response_headers.pop("content-length", None)
+    return BatchSubResponse(id=sub_request.id, status=status_code, headers=response_headers, body=content)
+
+
+async def _call_app(
+    request: Request, sub_request: BatchSubRequest, path: str, query_string: str, user: Optional[User]
+) -> Tuple[int, Dict[str, str], bytes]:
+    """(status, headers, body) of one in-process call to the application"""
+
+    body = b"" if sub_request.body is None else json.dumps(sub_request.body).encode()
+    headers = [
+        (name.lower().encode("latin-1"), value.encode("latin-1"))
+        for name, value in sub_request.headers.items() if name.lower() not in _RESERVED_HEADERS
+    ]
+    headers.append((b"content-type", b"application/json"))
+    headers.append((b"content-length", str(len(body)).encode()))
+    authorization = request.headers.get("authorization")
+    if authorization:
+        headers.append((b"authorization", authorization.encode("latin-1")))
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": sub_request.method,
+        "scheme": request.url.scheme,
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query_string.encode(),
+        "headers": headers,
+        "client": request.scope.get("client"),
+        "server": request.scope.get("server"),
+        BATCH_USER_SCOPE_KEY: user,
+    }
+
+    body_sent = False
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # The client never disconnects; wait until the response is complete
+        await asyncio.Event().wait()
+
+    status_code = 500
+    response_headers: Dict[str, str] = {}
+    chunks: List[bytes] = []
+
+    async def send(message: Dict[str, Any]) -> None:
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+            response_headers.update(
+                (name.decode("latin-1"), value.decode("latin-1")) for name, value in message.get("headers", [])
+            )
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await request.app(scope, receive, send)
+    return status_code, response_headers, b"".join(chunks)
+
+
+@router.post("", response_model=BatchResponse)
+async def run_batch(
+    *,
+    request: Request,
+    batch_in: BatchRequest,
+    current_user: Optional[User] = Depends(get_current_user_optional)
+):
+    """
+    Execute several API requests in one round trip
+    
+    The bearer token is checked once for the whole batch and every sub-request
+    runs as that user (or anonymously). Responses come back in request order
+    with the status, headers and body each request would have returned on its own.
+    
+    Consecutive GET requests run concurrently; other methods run one at a
+    time in the order given, so a GET placed after a write sees that write.
+    """
+    responses: List[BatchSubResponse] = []
+    reads: List[BatchSubRequest] = []
+
+    async def flush_reads() -> None:
+        responses.extend(await asyncio.gather(*(_dispatch(request, item, current_user) for item in reads)))
+        reads.clear()
+
+    for item in batch_in.requests:
+        if item.method == "GET":
+            reads.append(item)
+            continue
+        await flush_reads()
+        responses.append(await _dispatch(request, item, current_user))
+    await flush_reads()
+
+    return BatchResponse(responses=responses)
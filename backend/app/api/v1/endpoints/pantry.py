@@ -1,11 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
+import json
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
 from typing import List, Optional
 
 from app.api.v1.deps import get_current_user, get_db
 from app.models.pantry_models import PantryItemCreate, PantryItemRead, PantryItemUpdate
 from app.crud.crud_pantry import pantry as crud_pantry
 from app.models.user_models import User
+from app.core.etag import etag_matches, make_etag, not_modified, request_fingerprint, set_etag
+from app.db.versioning import get_version, pantry_pruned_scope, pantry_scope
+from app.schemas.pantry import (
+    PantryBulkDeleteResponse, PantryBulkItemError, PantryChangesResponse, PantryExpiryAlertRead, PantrySummaryEntry
+)
+from app.services.pantry_import_service import parse_json_items, read_csv_items
 
 router = APIRouter()
 
@@ -26,10 +36,71 @@ def create_pantry_item(
     )
 
 
+@router.post("/items/bulk", response_model=List[PantryItemRead])
+async def upsert_pantry_items_bulk(
+    *,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Add many pantry items for current user in one transaction
+    
+    The body is either a JSON array of pantry items (bare or as {"items": [...]})
+    or, with Content-Type text/csv, a CSV file whose header row names the item
+    fields (item_name, quantity and unit are required). Items with the same name
+    and unit are merged with each other and with existing pantry items:
+    quantities are added up. Returns the resulting items in upload order.
+    
+    The upload is all or nothing: if any item is invalid nothing is written and
+    a 422 lists the errors by array index or CSV line.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    try:
+        if content_type == "text/csv":
+            items, errors, failed = await read_csv_items(request.stream())
+        else:
+            items, errors, failed = parse_json_items(json.loads(await request.body()))
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Could not read the upload: {e}"
+        )
+    
+    if failed:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=[PantryBulkItemError(row=row, error=error).model_dump() for row, error in errors]
+        )
+    
+    saved, _, _ = await run_in_threadpool(
+        crud_pantry.upsert_many, db, objs_in=items, user_id=current_user.id
+    )
+    return saved
+
+
+@router.delete("/items", response_model=PantryBulkDeleteResponse)
+def delete_expired_pantry_items(
+    *,
+    db: Session = Depends(get_db),
+    expired_before: date = Query(..., description="Delete items whose expiration date is before this day"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Delete all of current user's pantry items that expire before a date
+    
+    Runs as a single DELETE statement; items without an expiration date are kept.
+    """
+    deleted = crud_pantry.delete_expired(db=db, user_id=current_user.id, expired_before=expired_before)
+    return PantryBulkDeleteResponse(deleted=deleted)
+
+
 @router.get("/items", response_model=List[PantryItemRead])
 def read_pantry_items(
     *,
     db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     skip: int = 0,
     limit: int = 100,
@@ -43,7 +114,18 @@ def read_pantry_items(
     - **expiring_soon**: Filter items expiring in the next 7 days
     - **sort_by**: Sort by field (item_name, expiration_date, added_at, quantity)  
     - **sort_order**: Sort order (asc, desc)
+    
+    Responses carry an ETag; send it back in If-None-Match to get a 304 when
+    the pantry did not change.
     """
+    # expiring_soon is relative to today, so the date is part of the ETag
+    etag = make_etag(
+        current_user.id, get_version(db, pantry_scope(current_user.id)), date.today(), request_fingerprint(request)
+    )
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
     return crud_pantry.get_multi_by_user(
         db=db, 
         user_id=current_user.id,
@@ -55,6 +137,98 @@ def read_pantry_items(
     )
 
 
+@router.get("/items/changes", response_model=PantryChangesResponse)
+def read_pantry_changes(
+    *,
+    db: Session = Depends(get_db),
+    since: Optional[str] = Query(None, description="next_token from the previous call; omit for a full snapshot"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Delta sync: pantry items changed and ids deleted since a token
+    
+    The first call (without `since`) returns every item. Later calls pass the
+    previous `next_token` and get only the items created or updated and the ids
+    deleted since then; when nothing changed both lists are empty.
+    
+    Deletions are only remembered for PANTRY_TOMBSTONE_RETENTION_DAYS: an older
+    token gets 410 Gone and the client must resync from a full snapshot.
+    """
+    since_version = None
+    if since is not None:
+        if not since.isdigit():
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid sync token")
+        since_version = int(since)
+        if since_version < get_version(db, pantry_pruned_scope(current_user.id)):
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Sync token expired: full resync required (call again without since)"
+            )
+    items, deleted, version = crud_pantry.get_changes(db=db, user_id=current_user.id, since=since_version)
+    return PantryChangesResponse(items=items, deleted=deleted, next_token=str(version))
+
+
+@router.get("/summary", response_model=List[PantrySummaryEntry])
+def read_pantry_summary(
+    *,
+    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Pantry totals per ingredient and unit family for current user
+    
+    Items with the same normalized name are added up when their units belong
+    to the same family: mass in g, volume in ml, countable items in un (e.g.
+    "leite 1 L" + "leite 500 ml" = 1500 ml). Unknown units are only added up
+    with the same unit. Each entry has the earliest expiration and the total
+    calories (calories_per_unit x quantity) of its items.
+    
+    Responses carry an ETag; send it back in If-None-Match to get a 304 when
+    the pantry did not change.
+    """
+    etag = make_etag(current_user.id, get_version(db, pantry_scope(current_user.id)), request_fingerprint(request))
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
+    return [
+        PantrySummaryEntry(**entry)
+        for entry in crud_pantry.summarize_by_user(db=db, user_id=current_user.id)
+    ]
+
+
+@router.get("/expiry-alerts", response_model=List[PantryExpiryAlertRead])
+def read_pantry_expiry_alerts(
+    *,
+    db: Session = Depends(get_db),
+    since: Optional[date] = Query(None, description="Only items that entered the expiry window on or after this day"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Pantry items inside the 7-day expiry window as of the daily expiry scan
+    
+    Meant for notifications: pass the day of the last notification as `since`
+    to get only the items that started expiring after it. Items added or
+    changed since the last scan appear after the next one; use
+    GET /items?expiring_soon=true for an up-to-the-minute list.
+    """
+    today = date.today()
+    return [
+        PantryExpiryAlertRead(
+            item_id=alert.item_id,
+            item_name=item.item_name,
+            quantity=item.quantity,
+            unit=item.unit,
+            expiration_date=alert.expiration_date,
+            days_until_expiration=(alert.expiration_date - today).days,
+            entered_on=alert.entered_on
+        )
+        for alert, item in crud_pantry.get_expiry_alerts(db=db, user_id=current_user.id, since=since)
+    ]
+
+
 @router.get("/items/{item_id}", response_model=PantryItemRead)
 def read_pantry_item(
     *,
@@ -1,12 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import zlib
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session
-from typing import List, Optional
-from pydantic import BaseModel
+from typing import List, Literal, Optional, Union
+from pydantic import BaseModel, ValidationError
 
 from app.api.v1.deps import get_current_user, get_current_user_optional, get_db
-from app.models.recipe_models import RecipeCreate, RecipeRead
-from app.crud.crud_recipe import recipe as crud_recipe
+from app.models.recipe_models import RecipeCreate, RecipeRead, RecipeSummary
+from app.crud.crud_recipe import recipe as crud_recipe, DuplicateRecipeError, RECIPE_SORT_FIELDS
 from app.models.user_models import User
+from app.core.pagination import InvalidCursorError, encode_cursor, decode_cursor
+from app.core.etag import etag_matches, json_with_etag, make_etag, not_modified, request_fingerprint, set_etag
+from app.db.versioning import get_version, recipe_item_scope, recipe_scope
+from app.schemas.recipes import (
+    RecipeBulkCreate, RecipeBulkCreateResponse, RecipeBulkItemResult, RecipeCacheMetrics, RecipeFacets,
+    RecipeImportError, RecipeImportResponse, RecipeSemanticMatch, RecipeSemanticSearchResponse,
+    RecipeSimilarMatch, RecipeSimilarResponse, RecipeTopEntry, RecipeTopResponse
+)
+from app.services.recipe_cache_service import recipe_cache_service
+from app.services.recipe_embedding_service import recipe_embedding_service
+from app.services.recipe_similarity_service import recipe_similarity_service
+from app.services.recipe_stats_service import recipe_stats_service
+from app.services.recipe_transfer_service import describe_validation_error, import_ndjson, iter_export_gzip
 
 router = APIRouter()
 
@@ -15,6 +31,12 @@ class RecipeListResponse(BaseModel):
     total: int
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
+    total_is_estimate: bool = False
+    facets: Optional[RecipeFacets] = None
+
+class RecipeSummaryListResponse(RecipeListResponse):
+    recipes: List[RecipeSummary]
 
 @router.post("/", response_model=RecipeRead)
 def create_recipe(
@@ -25,17 +47,109 @@ def create_recipe(
 ):
     """
     Create new recipe for current user
+    
+    Returns 409 if the user already has the same recipe (same name and
+    ingredients, ignoring case, accents, quantities and ingredient order).
+    """
+    try:
+        return crud_recipe.create_with_user(
+            db=db, 
+            obj_in=recipe_in, 
+            user_id=current_user.id
+        )
+    except DuplicateRecipeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+
+@router.post("/bulk", response_model=RecipeBulkCreateResponse)
+def create_recipes_bulk(
+    *,
+    db: Session = Depends(get_db),
+    bulk_in: RecipeBulkCreate,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Create many recipes for current user in one transaction
+    
+    Every item is validated and inserted independently: the response reports
+    success or the error for each item (by its index in the request) and valid
+    items are created even if others fail.
+    """
+    results: List[Optional[RecipeBulkItemResult]] = [None] * len(bulk_in.recipes)
+    valid_positions = []
+    valid_recipes = []
+    for index, item in enumerate(bulk_in.recipes):
+        try:
+            valid_recipes.append(RecipeCreate.model_validate(item))
+            valid_positions.append(index)
+        except ValidationError as e:
+            results[index] = RecipeBulkItemResult(index=index, success=False, error=describe_validation_error(e))
+    
+    created = crud_recipe.create_many_with_user(db=db, objs_in=valid_recipes, user_id=current_user.id)
+    for index, (recipe_id, error) in zip(valid_positions, created):
+        results[index] = RecipeBulkItemResult(
+            index=index, success=recipe_id is not None, recipe_id=recipe_id, error=error
+        )
+    
+    created_count = sum(1 for result in results if result.success)
+    return RecipeBulkCreateResponse(
+        created=created_count,
+        failed=len(results) - created_count,
+        results=results
+    )
+
+@router.get("/export")
+def export_recipes(
+    *,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Export the current user's recipes as gzipped NDJSON (one RecipeRead per line)
+    
+    The file is streamed from a server-side cursor, so memory use does not depend
+    on the number of recipes. It can be uploaded as-is to POST /recipes/import.
+    """
+    return StreamingResponse(
+        iter_export_gzip(db.get_bind(), current_user.id),
+        media_type="application/gzip",
+        headers={"Content-Disposition": 'attachment; filename="recipes.ndjson.gz"'}
+    )
+
+@router.post("/import", response_model=RecipeImportResponse)
+async def import_recipes(
+    *,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
     """
-    return crud_recipe.create_with_user(
-        db=db, 
-        obj_in=recipe_in, 
-        user_id=current_user.id
+    Import recipes for the current user from an NDJSON request body
+    
+    The body is one recipe per line (the RecipeCreate shape; ids and timestamps
+    from an export are ignored), optionally gzipped. It is parsed incrementally
+    and inserted in batches; invalid lines are reported and skipped.
+    """
+    try:
+        imported, failed, errors = await import_ndjson(db, request.stream(), current_user.id)
+    except (ValueError, zlib.error) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Could not read the upload: {e}"
+        )
+    return RecipeImportResponse(
+        imported=imported,
+        failed=failed,
+        errors=[RecipeImportError(line=line, error=error) for line, error in errors]
     )
 
-@router.get("/", response_model=RecipeListResponse)
+@router.get("/", response_model=Union[RecipeListResponse, RecipeSummaryListResponse])
 def read_recipes(
     *,
     db: Session = Depends(get_db),
+    request: Request,
     current_user: Optional[User] = Depends(get_current_user_optional),
     skip: int = 0,
     limit: int = 100,
@@ -43,9 +157,19 @@ def read_recipes(
     user_created_only: Optional[bool] = Query(None, description="Filter to show only recipes created by the current user"),
     imported_only: Optional[bool] = Query(None, description="Filter to show only recipes imported by the current user"),
     search: Optional[str] = Query(None, description="Search term for recipe name or instructions"), # Added search
+    fuzzy: bool = Query(False, description="Match the search against recipe names, tolerating typos"),
     max_calories: Optional[int] = Query(None, description="Maximum calories per recipe"),
     max_prep_time: Optional[int] = Query(None, description="Maximum preparation time in minutes"),
-    ingredients: Optional[List[str]] = Query(None, description="Filter recipes that contain these ingredients")
+    ingredients: Optional[List[str]] = Query(None, description="Filter recipes that contain these ingredients"),
+    # Ordering and keyset pagination
+    sort_by: Optional[Literal["created_at", "calories", "prep_time", "name"]] = Query(None, description="Sort key (default created_at; searches default to relevance)"),
+    sort_order: Literal["asc", "desc"] = Query("asc", description="Sort order"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous response's next_cursor; replaces skip"),
+    total_mode: Literal["exact", "estimate"] = Query("exact", alias="total", description="'estimate' returns the database's approximate row count for the filters (cheaper on large listings)"),
+    # Projection
+    view: Literal["full", "summary"] = Query("full", description="'summary' returns only the fields needed by list/grid views"),
+    include_ingredient_count: bool = Query(False, description="With view=summary, include each recipe's ingredient count"),
+    facets: bool = Query(False, description="Include facet counts (calorie and prep time buckets, top ingredients) for the filtered recipes")
 ):
     """
     Retrieve recipes with optional filtering
@@ -54,15 +178,63 @@ def read_recipes(
     - user_created_only: Show only recipes created by current user
     - imported_only: Show only recipes imported by current user
     - search: Search term for recipe name or instructions
+    - fuzzy: with search, match recipe names allowing typos (1 edit for words of
+      4-5 letters, 2 for longer ones) instead of the full-text prefix match
     - max_calories: Maximum calories per recipe
     - max_prep_time: Maximum preparation time in minutes
     - ingredients: List of ingredients that recipes must contain
+    
+    Pagination:
+    - skip/limit: offset pagination (kept for backward compatibility)
+    - cursor: keyset pagination - pass the `next_cursor` of the previous page.
+      Pages are ordered by (sort_by, id) so they stay stable and deep pages
+      cost the same as the first one. `next_cursor` is null on the last page
+      and for relevance-ordered searches.
+    
+    Views:
+    - view=full (default): complete recipes with instructions and ingredients
+    - view=summary: id, name, image, calories, prep time, owner and creation date
+      only (plus ingredient_count with include_ingredient_count=true); neither
+      the instructions nor the ingredient rows are read from the database
+    
+    Totals:
+    - total=exact (default): exact match count, computed by the page query itself
+    - total=estimate: planner estimate, flagged with `total_is_estimate`
+      (falls back to an exact count on databases without estimates)
+    
+    Facets:
+    - facets=true adds calorie and prep time bucket counts and the most common
+      ingredients across all recipes matching the filters (not just this page)
+    
+    Responses carry an ETag; send it back in If-None-Match to get a 304 when
+    nothing in the listed collection changed. Pages are also cached server-side
+    under their ETag (see recipe_cache_service).
     """
     # Get user ID if authenticated, otherwise None
     user_id = current_user.id if current_user else None
     
-    # Get filtered recipes
-    recipes = crud_recipe.get_multi_with_filters(
+    # Conditional GET: one version lookup before any listing query
+    etag = make_etag(user_id, get_version(db, recipe_scope(user_id)), request_fingerprint(request))
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    # The ETag identifies this exact page of this collection version
+    cached = recipe_cache_service.get_listing(etag)
+    if cached is not None:
+        return json_with_etag(cached, etag)
+    
+    keyset_sort = sort_by or "created_at"
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor, keyset_sort, sort_order)
+        except InvalidCursorError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+    
+    # Get filtered recipes and the total count in one query
+    recipes, total, total_is_estimate = crud_recipe.get_multi_with_total(
         db=db,
         user_id=user_id,
         skip=skip,
@@ -70,28 +242,131 @@ def read_recipes(
         user_created_only=user_created_only,
         imported_only=imported_only, # Added imported_only
         search=search, # Added search
+        fuzzy=fuzzy,
         max_calories=max_calories,
         max_prep_time=max_prep_time,
-        ingredients=ingredients
+        ingredients=ingredients,
+        sort_by=sort_by,
+        sort_order=sort_order,
+        after=after,
+        estimate_total=total_mode == "estimate",
+        summary=view == "summary",
+        include_ingredient_count=include_ingredient_count
     )
     
-    # Get total count with same filters
-    total = crud_recipe.count_with_filters(
-        db=db,
-        user_id=user_id,
-        user_created_only=user_created_only,
-        imported_only=imported_only, # Added imported_only
-        search=search, # Added search
-        max_calories=max_calories,
-        max_prep_time=max_prep_time,
-        ingredients=ingredients
-    )
+    # Cursor to the row after this page (not available for relevance ordering)
+    next_cursor = None
+    relevance_ordered = search and sort_by is None and after is None
+    if recipes and len(recipes) == limit and not relevance_ordered:
+        last = recipes[-1]
+        next_cursor = encode_cursor(
+            keyset_sort, sort_order, getattr(last, RECIPE_SORT_FIELDS[keyset_sort].key), last.id
+        )
+    
+    facet_result = None
+    if facets:
+        counts = crud_recipe.facet_counts(
+            db=db,
+            user_id=user_id,
+            user_created_only=user_created_only,
+            imported_only=imported_only,
+            search=search,
+            fuzzy=fuzzy,
+            max_calories=max_calories,
+            max_prep_time=max_prep_time,
+            ingredients=ingredients
+        )
+        facet_result = RecipeFacets(
+            calories=[{"max": bound, "count": count} for bound, count in counts["calories"]],
+            prep_time=[{"max": bound, "count": count} for bound, count in counts["prep_time"]],
+            ingredients=[{"name": name, "count": count} for name, count in counts["ingredients"]]
+        )
     
-    return RecipeListResponse(
+    response_class = RecipeSummaryListResponse if view == "summary" else RecipeListResponse
+    listing = response_class(
         recipes=recipes,
         total=total,
         skip=skip,
-        limit=limit
+        limit=limit,
+        next_cursor=next_cursor,
+        total_is_estimate=total_is_estimate,
+        facets=facet_result
+    )
+    # Serialized once: the same body is cached and sent
+    body = listing.model_dump_json().encode()
+    recipe_cache_service.put_listing(etag, body)
+    return json_with_etag(body, etag)
+
+def _check_recipe_access(owner_id: Optional[int], current_user: Optional[User]) -> None:
+    # Users can access their own recipes or system recipes (created_by_user_id is None)
+    # If no user is authenticated, only allow access to system recipes
+    if owner_id is not None:
+        if current_user is None or owner_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions to access this recipe"
+            )
+
+@router.get("/cache/metrics", response_model=RecipeCacheMetrics)
+def get_recipe_cache_metrics(
+    *,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Metrics of the recipe read-through cache (hit rate, evictions, memory use)
+    """
+    return RecipeCacheMetrics(**recipe_cache_service.stats())
+
+@router.get("/semantic-search", response_model=RecipeSemanticSearchResponse)
+def semantic_search_recipes(
+    *,
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_current_user_optional),
+    q: str = Query(..., min_length=1, max_length=500, description="Free-text description, e.g. 'something light with fish and lemon'"),
+    limit: int = Query(10, ge=1, le=50)
+):
+    """
+    Find the recipes closest in meaning to a free-text description
+    
+    Compares the query with each recipe's name, ingredients and instructions
+    using local TF-IDF embeddings (no external service). Covers the current
+    user's recipes and the system recipes.
+    """
+    user_id = current_user.id if current_user else None
+    matches = recipe_embedding_service.search(db, q, user_id, limit=limit)
+    summaries = crud_recipe.get_summaries(db, ids=[recipe_id for recipe_id, _ in matches])
+    scores = dict(matches)
+    return RecipeSemanticSearchResponse(
+        query=q,
+        results=[
+            RecipeSemanticMatch(recipe=row, score=round(scores[row.id], 4))
+            for row in summaries
+        ]
+    )
+
+@router.get("/top", response_model=RecipeTopResponse)
+def read_top_recipes(
+    *,
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_current_user_optional),
+    metric: Literal["views", "imports", "cooked"] = Query("views", description="Counter to rank by"),
+    limit: int = Query(10, ge=1, le=100)
+):
+    """
+    Most popular recipes by views, imports or times cooked
+    
+    Counts are aggregated in memory and written in batches, so the most recent
+    events (up to RECIPE_STATS_FLUSH_SECONDS old) may not be included yet.
+    """
+    rows = crud_recipe.get_top(
+        db, user_id=current_user.id if current_user else None, metric=metric, limit=limit
+    )
+    return RecipeTopResponse(
+        metric=metric,
+        results=[
+            RecipeTopEntry(recipe=row, views=row.views, imports=row.imports, cooked=row.cooked)
+            for row in rows
+        ]
     )
 
 @router.get("/{recipe_id}", response_model=RecipeRead)
@@ -99,26 +374,100 @@ def read_recipe(
     *,
     db: Session = Depends(get_db),
     recipe_id: int,
+    request: Request,
+    response: Response,
     current_user: Optional[User] = Depends(get_current_user_optional)
 ):
     """
     Get recipe by ID
+    
+    Responses carry an ETag; send it back in If-None-Match to get a 304 when
+    the recipe did not change.
     """
-    recipe = crud_recipe.get_with_ingredients(db=db, id=recipe_id)
-    if not recipe:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        # Revalidation: check access and the owner's version without loading the recipe
+        row = crud_recipe.get_id_and_owner(db=db, id=recipe_id)
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Recipe not found"
+            )
+        _check_recipe_access(row[1], current_user)
+        etag = make_etag("recipe", recipe_id, get_version(db, recipe_item_scope(recipe_id)))
+        if etag_matches(if_none_match, etag):
+            recipe_stats_service.record(recipe_id, "views")
+            return not_modified(etag)
+    
+    # System and own recipes are served from the shared read-through cache
+    cached = recipe_cache_service.get_with_ingredients(
+        db=db, recipe_id=recipe_id, user_id=current_user.id if current_user else None
+    )
+    if not cached:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Recipe not found"
         )
+    recipe, version = cached
     
     # Check if user has access to this recipe
-    # Users can access their own recipes or system recipes (created_by_user_id is None)
-    # If no user is authenticated, only allow access to system recipes
-    if recipe.created_by_user_id is not None:
-        if current_user is None or recipe.created_by_user_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not enough permissions to access this recipe"
-            )
+    _check_recipe_access(recipe.created_by_user_id, current_user)
     
+    set_etag(response, make_etag("recipe", recipe_id, version))
+    recipe_stats_service.record(recipe_id, "views")
     return recipe
+
+@router.post("/{recipe_id}/cooked", status_code=status.HTTP_202_ACCEPTED)
+def record_recipe_cooked(
+    *,
+    db: Session = Depends(get_db),
+    recipe_id: int,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Record that the current user cooked a recipe (popularity signal)
+    """
+    row = crud_recipe.get_id_and_owner(db=db, id=recipe_id)
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Recipe not found"
+        )
+    _check_recipe_access(row[1], current_user)
+    recipe_stats_service.record(recipe_id, "cooked")
+    return {"message": "Recorded"}
+
+@router.get("/{recipe_id}/similar", response_model=RecipeSimilarResponse)
+def read_similar_recipes(
+    *,
+    db: Session = Depends(get_db),
+    recipe_id: int,
+    current_user: Optional[User] = Depends(get_current_user_optional),
+    limit: int = Query(10, ge=1, le=50)
+):
+    """
+    Recipes sharing the most ingredients with this one ("more like this")
+    
+    Candidates come from MinHash LSH buckets over normalized ingredient names
+    and are ranked by exact Jaccard similarity. Covers the current user's
+    recipes and the system recipes.
+    """
+    row = crud_recipe.get_id_and_owner(db=db, id=recipe_id)
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Recipe not found"
+        )
+    _check_recipe_access(row[1], current_user)
+    
+    user_id = current_user.id if current_user else None
+    matches = recipe_similarity_service.similar(db, recipe_id, user_id, limit=limit)
+    summaries = crud_recipe.get_summaries(db, ids=[similar_id for similar_id, _ in matches])
+    similarities = dict(matches)
+    return RecipeSimilarResponse(
+        recipe_id=recipe_id,
+        results=[
+            RecipeSimilarMatch(recipe=summary, similarity=round(similarities[summary.id], 4))
+            for summary in summaries
+        ]
+    )
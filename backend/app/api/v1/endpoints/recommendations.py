@@ -5,9 +5,13 @@ import logging
 
 from app.api.v1.deps import get_current_user, get_db
 from app.models.user_models import User
-from app.services.recommendation_service import get_recipe_recommendations
+from app.services.recommendation_service import (
+    get_recipe_recommendations,
+    get_recommendation_coalescing_stats
+)
 from app.schemas.recommendations import (
     RecipeRecommendationsResponse, 
+    RecommendationCoalescingMetrics,
     RecommendationFilters, 
     RecommendationSort,
     RecommendationMetadata
@@ -182,3 +186,16 @@ def get_recommendations(
             ),
             message="Erro interno ao gerar recomendações. Tente novamente mais tarde."
         )
+
+@router.get("/recommendations/metrics", response_model=RecommendationCoalescingMetrics)
+def get_recommendation_metrics(
+    *,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Request coalescing metrics for the recommendations endpoint
+
+    Concurrent requests from the same user with the same parameters share a single
+    computation; these counters show how often that happens.
+    """
+    return RecommendationCoalescingMetrics(**get_recommendation_coalescing_stats())
@@ -20,6 +20,17 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
 
+    # Read-through cache of recipes with ingredients (serialized size budget)
+    RECIPE_CACHE_MAX_BYTES: int = int(os.getenv("RECIPE_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+
+    # Recipe popularity counters are written behind in batches; at most this many
+    # seconds of counts are lost if the process dies
+    RECIPE_STATS_FLUSH_SECONDS: float = float(os.getenv("RECIPE_STATS_FLUSH_SECONDS", 10))
+    # How often the pantry expiry scanner checks whether today's scan has run
+    PANTRY_EXPIRY_CHECK_SECONDS: float = float(os.getenv("PANTRY_EXPIRY_CHECK_SECONDS", 3600))
+    # Pantry deletion tombstones are kept this long; older sync tokens need a full resync
+    PANTRY_TOMBSTONE_RETENTION_DAYS: int = int(os.getenv("PANTRY_TOMBSTONE_RETENTION_DAYS", 30))
+
     # Gemini API Key
     GEMINI_API_KEY: Optional[str] = os.getenv("GEMINI_API_KEY")
 
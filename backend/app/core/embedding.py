@@ -0,0 +1,174 @@
+"""
+Local text embeddings for recipe similarity search.
+
+Texts are turned into sparse hashed vectors: accent-folded words plus their
+character trigrams (so "limão", "limao" and "limões" still overlap) are hashed
+into DIMENSIONS buckets with a stable hash and weighted per field. Document
+vectors are L2-normalized term frequencies; queries are also scaled by inverse
+document frequency, so common features count less without the stored vectors
+depending on the rest of the corpus.
+"""
+import heapq
+import math
+import zlib
+from array import array
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from app.core.text import folded_words
+
+DIMENSIONS = 1 << 18
+# Trigrams catch spelling variants but should not outweigh whole-word matches
+CHAR_NGRAM_WEIGHT = 0.3
+# Removed rows stay in the posting lists until there are more of them than
+# live rows (and at least this many)
+MIN_ROWS_TO_COMPACT = 1024
+
+SparseVector = Dict[int, float]
+
+
+def _bucket(feature: str) -> int:
+    # crc32 rather than hash(): bucket ids must not change between processes
+    return zlib.crc32(feature.encode()) & (DIMENSIONS - 1)
+
+
+def hashed_term_frequencies(fields: Iterable[Tuple[str, float]]) -> SparseVector:
+    """
+    Hashed, sublinearly scaled term frequencies of (text, weight) fields,
+    e.g. [(name, 3.0), (instructions, 1.0)]
+    """
+    counts: Dict[int, float] = {}
+    for text, weight in fields:
+        for word in folded_words(text):
+            if len(word) < 2:
+                continue
+            bucket = _bucket(f"w:{word}")
+            counts[bucket] = counts.get(bucket, 0.0) + weight
+            padded = f"<{word}>"
+            for i in range(len(padded) - 2):
+                bucket = _bucket(f"c:{padded[i:i + 3]}")
+                counts[bucket] = counts.get(bucket, 0.0) + weight * CHAR_NGRAM_WEIGHT
+    return {bucket: math.log1p(count) for bucket, count in counts.items()}
+
+
+def _normalized(vector: SparseVector) -> SparseVector:
+    norm = math.sqrt(sum(value * value for value in vector.values()))
+    if norm == 0.0:
+        return {}
+    return {bucket: value / norm for bucket, value in vector.items()}
+
+
+class SparseVectorIndex:
+    """
+    Cosine-similarity index over hashed term-frequency vectors.
+
+    Documents are rows of a DIMENSIONS-column sparse float32 matrix kept in
+    flat arrays: an inverted list per bucket (array of rows, array of float32
+    weights) for search and the buckets of each row (CSR) for removal, about
+    12 bytes per non-zero. A query only touches the posting lists of its own
+    buckets, which gives exact top-k results without comparing against every
+    document. Removing a document marks its row dead; dead rows are skipped
+    and purged once they outnumber the live ones.
+
+    Stored weights do not depend on the corpus and document frequencies are
+    updated on add/remove, so the index never needs a rebuild to re-weight.
+    """
+
+    def __init__(self):
+        self._rows: Dict[Hashable, int] = {}
+        # Row -> key, None once removed
+        self._keys: List[Optional[Hashable]] = []
+        # Buckets of row r are _row_buckets[_row_offsets[r]:_row_offsets[r + 1]]
+        self._row_offsets = array("q", [0])
+        self._row_buckets = array("i")
+        self._posting_rows: Dict[int, array] = {}
+        self._posting_weights: Dict[int, array] = {}
+        self._document_frequency = array("i", bytes(4 * DIMENSIONS))
+        self._dead_rows = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._rows
+
+    def add(self, key: Hashable, term_frequencies: SparseVector) -> None:
+        self.remove(key)
+        row = len(self._keys)
+        self._keys.append(key)
+        self._rows[key] = row
+        vector = _normalized(term_frequencies)
+        for bucket, weight in vector.items():
+            self._document_frequency[bucket] += 1
+            rows = self._posting_rows.get(bucket)
+            if rows is None:
+                self._posting_rows[bucket] = array("i", [row])
+                self._posting_weights[bucket] = array("f", [weight])
+            else:
+                rows.append(row)
+                self._posting_weights[bucket].append(weight)
+        self._row_buckets.extend(vector)
+        self._row_offsets.append(len(self._row_buckets))
+
+    def remove(self, key: Hashable) -> None:
+        row = self._rows.pop(key, None)
+        if row is None:
+            return
+        self._keys[row] = None
+        for bucket in self._row_buckets[self._row_offsets[row]:self._row_offsets[row + 1]]:
+            self._document_frequency[bucket] -= 1
+        self._dead_rows += 1
+        if self._dead_rows > max(len(self._rows), MIN_ROWS_TO_COMPACT):
+            self._compact()
+
+    def search(
+        self,
+        term_frequencies: SparseVector,
+        limit: int,
+        accept: Optional[Callable[[Hashable], bool]] = None
+    ) -> List[Tuple[Hashable, float]]:
+        """The `limit` most similar documents as (key, cosine similarity), best first"""
+        total = len(self._rows) + 1
+        query = _normalized({
+            bucket: value * (math.log(total / (1 + self._document_frequency[bucket])) + 1.0)
+            for bucket, value in term_frequencies.items()
+        })
+        scores: Dict[int, float] = {}
+        for bucket, query_weight in query.items():
+            rows = self._posting_rows.get(bucket)
+            if rows is None:
+                continue
+            for row, weight in zip(rows, self._posting_weights[bucket]):
+                scores[row] = scores.get(row, 0.0) + query_weight * weight
+        keys = self._keys
+        candidates = (
+            (keys[row], min(score, 1.0)) for row, score in scores.items()
+            if score > 0.0 and keys[row] is not None and (accept is None or accept(keys[row]))
+        )
+        return heapq.nlargest(limit, candidates, key=lambda item: item[1])
+
+    def _compact(self) -> None:
+        """Drop dead rows from every array and renumber the live ones"""
+        renumbered = array("i", [-1]) * len(self._keys)
+        live = [row for row, key in enumerate(self._keys) if key is not None]
+        for new_row, row in enumerate(live):
+            renumbered[row] = new_row
+        for bucket in list(self._posting_rows):
+            kept = [
+                (renumbered[row], weight)
+                for row, weight in zip(self._posting_rows[bucket], self._posting_weights[bucket])
+                if renumbered[row] >= 0
+            ]
+            if kept:
+                self._posting_rows[bucket] = array("i", (row for row, _ in kept))
+                self._posting_weights[bucket] = array("f", (weight for _, weight in kept))
+            else:
+                del self._posting_rows[bucket]
+                del self._posting_weights[bucket]
+        offsets, buckets = array("q", [0]), array("i")
+        for row in live:
+            buckets.extend(self._row_buckets[self._row_offsets[row]:self._row_offsets[row + 1]])
+            offsets.append(len(buckets))
+        self._row_offsets, self._row_buckets = offsets, buckets
+        self._keys = [self._keys[row] for row in live]
+        self._rows = {key: row for row, key in enumerate(self._keys)}
+        self._dead_rows = 0
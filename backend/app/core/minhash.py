@@ -0,0 +1,102 @@
+"""
+MinHash signatures with locality-sensitive hashing (banding) for finding sets
+with a high Jaccard similarity without comparing against every stored set.
+"""
+import heapq
+import random
+import zlib
+from typing import Callable, Dict, FrozenSet, Hashable, Iterable, List, Optional, Set, Tuple
+
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class MinHashLSH:
+    """
+    Sets of tokens indexed by key for approximate nearest-neighbour lookups.
+
+    Each set gets a num_perm MinHash signature, cut into `bands` bands of
+    num_perm / bands rows; two sets become candidates when any band matches.
+    With the defaults (32 bands of 2 rows) pairs above ~0.2 Jaccard are very
+    likely to collide. Candidates are re-ranked by their exact Jaccard
+    similarity, so false positives never reach the results.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 32, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = random.Random(seed)
+        self._permutations = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+        self._sets: Dict[Hashable, FrozenSet[str]] = {}
+        self._band_keys: Dict[Hashable, Tuple[Tuple[int, ...], ...]] = {}
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], Set[Hashable]] = {}
+
+    def __len__(self) -> int:
+        return len(self._sets)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._sets
+
+    def signature(self, tokens: Iterable[str]) -> List[int]:
+        hashes = [zlib.crc32(token.encode()) for token in set(tokens)]
+        return [min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in self._permutations]
+
+    def add(self, key: Hashable, tokens: Iterable[str]) -> None:
+        self.remove(key)
+        token_set = frozenset(tokens)
+        self._sets[key] = token_set
+        if not token_set:
+            return
+        band_keys = self._bands(self.signature(token_set))
+        self._band_keys[key] = band_keys
+        for band, band_key in enumerate(band_keys):
+            self._buckets.setdefault((band, band_key), set()).add(key)
+
+    def remove(self, key: Hashable) -> None:
+        self._sets.pop(key, None)
+        band_keys = self._band_keys.pop(key, None)
+        if band_keys is None:
+            return
+        for band, band_key in enumerate(band_keys):
+            bucket = self._buckets[(band, band_key)]
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[(band, band_key)]
+
+    def similar(
+        self,
+        key: Hashable,
+        limit: int,
+        accept: Optional[Callable[[Hashable], bool]] = None
+    ) -> List[Tuple[Hashable, float]]:
+        """The `limit` stored sets most similar to key's, as (key, Jaccard similarity), best first"""
+        band_keys = self._band_keys.get(key)
+        if band_keys is None:
+            return []
+        candidates: Set[Hashable] = set()
+        for band, band_key in enumerate(band_keys):
+            candidates.update(self._buckets.get((band, band_key), ()))
+        candidates.discard(key)
+
+        token_set = self._sets[key]
+        scored = (
+            (candidate, jaccard(token_set, self._sets[candidate]))
+            for candidate in candidates if accept is None or accept(candidate)
+        )
+        # Ties broken by key so results are stable
+        return heapq.nsmallest(limit, scored, key=lambda item: (-item[1], item[0]))
+
+    def _bands(self, signature: List[int]) -> Tuple[Tuple[int, ...], ...]:
+        return tuple(
+            tuple(signature[band * self.rows:(band + 1) * self.rows]) for band in range(self.bands)
+        )
@@ -0,0 +1,39 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded or does not match the request"""
+
+
+def encode_cursor(sort_by: str, sort_order: str, value: Any, last_id: int) -> str:
+    """
+    Build an opaque keyset cursor pointing just after the row (value, last_id).
+    The sort key and order are embedded so a cursor cannot be replayed against
+    a different ordering.
+    """
+    if isinstance(value, datetime):
+        value = {"dt": value.isoformat()}
+    payload = {"s": sort_by, "o": sort_order, "v": value, "id": last_id}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, sort_order: str) -> Tuple[Any, int]:
+    """Decode a cursor produced by encode_cursor into (value, last_id)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value: Optional[Any] = payload["v"]
+        last_id = int(payload["id"])
+        cursor_sort, cursor_order = payload["s"], payload["o"]
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value["dt"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+
+    if cursor_sort != sort_by or cursor_order != sort_order:
+        raise InvalidCursorError("Pagination cursor does not match the requested sort order")
+    return value, last_id
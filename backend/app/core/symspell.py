@@ -0,0 +1,100 @@
+from itertools import combinations
+from typing import Dict, Hashable, Iterable, Set
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent transpositions).
+    Returns max_distance + 1 as soon as the distance is known to exceed max_distance.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (
+                previous_previous is not None and i > 1 and j > 1
+                and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]
+            ):
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return min(previous[-1], max_distance + 1)
+
+
+class SymSpellIndex:
+    """
+    Symmetric-delete spelling index mapping words to the keys (e.g. recipe ids)
+    that contain them.
+
+    Every word is stored under all strings obtained by deleting up to
+    max_distance characters from its first prefix_length characters. A lookup
+    generates the same deletes for the query word, so candidates are found with
+    a handful of dictionary probes instead of comparing against every word;
+    candidates are then verified with the real edit distance.
+    """
+
+    def __init__(self, max_distance: int = 2, prefix_length: int = 7):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self._postings: Dict[str, Set[Hashable]] = {}
+        self._deletes: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._postings)
+
+    def add(self, word: str, key: Hashable) -> None:
+        keys = self._postings.get(word)
+        if keys is None:
+            keys = self._postings[word] = set()
+            for variant in self._variants(word):
+                self._deletes.setdefault(variant, set()).add(word)
+        keys.add(key)
+
+    def remove(self, word: str, key: Hashable) -> None:
+        keys = self._postings.get(word)
+        if keys is None:
+            return
+        keys.discard(key)
+        if keys:
+            return
+        del self._postings[word]
+        for variant in self._variants(word):
+            words = self._deletes.get(variant)
+            if words is not None:
+                words.discard(word)
+                if not words:
+                    del self._deletes[variant]
+
+    def lookup(self, word: str, max_distance: int) -> Dict[str, int]:
+        """Dictionary words within max_distance of word, with their distances"""
+        max_distance = min(max_distance, self.max_distance)
+        if max_distance == 0:
+            return {word: 0} if word in self._postings else {}
+        candidates: Set[str] = set()
+        for variant in self._variants(word, max_distance):
+            candidates.update(self._deletes.get(variant, ()))
+        matches = {}
+        for candidate in candidates:
+            distance = 0 if candidate == word else edit_distance(word, candidate, max_distance)
+            if distance <= max_distance:
+                matches[candidate] = distance
+        return matches
+
+    def keys_for(self, word: str) -> Set[Hashable]:
+        return self._postings.get(word, set())
+
+    def _variants(self, word: str, max_distance: int = None) -> Iterable[str]:
+        """The word's prefix and every string made by deleting up to max_distance characters from it"""
+        prefix = word[:self.prefix_length]
+        max_distance = self.max_distance if max_distance is None else max_distance
+        variants = {prefix}
+        for count in range(1, min(max_distance, len(prefix)) + 1):
+            for positions in combinations(range(len(prefix)), count):
+                variants.add("".join(char for i, char in enumerate(prefix) if i not in positions))
+        return variants
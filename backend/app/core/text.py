@@ -0,0 +1,35 @@
+import hashlib
+import re
+import unicodedata
+from typing import Iterable, List
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def fold_text(value: str) -> str:
+    """Accents folded, lowercased and whitespace collapsed ("  Limão  Verde" -> "limao verde")"""
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    folded = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _WHITESPACE_RE.sub(" ", folded.casefold()).strip()
+
+
+def normalize_ingredient_name(name: str) -> str:
+    """Canonical lookup form of an ingredient name (see fold_text)"""
+    return fold_text(name)
+
+
+def folded_words(value: str) -> List[str]:
+    """Accent-folded, lowercased words of a text ("Bacalhau à Brás" -> ["bacalhau", "a", "bras"])"""
+    return _WORD_RE.findall(fold_text(value))
+
+
+def recipe_content_hash(recipe_name: str, ingredient_names: Iterable[str]) -> str:
+    """
+    Fingerprint of a recipe's identity: folded name words plus the sorted set of
+    folded ingredient names. Copies differing only in case, accents, punctuation,
+    quantities or ingredient order share a hash.
+    """
+    ingredients = sorted({" ".join(folded_words(name)) for name in ingredient_names} - {""})
+    content = "\n".join([" ".join(folded_words(recipe_name)), *ingredients])
+    return hashlib.sha256(content.encode()).hexdigest()
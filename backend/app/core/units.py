@@ -0,0 +1,59 @@
+"""
+Unit families for adding up quantities given in different units.
+
+Every known unit maps to the base unit of its family and the factor that
+converts a quantity into it ("kg" -> ("g", 1000)). Unknown units form a family
+of their own. Keys are lowercased, trimmed spellings (English and Portuguese);
+pantry summaries match units against them in SQL (crud_pantry.summarize_by_user).
+"""
+from typing import Dict, Tuple
+
+UNIT_FAMILIES: Dict[str, Tuple[str, float]] = {
+    # Mass, in grams
+    "mg": ("g", 0.001),
+    "g": ("g", 1),
+    "gr": ("g", 1),
+    "gram": ("g", 1),
+    "grams": ("g", 1),
+    "grama": ("g", 1),
+    "gramas": ("g", 1),
+    "kg": ("g", 1000),
+    "kilo": ("g", 1000),
+    "kilos": ("g", 1000),
+    "quilo": ("g", 1000),
+    "quilos": ("g", 1000),
+    "oz": ("g", 28.3495),
+    "lb": ("g", 453.592),
+    "lbs": ("g", 453.592),
+    # Volume, in millilitres
+    "ml": ("ml", 1),
+    "cl": ("ml", 10),
+    "dl": ("ml", 100),
+    "l": ("ml", 1000),
+    "lt": ("ml", 1000),
+    "litre": ("ml", 1000),
+    "liter": ("ml", 1000),
+    "litro": ("ml", 1000),
+    "litros": ("ml", 1000),
+    "tsp": ("ml", 5),
+    "tbsp": ("ml", 15),
+    "cup": ("ml", 240),
+    "cups": ("ml", 240),
+    "chavena": ("ml", 240),
+    "chávena": ("ml", 240),
+    # Countable items
+    "un": ("un", 1),
+    "und": ("un", 1),
+    "unit": ("un", 1),
+    "units": ("un", 1),
+    "unidade": ("un", 1),
+    "unidades": ("un", 1),
+    "piece": ("un", 1),
+    "pieces": ("un", 1),
+    "pc": ("un", 1),
+    "pcs": ("un", 1),
+    "dozen": ("un", 12),
+    "duzia": ("un", 12),
+    "dúzia": ("un", 12),
+}
+
@@ -1,9 +1,36 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlmodel import select, asc, desc
-from datetime import date, timedelta
+from sqlalchemy import bindparam, case, delete, insert, update
+from sqlmodel import select, asc, desc, func
+from datetime import date, datetime, timedelta
 from app.crud.base import CRUDBase
-from app.models.pantry_models import PantryItem, PantryItemCreate, PantryItemUpdate
+from app.core.text import normalize_ingredient_name
+from app.core.units import UNIT_FAMILIES
+from app.db.versioning import bump_versions, get_version, pantry_scope
+from app.models.ingredient_models import Ingredient
+from app.models.pantry_models import (
+    PantryExpiryAlert, PantryItem, PantryItemCreate, PantryItemTombstone, PantryItemUpdate
+)
+from app.services.ingredient_dictionary_service import ingredient_dictionary_service
+from app.services.pantry_expiry_service import EXPIRY_WINDOW_DAYS
+
+
+def pantry_merge_key(item_name: str, unit: str) -> Tuple[str, str]:
+    """Items with the same normalized name and unit are the same pantry entry"""
+    return normalize_ingredient_name(item_name), unit.strip().lower()
+
+
+def _merge_into(target: Dict, item: Dict) -> None:
+    """Fold `item` into `target`: add quantities, keep the earliest expiry and latest purchase"""
+    target["quantity"] += item["quantity"]
+    expirations = [d for d in (target.get("expiration_date"), item.get("expiration_date")) if d is not None]
+    target["expiration_date"] = min(expirations) if expirations else None
+    purchases = [d for d in (target.get("purchase_date"), item.get("purchase_date")) if d is not None]
+    target["purchase_date"] = max(purchases) if purchases else None
+    for field in ("calories_per_unit", "image_url"):
+        if item.get(field) is not None:
+            target[field] = item[field]
+
 
 class CRUDPantry(CRUDBase[PantryItem, PantryItemCreate, PantryItemUpdate]):
     def get_multi_by_user(
@@ -21,8 +48,8 @@ class CRUDPantry(CRUDBase[PantryItem, PantryItemCreate, PantryItemUpdate]):
         
         # Apply expiring_soon filter
         if expiring_soon:
-            # Items expiring in the next 7 days
-            expiry_threshold = date.today() + timedelta(days=7)
+            # Items expiring in the next EXPIRY_WINDOW_DAYS days
+            expiry_threshold = date.today() + timedelta(days=EXPIRY_WINDOW_DAYS)
             query = query.where(
                 PantryItem.expiration_date.is_not(None),
                 PantryItem.expiration_date <= expiry_threshold
@@ -95,5 +122,219 @@ class CRUDPantry(CRUDBase[PantryItem, PantryItemCreate, PantryItemUpdate]):
             db.commit()
             return obj
         return None
+    
+    def upsert_many(
+        self, db: Session, *, objs_in: List[PantryItemCreate], user_id: int
+    ) -> Tuple[List[PantryItem], int, int]:
+        """
+        Add many items to a user's pantry in one transaction.
+        
+        Items are merged by normalized name and unit, with each other and with
+        what is already in the pantry: quantities are added, the earliest
+        expiration and latest purchase date are kept. Matched rows get one
+        executemany UPDATE and new entries one multi-row INSERT.
+        Returns (resulting items in input order, created count, updated count).
+        """
+        if not objs_in:
+            return [], 0, 0
+        
+        # Bump first: the pantry counter row stays locked until commit, so a
+        # concurrent upload for the same user waits instead of merging against
+        # the same stored rows. Core statements skip the flush listeners: bump,
+        # stamp and resolve here
+        version = bump_versions(db.connection(), [pantry_scope(user_id)])[pantry_scope(user_id)]
+        stored: Dict[Tuple[str, str], PantryItem] = {}
+        for row in db.exec(
+            select(PantryItem)
+            .where(PantryItem.user_id == user_id)
+            .order_by(PantryItem.id)
+            .execution_options(populate_existing=True)
+        ).all():
+            stored.setdefault(pantry_merge_key(row.item_name, row.unit), row)
+        
+        merged: Dict[Tuple[str, str], Dict] = {}
+        for obj_in in objs_in:
+            item = obj_in.model_dump()
+            key = pantry_merge_key(item["item_name"], item["unit"])
+            if key in merged:
+                _merge_into(merged[key], item)
+            elif key in stored:
+                row = stored[key]
+                merged[key] = {
+                    field: getattr(row, field) for field in PantryItemCreate.model_fields
+                }
+                _merge_into(merged[key], item)
+            else:
+                merged[key] = item
+        
+        canonical_ids = ingredient_dictionary_service.resolve(db, [name for name, _ in merged])
+        now = datetime.utcnow()
+        table = PantryItem.__table__
+        updates = [
+            {
+                **values, "updated_at": now, "version": version,
+                "canonical_ingredient_id": canonical_ids.get(key[0]), "row_id": stored[key].id
+            }
+            for key, values in merged.items() if key in stored
+        ]
+        inserts = [
+            {
+                **values, "user_id": user_id, "added_at": now, "updated_at": now, "version": version,
+                "canonical_ingredient_id": canonical_ids.get(key[0])
+            }
+            for key, values in merged.items() if key not in stored
+        ]
+        ids: Dict[Tuple[str, str], int] = {key: stored[key].id for key in merged if key in stored}
+        if updates:
+            # SET columns come from the parameter dictionaries
+            db.execute(update(table).where(table.c.id == bindparam("row_id")), updates)
+        if inserts:
+            inserted = db.execute(
+                insert(table).returning(table.c.id, sort_by_parameter_order=True), inserts
+            ).scalars().all()
+            new_keys = [key for key in merged if key not in stored]
+            ids.update(zip(new_keys, inserted))
+        db.commit()
+        
+        # populate_existing: rows loaded above were changed behind the ORM's back
+        items = {
+            item.id: item for item in db.exec(
+                select(PantryItem)
+                .where(PantryItem.id.in_(list(ids.values())))
+                .execution_options(populate_existing=True)
+            ).all()
+        }
+        return [items[ids[key]] for key in merged], len(inserts), len(updates)
+    
+    def delete_expired(self, db: Session, *, user_id: int, expired_before: date) -> int:
+        """Delete a user's items that expire before the given date in one statement; returns the count"""
+        table = PantryItem.__table__
+        deleted_ids = db.execute(
+            delete(table).where(
+                table.c.user_id == user_id,
+                table.c.expiration_date < expired_before
+            ).returning(table.c.id)
+        ).scalars().all()
+        if deleted_ids:
+            # Core statements skip the flush listener: bump and tombstone here
+            version = bump_versions(db.connection(), [pantry_scope(user_id)])[pantry_scope(user_id)]
+            now = datetime.utcnow()
+            db.execute(insert(PantryItemTombstone.__table__), [
+                {"item_id": item_id, "user_id": user_id, "version": version, "deleted_at": now}
+                for item_id in deleted_ids
+            ])
+        db.commit()
+        return len(deleted_ids)
+    
+    def get_changes(
+        self, db: Session, *, user_id: int, since: Optional[int] = None
+    ) -> Tuple[List[PantryItem], List[int], int]:
+        """
+        Pantry rows written and ids deleted after pantry version `since`.
+        
+        Without `since` every item is returned (and no deletions). Returns
+        (items, deleted item ids, version to pass as `since` next time). The
+        version is read first: a write committed in between shows up now and
+        again on the next call, never not at all.
+        """
+        version = get_version(db, pantry_scope(user_id))
+        query = select(PantryItem).where(PantryItem.user_id == user_id)
+        if since is not None:
+            query = query.where(PantryItem.version > since)
+        items = db.exec(query.order_by(PantryItem.version, PantryItem.id)).all()
+        
+        deleted: List[int] = []
+        if since is not None:
+            tombstoned = list(dict.fromkeys(db.exec(
+                select(PantryItemTombstone.item_id)
+                .where(PantryItemTombstone.user_id == user_id, PantryItemTombstone.version > since)
+                .order_by(PantryItemTombstone.version, PantryItemTombstone.item_id)
+            ).all()))
+            if tombstoned:
+                # An id can come back (SQLite reuses the highest rowid): a live row wins
+                live = set(db.exec(
+                    select(PantryItem.id).where(PantryItem.user_id == user_id, PantryItem.id.in_(tombstoned))
+                ).all())
+                deleted = [item_id for item_id in tombstoned if item_id not in live]
+        
+        return items, deleted, max([version] + [item.version for item in items])
+    def get_expiry_alerts(
+        self, db: Session, *, user_id: int, since: Optional[date] = None
+    ) -> List[Tuple[PantryExpiryAlert, PantryItem]]:
+        """
+        Items the daily scan found inside the expiry window, soonest expiry first.
+        With `since`, only those that entered the window on or after that day.
+        """
+        query = (
+            select(PantryExpiryAlert, PantryItem)
+            .join(PantryItem, PantryItem.id == PantryExpiryAlert.item_id)
+            .where(PantryExpiryAlert.user_id == user_id)
+        )
+        if since is not None:
+            query = query.where(PantryExpiryAlert.entered_on >= since)
+        return db.exec(query.order_by(PantryExpiryAlert.expiration_date, PantryExpiryAlert.item_id)).all()
+    def summarize_by_user(self, db: Session, *, user_id: int) -> List[Dict]:
+        """
+        A user's pantry totals per ingredient and unit family, in one GROUP BY.
+        
+        Items are grouped by canonical ingredient name and by the base unit of
+        their unit's family (see app.core.units), with quantities converted to
+        it. Items without a dictionary entry are grouped by their raw name in
+        SQL and those groups are then merged by normalize_ingredient_name, so
+        they fold like dictionary names ("Açúcar" and "acucar" are one entry).
+        Each entry has ingredient_id, name, display_name (one of the item
+        names), unit, total_quantity, item_count, earliest_expiration and
+        total_calories (calories_per_unit x quantity, None if no item has
+        calories).
+        """
+        unit_key = func.lower(func.trim(PantryItem.unit))
+        items = (
+            select(
+                PantryItem.canonical_ingredient_id.label("ingredient_id"),
+                func.coalesce(Ingredient.name, PantryItem.item_name).label("name"),
+                PantryItem.item_name.label("item_name"),
+                case(
+                    {unit: base for unit, (base, _) in UNIT_FAMILIES.items()}, value=unit_key, else_=unit_key
+                ).label("unit"),
+                (PantryItem.quantity * case(
+                    {unit: factor for unit, (_, factor) in UNIT_FAMILIES.items()}, value=unit_key, else_=1
+                )).label("quantity"),
+                PantryItem.expiration_date.label("expiration_date"),
+                (PantryItem.calories_per_unit * PantryItem.quantity).label("calories"),
+            )
+            .outerjoin(Ingredient, Ingredient.id == PantryItem.canonical_ingredient_id)
+            .where(PantryItem.user_id == user_id)
+            .subquery("items")
+        )
+        rows = db.exec(
+            select(
+                items.c.ingredient_id,
+                items.c.name,
+                func.min(items.c.item_name).label("display_name"),
+                items.c.unit,
+                func.sum(items.c.quantity).label("total_quantity"),
+                func.count().label("item_count"),
+                func.min(items.c.expiration_date).label("earliest_expiration"),
+                func.sum(items.c.calories).label("total_calories"),
+            )
+            .group_by(items.c.ingredient_id, items.c.name, items.c.unit)
+        ).all()
+        
+        summary: Dict[Tuple[str, str], Dict] = {}
+        for row in rows:
+            entry = dict(row._mapping)
+            # Dictionary names are already normalized; this folds the raw ones
+            entry["name"] = normalize_ingredient_name(entry["name"])
+            merged = summary.setdefault((entry["name"], entry["unit"]), entry)
+            if merged is entry:
+                continue
+            merged["ingredient_id"] = merged["ingredient_id"] or entry["ingredient_id"]
+            merged["display_name"] = min(merged["display_name"], entry["display_name"])
+            merged["total_quantity"] += entry["total_quantity"]
+            merged["item_count"] += entry["item_count"]
+            for field, combine in (("earliest_expiration", min), ("total_calories", sum)):
+                values = [value for value in (merged[field], entry[field]) if value is not None]
+                merged[field] = combine(values) if values else None
+        return [summary[key] for key in sorted(summary)]
 
 pantry = CRUDPantry(PantryItem)
@@ -1,8 +1,69 @@
-from typing import List, Optional
+import json
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
 from sqlalchemy.orm import Session, selectinload
-from sqlmodel import select, and_, or_
+from sqlalchemy import bindparam, case, delete, distinct, false, insert, literal, tuple_, union_all, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlmodel import select, and_, or_, asc, desc, func
 from app.crud.base import CRUDBase
+from app.core.text import normalize_ingredient_name, recipe_content_hash
+from app.db.fulltext import build_search_filter
+from app.db.recipe_changes import RecipeChanges, record_changes
+from app.db.versioning import bump_versions, recipe_item_scope, recipe_scope
 from app.models.recipe_models import Recipe, RecipeCreate, RecipeUpdate, RecipeIngredient, RecipeIngredientCreate
+from app.models.recipe_stats_models import RecipeStats
+from app.services.ingredient_dictionary_service import ingredient_dictionary_service
+from app.services.recipe_name_index_service import recipe_name_index_service
+
+class DuplicateRecipeError(ValueError):
+    """Raised when a write would give an owner two copies of the same recipe"""
+
+    def __init__(self, recipe_id: Optional[int]):
+        self.recipe_id = recipe_id
+        super().__init__(f"Duplicate of recipe {recipe_id}" if recipe_id is not None else "Duplicate recipe")
+
+class IngredientChanges(NamedTuple):
+    """Normalized ingredient names touched by CRUDRecipe.sync_ingredients"""
+    added: FrozenSet[str]
+    updated: FrozenSet[str]
+    removed: FrozenSet[str]
+    
+    @property
+    def changed_names(self) -> FrozenSet[str]:
+        return self.added | self.updated | self.removed
+
+
+# Sort keys available for recipe listings (each backed by an (owner, key, id) index)
+RECIPE_SORT_FIELDS = {
+    "created_at": Recipe.created_at,
+    "calories": Recipe.estimated_calories,
+    "prep_time": Recipe.preparation_time_minutes,
+    "name": Recipe.recipe_name,
+}
+
+# Columns selected by summary listings (grid views)
+RECIPE_SUMMARY_COLUMNS = (
+    "id", "recipe_name", "image_url", "estimated_calories",
+    "preparation_time_minutes", "created_by_user_id", "created_at",
+)
+
+# Facet buckets ("at most N") matching the max_calories / max_prep_time filters
+RECIPE_CALORIE_FACETS = (300, 500, 800)
+RECIPE_PREP_TIME_FACETS = (15, 30, 60)
+
+def visible_to_user(user_id: int):
+    """
+    Recipes a user can see: their own plus the system recipes.
+    
+    Written as a UNION ALL of two owner lookups instead of
+    `created_by_user_id = :u OR created_by_user_id IS NULL`, so each branch is an
+    index search on created_by_user_id rather than a scan of the whole table.
+    """
+    visible_ids = union_all(
+        select(Recipe.id).where(Recipe.created_by_user_id == user_id),
+        select(Recipe.id).where(Recipe.created_by_user_id.is_(None))
+    )
+    return Recipe.id.in_(visible_ids)
 
 class CRUDRecipe(CRUDBase[Recipe, RecipeCreate, RecipeUpdate]):
     def get_multi_by_user(
@@ -13,10 +74,7 @@ class CRUDRecipe(CRUDBase[Recipe, RecipeCreate, RecipeUpdate]):
         
         if user_id is not None:
             # Get user's recipes + system recipes
-            query = query.where(
-                (Recipe.created_by_user_id == user_id) | 
-                (Recipe.created_by_user_id.is_(None))
-            )
+            query = query.where(visible_to_user(user_id))
         else:
             # Get only system recipes
             query = query.where(Recipe.created_by_user_id.is_(None))
@@ -31,21 +89,114 @@ class CRUDRecipe(CRUDBase[Recipe, RecipeCreate, RecipeUpdate]):
             .where(Recipe.id == id)
         ).first()
     
+    def get_id_and_owner(self, db: Session, *, id: int) -> Optional[Tuple[int, Optional[int]]]:
+        """(id, created_by_user_id) of a recipe without loading it (None if it does not exist)"""
+        return db.exec(select(Recipe.id, Recipe.created_by_user_id).where(Recipe.id == id)).first()
+    
+    def get_summaries(self, db: Session, *, ids: List[int]) -> List[Any]:
+        """RECIPE_SUMMARY_COLUMNS rows of the given recipes, in the order of ids"""
+        if not ids:
+            return []
+        rows = db.exec(self._page_select(summary=True).where(Recipe.id.in_(ids))).all()
+        by_id = {row.id: row for row in rows}
+        return [by_id[recipe_id] for recipe_id in ids if recipe_id in by_id]
+    
+    def find_duplicate(
+        self,
+        db: Session,
+        *,
+        owner_id: Optional[int],
+        content_hash: Optional[str] = None,
+        source_id: Optional[str] = None
+    ) -> Optional[int]:
+        """
+        Id of the owner's recipe with this content hash or external source id, if any.
+        One lookup on the per-owner unique indexes (same coalesce expression).
+        """
+        conditions = []
+        if content_hash is not None:
+            conditions.append(Recipe.content_hash == content_hash)
+        if source_id is not None:
+            conditions.append(Recipe.source_id == source_id)
+        if not conditions:
+            return None
+        return db.exec(
+            select(Recipe.id)
+            .where(func.coalesce(Recipe.created_by_user_id, 0) == (owner_id or 0))
+            .where(or_(*conditions))
+            .limit(1)
+        ).first()
+    
+    def get_source_recipe_id(self, db: Session, *, source_id: str) -> Optional[int]:
+        """
+        Canonical recipe of an external source id: the system recipe imported from
+        it if there is one, else the first copy imported by any user.
+        """
+        return db.exec(
+            select(Recipe.id)
+            .where(Recipe.source_id == source_id)
+            .order_by(Recipe.created_by_user_id.is_not(None), Recipe.id)
+            .limit(1)
+        ).first()
+    
+    def get_top(self, db: Session, *, user_id: Optional[int], metric: str, limit: int = 10) -> List[Any]:
+        """
+        Most popular recipes visible to a user (theirs and the system recipes; only
+        system recipes without a user) by a recipe_stats counter. Rows hold the
+        RECIPE_SUMMARY_COLUMNS plus views, imports and cooked.
+        """
+        counter = getattr(RecipeStats, metric)
+        query = (
+            self._page_select(True, False, RecipeStats.views, RecipeStats.imports, RecipeStats.cooked)
+            .join(RecipeStats, RecipeStats.recipe_id == Recipe.id)
+            .where(counter > 0)
+        )
+        if user_id is not None:
+            query = query.where(visible_to_user(user_id))
+        else:
+            query = query.where(Recipe.created_by_user_id.is_(None))
+        return db.exec(query.order_by(counter.desc(), Recipe.id).limit(limit)).all()
+    
     def create_with_user(
-        self, db: Session, *, obj_in: RecipeCreate, user_id: Optional[int] = None
+        self,
+        db: Session,
+        *,
+        obj_in: RecipeCreate,
+        user_id: Optional[int] = None,
+        source_id: Optional[str] = None
     ) -> Recipe:
-        """Create recipe with ingredients for a user (or as system recipe if user_id is None)"""
+        """
+        Create recipe with ingredients for a user (or as system recipe if user_id is None).
+        Raises DuplicateRecipeError if the owner already has the same recipe
+        (same content hash, or same source_id for imports).
+        """
         # Extract ingredients from the input
         ingredients_data = obj_in.ingredients
         recipe_data = obj_in.dict(exclude={"ingredients"})
+        content_hash = recipe_content_hash(
+            obj_in.recipe_name, [ingredient.ingredient_name for ingredient in ingredients_data]
+        )
+        
+        existing_id = self.find_duplicate(db, owner_id=user_id, content_hash=content_hash, source_id=source_id)
+        if existing_id is not None:
+            raise DuplicateRecipeError(existing_id)
         
         # Create the recipe
         db_recipe = Recipe(
             **recipe_data,
-            created_by_user_id=user_id
+            created_by_user_id=user_id,
+            content_hash=content_hash,
+            source_id=source_id
         )
         db.add(db_recipe)
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError:
+            # Lost a race with a concurrent copy
+            db.rollback()
+            raise DuplicateRecipeError(
+                self.find_duplicate(db, owner_id=user_id, content_hash=content_hash, source_id=source_id)
+            )
         db.refresh(db_recipe)
         
         # Create ingredients
@@ -60,36 +211,203 @@ class CRUDRecipe(CRUDBase[Recipe, RecipeCreate, RecipeUpdate]):
         db.refresh(db_recipe)
         return self.get_with_ingredients(db, id=db_recipe.id)
     
+    def create_many_with_user(
+        self,
+        db: Session,
+        *,
+        objs_in: List[RecipeCreate],
+        user_id: Optional[int] = None,
+        batch_size: int = 500
+    ) -> List[Tuple[Optional[int], Optional[str]]]:
+        """
+        Create many recipes with their ingredients in one transaction.
+        
+        Recipes go in as multi-row INSERT ... RETURNING statements (one per batch) and
+        ingredients as one executemany per batch. If a batch fails it is retried item
+        by item inside savepoints, so one bad recipe does not abort the rest.
+        Returns one (recipe_id, error) pair per input, in input order.
+        """
+        results: List[Tuple[Optional[int], Optional[str]]] = [(None, None)] * len(objs_in)
+        created_at = datetime.utcnow()
+        
+        for start in range(0, len(objs_in), batch_size):
+            positions = range(start, min(start + batch_size, len(objs_in)))
+            try:
+                with db.begin_nested():
+                    recipe_ids = self._insert_batch(db, [objs_in[i] for i in positions], user_id, created_at)
+                for position, recipe_id in zip(positions, recipe_ids):
+                    results[position] = (recipe_id, None)
+            except SQLAlchemyError:
+                # Isolate the failing items
+                for position in positions:
+                    try:
+                        with db.begin_nested():
+                            (recipe_id,) = self._insert_batch(db, [objs_in[position]], user_id, created_at)
+                        results[position] = (recipe_id, None)
+                    except IntegrityError as e:
+                        duplicate_id = self.find_duplicate(
+                            db, owner_id=user_id,
+                            content_hash=self._content_hash(objs_in[position])
+                        )
+                        error = DuplicateRecipeError(duplicate_id) if duplicate_id is not None else e.orig
+                        results[position] = (None, str(error))
+                    except SQLAlchemyError as e:
+                        results[position] = (None, str(getattr(e, "orig", None) or e))
+        
+        # Core inserts bypass the ORM flush events that keep the recipe indexes and
+        # the collection version fresh
+        names = {
+            recipe_id: (user_id, obj_in.recipe_name)
+            for obj_in, (recipe_id, _) in zip(objs_in, results) if recipe_id is not None
+        }
+        if names:
+            bump_versions(db.connection(), [recipe_scope(user_id)])
+            record_changes(db, RecipeChanges(recipe_ids=names.keys(), owner_ids=[user_id], names=names))
+        db.commit()
+        return results
+    
+    def _insert_batch(
+        self, db: Session, objs_in: List[RecipeCreate], user_id: Optional[int], created_at: datetime
+    ) -> List[int]:
+        """Insert recipes and their ingredients without going through the ORM unit of work"""
+        recipe_rows = [
+            {
+                **obj_in.model_dump(exclude={"ingredients"}),
+                "created_by_user_id": user_id,
+                "created_at": created_at,
+                "content_hash": self._content_hash(obj_in)
+            }
+            for obj_in in objs_in
+        ]
+        recipe_ids = db.execute(
+            insert(Recipe.__table__).returning(Recipe.__table__.c.id, sort_by_parameter_order=True),
+            recipe_rows
+        ).scalars().all()
+        
+        canonical_ids = ingredient_dictionary_service.resolve(
+            db, [ingredient.ingredient_name for obj_in in objs_in for ingredient in obj_in.ingredients]
+        )
+        ingredient_rows = [
+            {
+                **ingredient.model_dump(),
+                "recipe_id": recipe_id,
+                "normalized_name": name,
+                "canonical_ingredient_id": canonical_ids.get(name)
+            }
+            for obj_in, recipe_id in zip(objs_in, recipe_ids)
+            for ingredient in obj_in.ingredients
+            for name in [normalize_ingredient_name(ingredient.ingredient_name)]
+        ]
+        if ingredient_rows:
+            db.execute(insert(RecipeIngredient.__table__), ingredient_rows)
+        return recipe_ids
+    
+    def _content_hash(self, obj_in: RecipeCreate) -> str:
+        return recipe_content_hash(obj_in.recipe_name, [ingredient.ingredient_name for ingredient in obj_in.ingredients])
+    
     def update_with_ingredients(
         self, db: Session, *, db_obj: Recipe, obj_in: RecipeUpdate
     ) -> Recipe:
-        """Update recipe and its ingredients"""
+        """
+        Update recipe and its ingredients.
+        Raises DuplicateRecipeError if the result matches another of the owner's recipes.
+        """
         # Update recipe fields
         update_data = obj_in.dict(exclude_unset=True, exclude={"ingredients"})
         for field, value in update_data.items():
             setattr(db_obj, field, value)
         
-        # Update ingredients if provided
+        # Update ingredients if provided (only the rows that actually changed)
+        changes = None
         if obj_in.ingredients is not None:
-            # Delete existing ingredients
-            existing_ingredients = db.exec(
-                select(RecipeIngredient).where(RecipeIngredient.recipe_id == db_obj.id)
+            changes = self.sync_ingredients(db, recipe_id=db_obj.id, ingredients=obj_in.ingredients)
+        
+        owner_id, content_hash = db_obj.created_by_user_id, db_obj.content_hash
+        if "recipe_name" in update_data or (changes and changes.changed_names):
+            ingredient_names = db.exec(
+                select(RecipeIngredient.ingredient_name).where(RecipeIngredient.recipe_id == db_obj.id)
             ).all()
-            for ingredient in existing_ingredients:
-                db.delete(ingredient)
-            
-            # Create new ingredients
-            for ingredient_data in obj_in.ingredients:
-                db_ingredient = RecipeIngredient(
-                    **ingredient_data.dict(),
-                    recipe_id=db_obj.id
-                )
-                db.add(db_ingredient)
+            content_hash = db_obj.content_hash = recipe_content_hash(db_obj.recipe_name, ingredient_names)
         
-        db.commit()
+        db.add(db_obj)
+        if changes and changes.changed_names:
+            # Core statements bypass the ORM flush events that keep the recipe indexes and cache fresh
+            record_changes(db, RecipeChanges(recipe_ids=[db_obj.id]))
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise DuplicateRecipeError(self.find_duplicate(db, owner_id=owner_id, content_hash=content_hash))
         db.refresh(db_obj)
         return self.get_with_ingredients(db, id=db_obj.id)
     
+    def sync_ingredients(
+        self, db: Session, *, recipe_id: int, ingredients: List[RecipeIngredientCreate]
+    ) -> IngredientChanges:
+        """
+        Make a recipe's stored ingredients match the submitted list without committing.
+        
+        Stored and submitted rows are paired by normalized name; only the difference
+        is written: one executemany UPDATE for rows whose quantity, unit or spelling
+        changed, one executemany INSERT for new names and one DELETE for names no
+        longer present. Unchanged rows keep their ids.
+        Returns the normalized names that were added, updated and removed.
+        """
+        stored: Dict[str, List[RecipeIngredient]] = {}
+        for row in db.exec(
+            select(RecipeIngredient).where(RecipeIngredient.recipe_id == recipe_id).order_by(RecipeIngredient.id)
+        ).all():
+            stored.setdefault(row.normalized_name or normalize_ingredient_name(row.ingredient_name), []).append(row)
+        
+        canonical_ids = ingredient_dictionary_service.resolve(
+            db, [ingredient.ingredient_name for ingredient in ingredients]
+        )
+        updates, inserts, updated_rows = [], [], []
+        added, updated = set(), set()
+        for ingredient in ingredients:
+            name = normalize_ingredient_name(ingredient.ingredient_name)
+            values = {**ingredient.model_dump(), "normalized_name": name, "canonical_ingredient_id": canonical_ids.get(name)}
+            matches = stored.get(name)
+            if not matches:
+                inserts.append({**values, "recipe_id": recipe_id})
+                added.add(name)
+                continue
+            row = matches.pop(0)
+            if (row.ingredient_name, row.required_quantity, row.required_unit) != (
+                ingredient.ingredient_name, ingredient.required_quantity, ingredient.required_unit
+            ):
+                updates.append({**values, "row_id": row.id})
+                updated_rows.append(row)
+                updated.add(name)
+        removed_ids = [row.id for rows in stored.values() for row in rows]
+        removed = {name for name, rows in stored.items() if rows}
+        
+        table = RecipeIngredient.__table__
+        if updates:
+            # SET columns come from the parameter dictionaries
+            db.execute(update(table).where(table.c.id == bindparam("row_id")), updates)
+        if inserts:
+            db.execute(insert(table), inserts)
+        if removed_ids:
+            db.execute(delete(table).where(table.c.id.in_(removed_ids)))
+        
+        if updates or inserts or removed_ids:
+            owner_id = db.exec(select(Recipe.created_by_user_id).where(Recipe.id == recipe_id)).first()
+            bump_versions(db.connection(), [recipe_scope(owner_id), recipe_item_scope(recipe_id)])
+        
+        # Objects already in the session no longer match the database
+        for rows in stored.values():  # only the removed rows are left
+            for row in rows:
+                db.expunge(row)
+        for row in updated_rows:
+            db.expire(row)
+        loaded_recipe = db.identity_map.get(Session.identity_key(Recipe, recipe_id))
+        if loaded_recipe is not None and (updates or inserts or removed_ids):
+            db.expire(loaded_recipe, ["ingredients"])
+        return IngredientChanges(
+            added=frozenset(added), updated=frozenset(updated), removed=frozenset(removed - added - updated)
+        )
+    
     def get_multi_with_filters(
         self,
         db: Session,
@@ -100,9 +418,13 @@ class CRUDRecipe(CRUDBase[Recipe, RecipeCreate, RecipeUpdate]):
         user_created_only: Optional[bool] = None,
         imported_only: Optional[bool] = None,
         search: Optional[str] = None,
+        fuzzy: bool = False,
         max_calories: Optional[int] = None,
         max_prep_time: Optional[int] = None,
-        ingredients: Optional[List[str]] = None
+        ingredients: Optional[List[str]] = None,
+        sort_by: Optional[str] = None,
+        sort_order: str = "asc",
+        after: Optional[Tuple[Any, int]] = None
     ) -> List[Recipe]:
         """
         Get recipes with filtering support for US3.2
@@ -113,10 +435,272 @@ class CRUDRecipe(CRUDBase[Recipe, RecipeCreate, RecipeUpdate]):
         - max_calories: Maximum calories per recipe
         - max_prep_time: Maximum preparation time in minutes
         - ingredients: List of ingredients that recipes must contain
+        - fuzzy: match the search against recipe names tolerating typos
+          (see recipe_name_index_service) instead of the full-text index
+        
+        Ordering / pagination:
+        - sort_by: one of RECIPE_SORT_FIELDS (default created_at). Searches without
+          an explicit sort_by are ordered by relevance instead.
+        - after: (sort value, recipe id) of the last row already seen; enables
+          keyset pagination and replaces skip
         """
-        # Start with base query
-        query = select(Recipe).options(selectinload(Recipe.ingredients))
+        query = self._build_list_query(
+            db, self._page_select(),
+            user_id=user_id, skip=skip, limit=limit,
+            user_created_only=user_created_only, imported_only=imported_only,
+            search=search, fuzzy=fuzzy, max_calories=max_calories, max_prep_time=max_prep_time,
+            ingredients=ingredients, sort_by=sort_by, sort_order=sort_order, after=after
+        )
+        return db.exec(query).all()
+    
+    def get_multi_with_total(
+        self,
+        db: Session,
+        *,
+        user_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100,
+        user_created_only: Optional[bool] = None,
+        imported_only: Optional[bool] = None,
+        search: Optional[str] = None,
+        fuzzy: bool = False,
+        max_calories: Optional[int] = None,
+        max_prep_time: Optional[int] = None,
+        ingredients: Optional[List[str]] = None,
+        sort_by: Optional[str] = None,
+        sort_order: str = "asc",
+        after: Optional[Tuple[Any, int]] = None,
+        estimate_total: bool = False,
+        summary: bool = False,
+        include_ingredient_count: bool = False
+    ) -> Tuple[List[Any], int, bool]:
+        """
+        Get a page of recipes and the total number of matches in one round trip.
         
+        Same filters and ordering as get_multi_with_filters. The total comes from a
+        `count(*) OVER ()` window on the page query itself. Returns
+        (recipes, total, total_is_estimate).
+        
+        With estimate_total the total is the planner's row estimate for the filtered
+        query (PostgreSQL only; other databases fall back to an exact count), which
+        is far cheaper than counting broad listings exactly.
+        
+        With summary only the RECIPE_SUMMARY_COLUMNS are selected (no instructions,
+        no ingredient rows) and the page holds rows instead of Recipe objects;
+        include_ingredient_count adds an `ingredient_count` column.
+        """
+        filters = dict(
+            user_id=user_id, user_created_only=user_created_only, imported_only=imported_only,
+            search=search, fuzzy=fuzzy, max_calories=max_calories, max_prep_time=max_prep_time,
+            ingredients=ingredients
+        )
+        
+        page = dict(sort_by=sort_by, sort_order=sort_order, limit=limit)
+        
+        if estimate_total or after is not None:
+            query = self._build_list_query(
+                db, self._page_select(summary, include_ingredient_count),
+                skip=skip, after=after, **page, **filters
+            )
+            recipes = db.exec(query).all()
+            if estimate_total:
+                estimate = self.estimate_count_with_filters(db, **filters)
+                if estimate is not None:
+                    # Never report fewer rows than we can prove exist
+                    return recipes, max(estimate, skip + len(recipes)), True
+            # (Cursor pages: the window would only count rows past the cursor)
+            return recipes, self.count_with_filters(db, **filters), False
+        
+        total_count = func.count().over().label("total_count")
+        query = self._build_list_query(
+            db, self._page_select(summary, include_ingredient_count, total_count),
+            skip=skip, **page, **filters
+        )
+        rows = db.exec(query).all()
+        if rows:
+            # Summary rows keep the extra total_count column; it is not serialized
+            recipes = rows if summary else [row[0] for row in rows]
+            return recipes, rows[0].total_count, False
+        if skip > 0:
+            # Page past the end: the window has no row to report the total on
+            return [], self.count_with_filters(db, **filters), False
+        return [], 0, False
+    
+    def count_with_filters(
+        self,
+        db: Session,
+        *,
+        user_id: Optional[int] = None,
+        user_created_only: Optional[bool] = None,
+        imported_only: Optional[bool] = None,
+        search: Optional[str] = None,
+        fuzzy: bool = False,
+        max_calories: Optional[int] = None,
+        max_prep_time: Optional[int] = None,
+        ingredients: Optional[List[str]] = None
+    ) -> int:
+        """
+        Count recipes with filtering support for pagination
+        """
+        query, _ = self._apply_filters(
+            db, select(func.count(Recipe.id)),
+            user_id=user_id, user_created_only=user_created_only, imported_only=imported_only,
+            search=search, fuzzy=fuzzy, max_calories=max_calories, max_prep_time=max_prep_time,
+            ingredients=ingredients
+        )
+        return db.exec(query).one()
+    
+    def estimate_count_with_filters(
+        self,
+        db: Session,
+        *,
+        user_id: Optional[int] = None,
+        user_created_only: Optional[bool] = None,
+        imported_only: Optional[bool] = None,
+        search: Optional[str] = None,
+        fuzzy: bool = False,
+        max_calories: Optional[int] = None,
+        max_prep_time: Optional[int] = None,
+        ingredients: Optional[List[str]] = None
+    ) -> Optional[int]:
+        """
+        Planner row estimate for the filtered recipe query, without executing it.
+        Returns None when the database cannot provide one (anything but PostgreSQL).
+        """
+        dialect = db.get_bind().dialect
+        if dialect.name != "postgresql":
+            return None
+        
+        query, _ = self._apply_filters(
+            db, select(Recipe.id),
+            user_id=user_id, user_created_only=user_created_only, imported_only=imported_only,
+            search=search, fuzzy=fuzzy, max_calories=max_calories, max_prep_time=max_prep_time,
+            ingredients=ingredients
+        )
+        # Expanding IN parameters (e.g. the fuzzy search ids) must be rendered inline
+        compiled = query.compile(dialect=dialect, compile_kwargs={"render_postcompile": True})
+        plan = db.connection().exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled.string}", compiled.params
+        ).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    
+    def facet_counts(
+        self,
+        db: Session,
+        *,
+        user_id: Optional[int] = None,
+        user_created_only: Optional[bool] = None,
+        imported_only: Optional[bool] = None,
+        search: Optional[str] = None,
+        fuzzy: bool = False,
+        max_calories: Optional[int] = None,
+        max_prep_time: Optional[int] = None,
+        ingredients: Optional[List[str]] = None,
+        ingredient_limit: int = 10
+    ) -> Dict[str, List[Tuple[Any, int]]]:
+        """
+        Facet counts for the recipes matching the listing filters.
+        
+        Returns {"calories": [(max_kcal, count)], "prep_time": [(max_minutes, count)],
+        "ingredients": [(normalized name, count)]}. Every calorie and prep time
+        bucket comes from one conditional-aggregation query over the filtered
+        recipes; the most common ingredients from one grouped query.
+        """
+        filtered, _ = self._apply_filters(
+            db, select(Recipe.id, Recipe.estimated_calories, Recipe.preparation_time_minutes),
+            user_id=user_id, user_created_only=user_created_only, imported_only=imported_only,
+            search=search, fuzzy=fuzzy, max_calories=max_calories, max_prep_time=max_prep_time,
+            ingredients=ingredients
+        )
+        filtered = filtered.subquery("filtered")
+        
+        buckets = [
+            func.count(case((filtered.c.estimated_calories <= limit, 1)))
+            for limit in RECIPE_CALORIE_FACETS
+        ] + [
+            func.count(case((filtered.c.preparation_time_minutes <= limit, 1)))
+            for limit in RECIPE_PREP_TIME_FACETS
+        ]
+        counts = db.exec(select(*buckets)).one()
+        
+        ingredient_count = func.count(distinct(RecipeIngredient.recipe_id))
+        top_ingredients = db.exec(
+            select(RecipeIngredient.normalized_name, ingredient_count)
+            .where(RecipeIngredient.recipe_id.in_(select(filtered.c.id)))
+            .where(RecipeIngredient.normalized_name.is_not(None))
+            .group_by(RecipeIngredient.normalized_name)
+            .order_by(ingredient_count.desc(), RecipeIngredient.normalized_name)
+            .limit(ingredient_limit)
+        ).all()
+        
+        calorie_count = len(RECIPE_CALORIE_FACETS)
+        return {
+            "calories": list(zip(RECIPE_CALORIE_FACETS, counts[:calorie_count])),
+            "prep_time": list(zip(RECIPE_PREP_TIME_FACETS, counts[calorie_count:])),
+            "ingredients": [tuple(row) for row in top_ingredients],
+        }
+    
+    def _page_select(self, summary: bool = False, include_ingredient_count: bool = False, *extra_columns):
+        """What a listing page selects: full recipes with ingredients, or summary columns"""
+        if not summary:
+            return select(Recipe, *extra_columns).options(selectinload(Recipe.ingredients))
+        columns = [getattr(Recipe, name) for name in RECIPE_SUMMARY_COLUMNS]
+        if include_ingredient_count:
+            # Correlated count served by the recipeingredient.recipe_id index
+            ingredient_count = (
+                select(func.count(RecipeIngredient.id))
+                .where(RecipeIngredient.recipe_id == Recipe.id)
+                .correlate(Recipe)
+                .scalar_subquery()
+            )
+            columns.append(ingredient_count.label("ingredient_count"))
+        return select(*columns, *extra_columns)
+    
+    def _build_list_query(
+        self,
+        db: Session,
+        query,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        sort_by: Optional[str] = None,
+        sort_order: str = "asc",
+        after: Optional[Tuple[Any, int]] = None,
+        **filters
+    ):
+        """Filtered, ordered and paginated recipe query"""
+        if after is not None:
+            return self._keyset_page(db, query, sort_by or "created_at", sort_order, after, limit, filters)
+        query, search_rank = self._apply_filters(db, query, **filters)
+        
+        if search_rank is not None and sort_by is None:
+            query = query.order_by(search_rank, Recipe.id)
+        else:
+            query = self._apply_keyset(query, sort_by or "created_at", sort_order)
+        
+        # Apply pagination
+        return query.offset(skip).limit(limit)
+    
+    def _apply_filters(
+        self,
+        db: Session,
+        query,
+        *,
+        user_id: Optional[int] = None,
+        user_created_only: Optional[bool] = None,
+        imported_only: Optional[bool] = None,
+        search: Optional[str] = None,
+        fuzzy: bool = False,
+        max_calories: Optional[int] = None,
+        max_prep_time: Optional[int] = None,
+        ingredients: Optional[List[str]] = None
+    ):
+        """
+        Apply the recipe listing filters (shared by the list, count and estimate queries).
+        Returns the query and the search relevance expression (None without a search).
+        """
         # Base access control
         if user_id is not None:
             if user_created_only:
@@ -139,15 +723,12 @@ class CRUDRecipe(CRUDBase[Recipe, RecipeCreate, RecipeUpdate]):
             # The AuthGuard on the frontend should prevent unauthenticated access to "Minhas Receitas".
             query = query.where(Recipe.created_by_user_id.is_(None))
         
-        # AC3.2.1: Filter by search term
-        if search:
-            search_term = f"%{search.lower()}%"
-            query = query.where(
-                or_(
-                    Recipe.recipe_name.ilike(search_term),
-                    Recipe.instructions.ilike(search_term)
-                )
-            )
+        # AC3.2.1: Filter by search term (full-text, ranked by relevance)
+        search_rank = None
+        if search and fuzzy:
+            query, search_rank = self._apply_fuzzy_search(db, query, search, user_id)
+        elif search:
+            query, search_rank = self._apply_search(db, query, search)
         
         # AC3.2.2: Filter by maximum calories
         if max_calories is not None:
@@ -167,54 +748,84 @@ class CRUDRecipe(CRUDBase[Recipe, RecipeCreate, RecipeUpdate]):
                 )
             )
         
-        # AC3.2.4: Filter by ingredients (complex - requires join with RecipeIngredients)
-        if ingredients and len(ingredients) > 0:
-            # Create subquery to find recipes that contain ALL specified ingredients
-            for ingredient_name in ingredients:
-                ingredient_subquery = select(RecipeIngredient.recipe_id).where(
-                    RecipeIngredient.ingredient_name.ilike(f"%{ingredient_name}%")
-                )
-                query = query.where(Recipe.id.in_(ingredient_subquery))
-        
-        # Apply pagination
-        query = query.offset(skip).limit(limit)
+        # AC3.2.4: Filter by ingredients - recipes must contain ALL of them
+        if ingredients:
+            query = query.where(Recipe.id.in_(self._ingredient_match_subquery(ingredients)))
         
-        return db.exec(query).all()
+        return query, search_rank
     
-    def count_with_filters(
-        self,
-        db: Session,
-        *,
-        user_id: Optional[int] = None,
-        user_created_only: Optional[bool] = None,
-        imported_only: Optional[bool] = None,
-        search: Optional[str] = None,
-        max_calories: Optional[int] = None,
-        max_prep_time: Optional[int] = None,
-        ingredients: Optional[List[str]] = None
-    ) -> int:
-        """
-        Count recipes with filtering support for pagination
+    def _apply_keyset(self, query, sort_by: str, sort_order: str):
+        """Order by (sort key, id) with NULL sort values last"""
+        field = RECIPE_SORT_FIELDS[sort_by]
+        direction = desc if sort_order == "desc" else asc
+        return query.order_by(field.is_(None), direction(field), direction(Recipe.id))
+    
+    def _keyset_page(
+        self, db: Session, query, sort_by: str, sort_order: str, after: Tuple[Any, int], limit: int, filters: dict
+    ):
         """
-        from sqlmodel import func
+        The page of `query` after a cursor position, in _apply_keyset order.
         
-        # Start with base query for counting
-        query = select(func.count(Recipe.id))
+        The page ids come from two branches that each read one range of the
+        (owner, sort key, id) index in index order: the non-NULL keys after the
+        cursor, as a row-value seek `(key, id) > (:value, :id)`, and the trailing
+        block of NULL keys. Each branch stops after `limit` rows and only those
+        (at most 2 * limit) are merged and sorted, so deep pages cost the same as
+        the first one.
+        """
+        field = RECIPE_SORT_FIELDS[sort_by]
+        descending = sort_order == "desc"
+        direction = desc if descending else asc
+        value, last_id = after
+        keys, _ = self._apply_filters(db, select(Recipe.id, field.label("sort_key")), **filters)
         
-        # Apply same filters as get_multi_with_filters
-        if user_id is not None:
-            if user_created_only:
-                query = query.where(Recipe.created_by_user_id == user_id)
-            elif imported_only:
-                query = query.where(Recipe.created_by_user_id == user_id) # Assuming imported recipes are assigned to user
-            else:
-                # User's recipes (created + imported)
-                query = query.where(Recipe.created_by_user_id == user_id)
+        null_tail = keys.where(field.is_(None))
+        if value is None:
+            # Already in the trailing NULL block
+            branches = [null_tail.where(Recipe.id < last_id if descending else Recipe.id > last_id)]
         else:
-            # No user context - only system recipes
-            query = query.where(Recipe.created_by_user_id.is_(None))
-
-        if search:
+            position, cursor = tuple_(field, Recipe.id), tuple_(value, last_id)
+            branches = [
+                keys.where(field.is_not(None), position < cursor if descending else position > cursor)
+                .order_by(direction(field), direction(Recipe.id)),
+                null_tail,
+            ]
+        branches[-1] = branches[-1].order_by(direction(Recipe.id))
+        subqueries = [branch.limit(limit).subquery() for branch in branches]
+        page = union_all(*(select(subquery.c.id, subquery.c.sort_key) for subquery in subqueries)).subquery("page")
+        return (
+            query.join(page, page.c.id == Recipe.id)
+            .order_by(page.c.sort_key.is_(None), direction(page.c.sort_key), direction(page.c.id))
+            .limit(limit)
+        )
+    
+    def _ingredient_match_subquery(self, ingredients: List[str]):
+        """
+        Ids of recipes containing every requested ingredient (substring match on the
+        normalized name), as one GROUP BY / HAVING count(DISTINCT term) = n query.
+        Runs off the trigram index on recipeingredient.normalized_name on PostgreSQL.
+        """
+        terms = sorted({normalize_ingredient_name(name) for name in ingredients} - {""})
+        if not terms:
+            return select(RecipeIngredient.recipe_id)
+        
+        wanted = union_all(*(select(literal(term).label("term")) for term in terms)).subquery("wanted")
+        return (
+            select(RecipeIngredient.recipe_id)
+            .join(wanted, RecipeIngredient.normalized_name.contains(wanted.c.term))
+            .group_by(RecipeIngredient.recipe_id)
+            .having(func.count(distinct(wanted.c.term)) == len(terms))
+        )
+    
+    def _apply_search(self, db: Session, query, search: str):
+        """
+        Restrict a query to recipes matching a search term.
+        Uses the full-text index (tsvector on PostgreSQL, FTS5 on SQLite) and
+        returns the query together with a relevance expression (lower is better).
+        """
+        search_filter = build_search_filter(db, search)
+        if search_filter is None:
+            # No full-text backend for this database - plain substring match
             search_term = f"%{search.lower()}%"
             query = query.where(
                 or_(
@@ -222,30 +833,24 @@ class CRUDRecipe(CRUDBase[Recipe, RecipeCreate, RecipeUpdate]):
                     Recipe.instructions.ilike(search_term)
                 )
             )
-            
-        if max_calories is not None:
-            query = query.where(
-                and_(
-                    Recipe.estimated_calories.is_not(None),
-                    Recipe.estimated_calories <= max_calories
-                )
-            )
+            return query, None
         
-        if max_prep_time is not None:
-            query = query.where(
-                and_(
-                    Recipe.preparation_time_minutes.is_not(None),
-                    Recipe.preparation_time_minutes <= max_prep_time
-                )
-            )
-        
-        if ingredients and len(ingredients) > 0:
-            for ingredient_name in ingredients:
-                ingredient_subquery = select(RecipeIngredient.recipe_id).where(
-                    RecipeIngredient.ingredient_name.ilike(f"%{ingredient_name}%")
-                )
-                query = query.where(Recipe.id.in_(ingredient_subquery))
-        
-        return db.exec(query).one()
+        condition, rank, join_target = search_filter
+        if join_target is not None:
+            query = query.join(join_target, condition)
+        else:
+            query = query.where(condition)
+        return query, rank
+    
+    def _apply_fuzzy_search(self, db: Session, query, search: str, owner_id: Optional[int]):
+        """
+        Restrict a query to recipes whose name matches every search word within a
+        few typos. Relevance is the summed edit distance (lower is better).
+        """
+        scores = recipe_name_index_service.search(db, search, owner_id)
+        if not scores:
+            return query.where(false()), literal(0)
+        rank = case(scores, value=Recipe.id, else_=len(scores))
+        return query.where(Recipe.id.in_(list(scores))), rank
 
 recipe = CRUDRecipe(Recipe)
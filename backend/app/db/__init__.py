@@ -1,4 +1,6 @@
 from .session import engine, create_db_and_tables, get_db_session
 from .base_class import BaseModel
+from . import fulltext  # registers the full-text search DDL on the recipe table
+from . import versioning  # registers the collection version (ETag) flush listener
 
-__all__ = ["engine", "create_db_and_tables", "get_db_session", "BaseModel"]
\ No newline at end of file
+__all__ = ["engine", "create_db_and_tables", "get_db_session", "BaseModel"]
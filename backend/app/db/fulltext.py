@@ -0,0 +1,127 @@
+"""
+Full-text search backend for recipes.
+
+PostgreSQL: a generated `search_vector` tsvector column (Portuguese + English
+configurations, recipe name weighted above instructions) with a GIN index.
+SQLite: an external-content FTS5 table kept in sync by triggers.
+
+Recipe ingredient names get a trigram index on PostgreSQL so the ingredient
+filter's substring match on `normalized_name` does not scan the table.
+
+Both are created together with the `recipe` table (see the DDL listeners below)
+and by the matching Alembic migrations for existing databases.
+"""
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import DDL, Float, Integer, event, func, literal_column, text
+from sqlalchemy.sql import ColumnElement
+from sqlmodel import Session
+
+from app.models.recipe_models import Recipe, RecipeIngredient
+
+# Portuguese first: most of the catalog and user input is Portuguese
+TS_CONFIGS = ("portuguese", "english")
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+POSTGRES_SEARCH_VECTOR = (
+    "setweight(to_tsvector('portuguese', coalesce(recipe_name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(recipe_name, '')), 'A') || "
+    "setweight(to_tsvector('portuguese', coalesce(instructions, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(instructions, '')), 'B')"
+)
+
+POSTGRES_DDL = [
+    f"ALTER TABLE recipe ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    f"GENERATED ALWAYS AS ({POSTGRES_SEARCH_VECTOR}) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_recipe_search_vector ON recipe USING GIN (search_vector)",
+]
+
+POSTGRES_INGREDIENT_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_recipeingredient_normalized_name_trgm "
+    "ON recipeingredient USING GIN (normalized_name gin_trgm_ops)",
+]
+
+SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS recipe_fts USING fts5("
+    "recipe_name, instructions, content='recipe', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS recipe_fts_ai AFTER INSERT ON recipe BEGIN "
+    "INSERT INTO recipe_fts(rowid, recipe_name, instructions) "
+    "VALUES (new.id, new.recipe_name, new.instructions); END",
+    "CREATE TRIGGER IF NOT EXISTS recipe_fts_ad AFTER DELETE ON recipe BEGIN "
+    "INSERT INTO recipe_fts(recipe_fts, rowid, recipe_name, instructions) "
+    "VALUES ('delete', old.id, old.recipe_name, old.instructions); END",
+    "CREATE TRIGGER IF NOT EXISTS recipe_fts_au AFTER UPDATE OF recipe_name, instructions ON recipe BEGIN "
+    "INSERT INTO recipe_fts(recipe_fts, rowid, recipe_name, instructions) "
+    "VALUES ('delete', old.id, old.recipe_name, old.instructions); "
+    "INSERT INTO recipe_fts(rowid, recipe_name, instructions) "
+    "VALUES (new.id, new.recipe_name, new.instructions); END",
+    # Index rows that existed before the FTS table was created
+    "INSERT INTO recipe_fts(recipe_fts) VALUES ('rebuild')",
+]
+
+for _statement in POSTGRES_DDL:
+    event.listen(Recipe.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+for _statement in SQLITE_DDL:
+    event.listen(Recipe.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+for _statement in POSTGRES_INGREDIENT_DDL:
+    event.listen(RecipeIngredient.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+event.listen(
+    Recipe.__table__, "before_drop",
+    DDL("DROP TABLE IF EXISTS recipe_fts").execute_if(dialect="sqlite")
+)
+
+
+def tokenize_query(search: str) -> List[str]:
+    """Split user input into plain word tokens (drops FTS operators and punctuation)"""
+    return [token.lower() for token in _TOKEN_RE.findall(search)]
+
+
+def build_search_filter(
+    db: Session, search: str
+) -> Optional[Tuple[ColumnElement, ColumnElement, Optional[object]]]:
+    """
+    Build the full-text filter for a search term.
+
+    Returns (condition, rank, join_target): rank sorts ascending by relevance and
+    join_target is a selectable to join on its condition (SQLite only).
+    Returns None if the dialect has no full-text backend (callers fall back to ilike).
+    """
+    tokens = tokenize_query(search)
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "postgresql":
+        if not tokens:
+            return literal_column("false"), literal_column("0"), None
+        # Prefix match on every token, all tokens required
+        ts_query_text = " & ".join(f"{token}:*" for token in tokens)
+        ts_query = None
+        for config in TS_CONFIGS:
+            part = func.to_tsquery(config, ts_query_text)
+            ts_query = part if ts_query is None else ts_query.op("||")(part)
+        search_vector = literal_column("recipe.search_vector")
+        condition = search_vector.op("@@")(ts_query)
+        # ts_rank is "higher is better"; negate so callers can always sort ascending
+        rank = -func.ts_rank(search_vector, ts_query)
+        return condition, rank, None
+
+    if dialect == "sqlite":
+        if not tokens:
+            return literal_column("0"), literal_column("0"), None
+        match = " ".join(f'"{token}"*' for token in tokens)
+        # bm25 is "lower is better"; recipe name weighted over instructions
+        fts = (
+            text(
+                "SELECT rowid AS recipe_id, bm25(recipe_fts, 10.0, 1.0) AS rank "
+                "FROM recipe_fts WHERE recipe_fts MATCH :match"
+            )
+            .bindparams(match=match)
+            .columns(recipe_id=Integer, rank=Float)
+            .subquery("recipe_fts_match")
+        )
+        return Recipe.id == fts.c.recipe_id, fts.c.rank, fts
+
+    return None
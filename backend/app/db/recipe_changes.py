@@ -0,0 +1,146 @@
+"""
+Dispatch of committed recipe writes to the in-process recipe caches and indexes.
+
+One set of session listeners collects the recipes each flush touched (recipes
+and their ingredient rows), per (nested) transaction, and once the outermost
+transaction commits hands the merged RecipeChanges to every subscribed handler.
+Changes made inside a savepoint that rolls back are dropped; a full rollback
+drops everything. Flushes that touch no recipe leave the session alone.
+
+ORM writes are tracked automatically. Code that writes recipes through core
+INSERT/UPDATE/DELETE statements must report them with record_changes before
+committing.
+"""
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session as SASession, SessionTransaction
+
+from app.models.recipe_models import Recipe, RecipeIngredient
+
+logger = logging.getLogger(__name__)
+
+# Key used to stash (transaction, changes) pairs on a session, in flush order,
+# until the outer transaction commits
+_PENDING_KEY = "recipe_changes_pending"
+
+
+class RecipeChanges:
+    """Recipes written by one transaction"""
+
+    __slots__ = ("recipe_ids", "owner_ids", "names", "deleted_ids")
+
+    def __init__(
+        self,
+        recipe_ids: Iterable[int] = (),
+        owner_ids: Iterable[Optional[int]] = (),
+        names: Optional[Dict[int, Tuple[Optional[int], str]]] = None,
+        deleted_ids: Iterable[int] = (),
+    ):
+        # Every recipe written, directly or through one of its ingredient rows
+        self.recipe_ids: Set[int] = set(recipe_ids)
+        # Owners of the written recipes (None: system recipes), previous owners included
+        self.owner_ids: Set[Optional[int]] = set(owner_ids)
+        # Recipe id -> (owner, name) of added, changed or re-owned recipes
+        self.names: Dict[int, Tuple[Optional[int], str]] = dict(names or {})
+        self.deleted_ids: Set[int] = set(deleted_ids)
+
+    def __bool__(self) -> bool:
+        return bool(self.recipe_ids or self.owner_ids)
+
+    def merge(self, later: "RecipeChanges") -> None:
+        """Fold in changes made after these ones"""
+        self.recipe_ids |= later.recipe_ids
+        self.owner_ids |= later.owner_ids
+        for recipe_id in later.deleted_ids:
+            self.names.pop(recipe_id, None)
+        self.deleted_ids |= later.deleted_ids
+        self.names.update(later.names)
+
+
+_handlers: List[Callable[[RecipeChanges], None]] = []
+
+
+def subscribe(handler: Callable[[RecipeChanges], None]) -> Callable[[RecipeChanges], None]:
+    """Call handler with the changes of every committed transaction that wrote recipes"""
+    _handlers.append(handler)
+    return handler
+
+
+def record_changes(session: SASession, changes: RecipeChanges) -> None:
+    """Report recipe writes made in the session's current transaction; dispatched on commit"""
+    if not changes:
+        return
+    transaction = session.get_nested_transaction() or session.get_transaction()
+    session.info.setdefault(_PENDING_KEY, []).append((transaction, changes))
+
+
+def _dispatch(changes: RecipeChanges) -> None:
+    for handler in _handlers:
+        try:
+            handler(changes)
+        except Exception:
+            # The write is already committed: keep notifying the other services
+            logger.exception(f"Recipe change handler {handler.__qualname__} failed")
+
+
+def _is_within(transaction: SessionTransaction, ancestor: SessionTransaction) -> bool:
+    while transaction is not None:
+        if transaction is ancestor:
+            return True
+        transaction = transaction.parent
+    return False
+
+
+@event.listens_for(SASession, "after_flush")
+def _collect_recipe_changes(session, flush_context):
+    changes = RecipeChanges()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Recipe):
+            changes.owner_ids.add(obj.created_by_user_id)
+            # Ownership changes must also refresh the previous owner's data
+            changes.owner_ids.update(inspect(obj).attrs.created_by_user_id.history.deleted or ())
+            if obj.id is None:
+                continue
+            changes.recipe_ids.add(obj.id)
+            if obj in session.deleted:
+                changes.deleted_ids.add(obj.id)
+            else:
+                changes.names[obj.id] = (obj.created_by_user_id, obj.recipe_name)
+        elif isinstance(obj, RecipeIngredient) and obj.recipe_id is not None:
+            changes.recipe_ids.add(obj.recipe_id)
+    record_changes(session, changes)
+
+
+@event.listens_for(SASession, "after_commit")
+def _dispatch_recipe_changes(session):
+    # Also fired when a savepoint is released: wait for the outer commit
+    if session.in_nested_transaction():
+        return
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    changes = RecipeChanges()
+    for _, later in pending:
+        changes.merge(later)
+    _dispatch(changes)
+
+
+@event.listens_for(SASession, "after_soft_rollback")
+def _discard_savepoint_recipe_changes(session, previous_transaction):
+    """Writes made inside a rolled-back savepoint (or one nested in it) never happened"""
+    pending = session.info.get(_PENDING_KEY)
+    if pending and previous_transaction.nested:
+        pending[:] = [
+            (transaction, changes) for transaction, changes in pending
+            if not _is_within(transaction, previous_transaction)
+        ]
+
+
+@event.listens_for(SASession, "after_rollback")
+def _discard_recipe_changes(session):
+    # Savepoint rollbacks are handled above
+    if session.in_nested_transaction():
+        return
+    session.info.pop(_PENDING_KEY, None)
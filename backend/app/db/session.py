@@ -24,7 +24,7 @@ def create_db_and_tables():
     # as Alembic handles table creation and migrations.
     # However, it can be useful for initial setup or testing without Alembic.
     from app.models import User  # Import User model
-    from app.models import PantryItem, Recipe, RecipeIngredient, UserPreference # Import other models
+    from app.models import PantryExpiryAlert, PantryItem, PantryItemTombstone, Recipe, RecipeIngredient, UserPreference, CollectionVersion, Ingredient, RecipeStats # Import other models
     from sqlmodel import SQLModel # Import SQLModel
     SQLModel.metadata.create_all(engine)
     print("Database and tables created via SQLModel.metadata.create_all(engine).")
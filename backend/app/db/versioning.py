@@ -0,0 +1,178 @@
+"""
+Per-collection version counters backing ETags (conditional GET).
+
+Every write to a user's recipes or pantry bumps a counter in the
+`collectionversion` table in the same transaction, so a client can revalidate a
+cached response with one primary-key lookup instead of a full query.
+
+Each recipe also has its own scope (recipe_item_scope), bumped when the recipe
+or its ingredients change after creation: single-recipe ETags and the recipe
+cache are validated against it, so a write to one recipe does not invalidate
+every other recipe of the same owner.
+
+The pantry counter doubles as the delta-sync clock: every written pantry row
+is stamped with the user's pantry version after the write, and every deleted
+one leaves a PantryItemTombstone with that version. Tombstones are pruned
+after a retention period (pantry_expiry_service); the highest pruned version
+is kept in the pantry_pruned_scope counter and older sync tokens are rejected.
+Because the counter row
+stays locked until the writing transaction commits, versions become visible in
+order and "rows with version > N" is a complete change feed since N.
+
+ORM writes are tracked automatically by the flush listeners below. Code that
+writes through core INSERT/UPDATE/DELETE statements must call bump_versions
+(and stamp or tombstone pantry rows itself).
+"""
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Set
+
+from sqlalchemy import Connection, String, cast, event, func, inspect, insert, literal, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session as SASession
+from sqlmodel import Session, select
+
+from app.models.collection_version_models import CollectionVersion
+from app.models.pantry_models import PantryItem, PantryItemTombstone
+from app.models.recipe_models import Recipe, RecipeIngredient
+
+_DIALECT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def recipe_scope(owner_id: Optional[int]) -> str:
+    """Version scope of the recipes owned by a user (None: system recipes)"""
+    return "recipes:system" if owner_id is None else f"recipes:{owner_id}"
+
+
+def recipe_item_scope(recipe_id: int) -> str:
+    """Version scope of one recipe and its ingredients"""
+    return f"recipe:{recipe_id}"
+
+
+def pantry_scope(user_id: int) -> str:
+    """Version scope of a user's pantry"""
+    return f"pantry:{user_id}"
+
+
+def pantry_pruned_scope(user_id: int) -> str:
+    """Counter holding the highest pantry version whose tombstones were pruned"""
+    return f"pantry-pruned:{user_id}"
+
+
+def get_version(db: Session, scope: str) -> int:
+    """Current version of a scope (0 if it was never written)"""
+    version = db.exec(select(CollectionVersion.version).where(CollectionVersion.scope == scope)).first()
+    return version or 0
+
+
+def get_recipe_versions(db: Session) -> Dict[int, int]:
+    """
+    Recipe id -> recipe_item_scope version (0 if never bumped) of every recipe.
+    In-memory indexes compare two of these to find recipes created, changed or
+    deleted by other processes since they last looked.
+    """
+    scope = literal("recipe:", String) + cast(Recipe.id, String)
+    return dict(db.exec(
+        select(Recipe.id, func.coalesce(CollectionVersion.version, 0))
+        .outerjoin(CollectionVersion, CollectionVersion.scope == scope)
+    ).all())
+
+
+def bump_versions(connection: Connection, scopes: Iterable[str]) -> Dict[str, int]:
+    """
+    Increment the given scopes in the connection's current transaction (pass db.connection()).
+    Returns the new version of each scope.
+    """
+    table = CollectionVersion.__table__
+    dialect_insert = _DIALECT_INSERTS.get(connection.dialect.name)
+    versions: Dict[str, int] = {}
+    # Sorted so concurrent transactions lock the counter rows in the same order
+    for scope in sorted(set(scopes)):
+        if dialect_insert is not None:
+            statement = dialect_insert(table).values(scope=scope, version=1)
+            versions[scope] = connection.execute(statement.on_conflict_do_update(
+                index_elements=[table.c.scope], set_={"version": table.c.version + 1}
+            ).returning(table.c.version)).scalar_one()
+            continue
+        result = connection.execute(
+            update(table).where(table.c.scope == scope).values(version=table.c.version + 1)
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(table).values(scope=scope, version=1))
+        versions[scope] = connection.execute(
+            select(table.c.version).where(table.c.scope == scope)
+        ).scalar_one()
+    return versions
+
+
+def set_versions(connection: Connection, versions: Dict[str, int]) -> None:
+    """Set scopes to the given versions in the connection's current transaction (never lowers a scope)"""
+    table = CollectionVersion.__table__
+    for scope in sorted(versions):
+        result = connection.execute(
+            update(table)
+            .where(table.c.scope == scope, table.c.version < versions[scope])
+            .values(version=versions[scope])
+        )
+        if result.rowcount == 0 and connection.execute(
+            select(table.c.version).where(table.c.scope == scope)
+        ).first() is None:
+            connection.execute(insert(table).values(scope=scope, version=versions[scope]))
+
+
+@event.listens_for(SASession, "before_flush")
+def _stamp_pantry_changes(session, flush_context, instances):
+    """Bump the pantry versions touched by the flush, stamp written items and tombstone deleted ones"""
+    written = [obj for obj in session.new if isinstance(obj, PantryItem)] + [
+        obj for obj in session.dirty if isinstance(obj, PantryItem) and session.is_modified(obj)
+    ]
+    deleted = [obj for obj in session.deleted if isinstance(obj, PantryItem)]
+    if not written and not deleted:
+        return
+
+    # Items moved to another user are deleted from the previous owner's pantry
+    moved = [
+        (obj, user) for obj in written if obj.id is not None
+        for user in inspect(obj).attrs.user_id.history.deleted or () if user is not None
+    ]
+    users = {obj.user_id for obj in written + deleted} | {user for _, user in moved}
+    versions = bump_versions(session.connection(), [pantry_scope(user) for user in users if user is not None])
+    now = datetime.utcnow()
+    for obj in written:
+        obj.version = versions[pantry_scope(obj.user_id)]
+        obj.updated_at = now
+    for obj, user in [(obj, obj.user_id) for obj in deleted] + moved:
+        session.add(PantryItemTombstone(
+            item_id=obj.id, user_id=user, version=versions[pantry_scope(user)], deleted_at=now
+        ))
+
+
+@event.listens_for(SASession, "after_flush")
+def _bump_flushed_scopes(session, flush_context):
+    """Bump the scopes of every recipe and recipe ingredient in the flush (pantry items: see above)"""
+    scopes: Set[str] = set()
+    ingredient_recipe_ids: Set[int] = set()
+    changed = list(session.new) + list(session.deleted) + [
+        obj for obj in session.dirty if session.is_modified(obj)
+    ]
+    # Recipes created by this flush have no per-recipe version to bump yet
+    new_recipe_ids = {obj.id for obj in session.new if isinstance(obj, Recipe)}
+    for obj in changed:
+        if isinstance(obj, Recipe):
+            owners = {obj.created_by_user_id}
+            owners.update(inspect(obj).attrs.created_by_user_id.history.deleted or ())
+            scopes.update(recipe_scope(owner) for owner in owners)
+            if obj.id not in new_recipe_ids:
+                scopes.add(recipe_item_scope(obj.id))
+        elif isinstance(obj, RecipeIngredient) and obj.recipe_id is not None:
+            ingredient_recipe_ids.add(obj.recipe_id)
+
+    if not scopes and not ingredient_recipe_ids:
+        return
+    connection = session.connection()
+    if ingredient_recipe_ids:
+        owners = connection.execute(
+            select(Recipe.created_by_user_id).where(Recipe.id.in_(ingredient_recipe_ids)).distinct()
+        ).scalars()
+        scopes.update(recipe_scope(owner) for owner in owners)
+        scopes.update(recipe_item_scope(recipe_id) for recipe_id in ingredient_recipe_ids - new_recipe_ids)
+    bump_versions(connection, scopes)
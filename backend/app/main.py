@@ -3,17 +3,23 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
-from app.db.session import create_db_and_tables
+from app.db.session import create_db_and_tables, engine
 from app.api.v1 import api_router
 from app.models import User
+from app.services.pantry_expiry_service import pantry_expiry_service
+from app.services.recipe_stats_service import recipe_stats_service
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     create_db_and_tables()  # Ensure tables are created on startup
+    recipe_stats_service.start(engine)
+    pantry_expiry_service.start(engine)
     yield
     # Shutdown
+    pantry_expiry_service.stop()
+    recipe_stats_service.stop(engine)  # Flush counters recorded since the last batch
 
 
 app = FastAPI(
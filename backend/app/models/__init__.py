@@ -1,7 +1,10 @@
 from .user_models import User
 from ..schemas.user import UserCreate, UserRead, UserUpdate
-from .pantry_models import PantryItem #, PantryItemCreate, PantryItemRead, PantryItemUpdate
+from .pantry_models import PantryExpiryAlert, PantryItem, PantryItemTombstone #, PantryItemCreate, PantryItemRead, PantryItemUpdate
 from .recipe_models import Recipe, RecipeIngredient #, RecipeCreate, RecipeRead, RecipeUpdate, RecipeIngredientCreate, RecipeIngredientRead
+from .collection_version_models import CollectionVersion
+from .ingredient_models import Ingredient
+from .recipe_stats_models import RecipeStats
 from .user_preference_models import UserPreference #, UserPreferenceCreate, UserPreferenceRead, UserPreferenceUpdate
 
 # It's generally better to import schemas directly in the modules that need them (e.g., CRUD, API endpoints)
@@ -13,9 +16,14 @@ from .user_preference_models import UserPreference #, UserPreferenceCreate, User
 __all__ = [
     "User", "UserCreate", "UserRead", "UserUpdate", # These are correctly imported now
     "PantryItem", 
+    "PantryItemTombstone",
+    "PantryExpiryAlert",
     "Recipe", 
     "RecipeIngredient", 
     "UserPreference", 
+    "CollectionVersion",
+    "Ingredient",
+    "RecipeStats",
     # Commented out schema names that are not currently being imported:
     # "PantryItemCreate", "PantryItemRead", "PantryItemUpdate",
     # "RecipeCreate", "RecipeRead", "RecipeUpdate",
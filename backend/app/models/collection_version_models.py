@@ -0,0 +1,7 @@
+from sqlmodel import Field, SQLModel
+
+class CollectionVersion(SQLModel, table=True):
+    # Scope of the counter, e.g. "recipes:42", "recipes:system" or "pantry:42"
+    scope: str = Field(primary_key=True, max_length=64)
+    # Incremented in the same transaction as every write to the scope
+    version: int = Field(default=0)
@@ -0,0 +1,10 @@
+from typing import Optional
+from sqlmodel import Field, SQLModel
+
+class Ingredient(SQLModel, table=True):
+    # Ingredient dictionary: one row per canonical name (normalize_ingredient_name).
+    # Pantry items and recipe ingredients point here through canonical_ingredient_id,
+    # resolved when they are written (see ingredient_dictionary_service). Rows are
+    # never deleted, so an id stays valid once assigned.
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str = Field(max_length=255, unique=True, index=True)
@@ -1,4 +1,5 @@
 from sqlmodel import Field, SQLModel
+from sqlalchemy import Index
 from typing import Optional
 from datetime import date, datetime
 
@@ -12,9 +13,43 @@ class PantryItemBase(SQLModel):
     image_url: Optional[str] = None
 
 class PantryItem(PantryItemBase, table=True):
+    # Pantry reads always filter on the user; expiry lookups and sorting use the date
+    # Delta sync (GET /pantry/items/changes) range-scans the user's rows by version
+    __table_args__ = (
+        Index("ix_pantryitem_user_expiration", "user_id", "expiration_date"),
+        Index("ix_pantryitem_user_version", "user_id", "version"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id")
     added_at: datetime = Field(default_factory=datetime.utcnow)
+    # Set on every write: updated_at to the write time and version to the
+    # user's pantry version after the write (see app.db.versioning)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    version: int = Field(default=0)
+    # Dictionary entry for item_name, kept in sync on write
+    canonical_ingredient_id: Optional[int] = Field(default=None, foreign_key="ingredient.id", index=True)
+
+class PantryItemTombstone(SQLModel, table=True):
+    # Left behind by a deleted pantry item so delta sync can report the deletion
+    __table_args__ = (
+        Index("ix_pantryitemtombstone_user_version", "user_id", "version"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    # No foreign key: the item row is gone
+    item_id: int
+    user_id: int = Field(foreign_key="user.id")
+    version: int
+    deleted_at: datetime = Field(default_factory=datetime.utcnow)
+
+class PantryExpiryAlert(SQLModel, table=True):
+    # Items inside the expiry window as of the last daily scan, with the day they
+    # entered it (see pantry_expiry_service)
+    item_id: int = Field(foreign_key="pantryitem.id", primary_key=True, ondelete="CASCADE")
+    user_id: int = Field(foreign_key="user.id", index=True)
+    expiration_date: date
+    entered_on: date = Field(index=True)
 
 class PantryItemCreate(PantryItemBase):
     pass
@@ -23,6 +58,9 @@ class PantryItemRead(PantryItemBase):
     id: int
     user_id: int
     added_at: datetime
+    updated_at: datetime
+    version: int
+    canonical_ingredient_id: Optional[int] = None
 
 class PantryItemUpdate(SQLModel):
     item_name: Optional[str] = None
@@ -1,7 +1,10 @@
 from sqlmodel import Field, SQLModel, Relationship, Column, JSON
+from sqlalchemy import Index, event, func, text
 from typing import Optional, List
 from datetime import datetime
 
+from app.core.text import normalize_ingredient_name
+
 # Forward declaration for relationship
 class User(SQLModel):
     pass
@@ -13,15 +16,27 @@ class RecipeIngredientBase(SQLModel):
 
 class RecipeIngredient(RecipeIngredientBase, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    recipe_id: int = Field(foreign_key="recipe.id")
+    recipe_id: int = Field(foreign_key="recipe.id", index=True)
+    # Accent-folded, lowercased ingredient_name used by the ingredient filter;
+    # maintained automatically on insert/update (see _set_normalized_name)
+    normalized_name: Optional[str] = Field(default=None, index=True)
+    # Dictionary entry for normalized_name, kept in sync on write
+    canonical_ingredient_id: Optional[int] = Field(default=None, foreign_key="ingredient.id", index=True)
     
     recipe: Optional["Recipe"] = Relationship(back_populates="ingredients")
 
+
+@event.listens_for(RecipeIngredient, "before_insert")
+@event.listens_for(RecipeIngredient, "before_update")
+def _set_normalized_name(mapper, connection, target: RecipeIngredient) -> None:
+    target.normalized_name = normalize_ingredient_name(target.ingredient_name)
+
 class RecipeIngredientCreate(RecipeIngredientBase):
     pass
 
 class RecipeIngredientRead(RecipeIngredientBase):
     id: int
+    canonical_ingredient_id: Optional[int] = None
 
 class RecipeBase(SQLModel):
     recipe_name: str
@@ -31,9 +46,30 @@ class RecipeBase(SQLModel):
     image_url: Optional[str] = None
 
 class Recipe(RecipeBase, table=True):
+    # Composite indexes backing keyset pagination: listings always filter on the
+    # owner and order by (sort key, id). The partial index serves the system
+    # recipe scan (created_by_user_id IS NULL, in id order) used by the shared
+    # recommendation index.
+    __table_args__ = (
+        Index("ix_recipe_owner_created_at_id", "created_by_user_id", "created_at", "id"),
+        Index("ix_recipe_owner_calories_id", "created_by_user_id", "estimated_calories", "id"),
+        Index("ix_recipe_owner_prep_time_id", "created_by_user_id", "preparation_time_minutes", "id"),
+        Index("ix_recipe_owner_name_id", "created_by_user_id", "recipe_name", "id"),
+        Index(
+            "ix_recipe_system_id", "id",
+            postgresql_where=text("created_by_user_id IS NULL"),
+            sqlite_where=text("created_by_user_id IS NULL"),
+        ),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     created_by_user_id: Optional[int] = Field(default=None, foreign_key="user.id") # Nullable for system recipes
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    # Duplicate detection (unique per owner, see the indexes below the class):
+    # recipe_content_hash of name + ingredients, and the id in an external
+    # catalog the recipe was imported from (e.g. "mealdb:52772")
+    content_hash: Optional[str] = Field(default=None, max_length=64)
+    source_id: Optional[str] = Field(default=None, max_length=64)
 
     # Relationship to User (creator) - Optional
     creator: Optional["User"] = Relationship() # Define back_populates in User model if needed
@@ -41,6 +77,21 @@ class Recipe(RecipeBase, table=True):
     # Relationship to RecipeIngredients
     ingredients: List["RecipeIngredient"] = Relationship(back_populates="recipe")
 
+# Keyed on coalesce(owner, 0) so system recipes (NULL owner) are deduplicated too;
+# duplicate lookups must use the same expression (see crud_recipe.find_duplicate)
+Index(
+    "uq_recipe_owner_content_hash",
+    func.coalesce(Recipe.created_by_user_id, 0), Recipe.content_hash,
+    unique=True,
+)
+Index(
+    "uq_recipe_owner_source_id",
+    func.coalesce(Recipe.created_by_user_id, 0), Recipe.source_id,
+    unique=True,
+)
+# Copies of the same external recipe across owners (see crud_recipe.get_source_recipe_id)
+Index("ix_recipe_source_id", Recipe.source_id)
+
 class RecipeCreate(RecipeBase):
     ingredients: List[RecipeIngredientCreate] = []
 
@@ -50,6 +101,17 @@ class RecipeRead(RecipeBase):
     created_at: datetime
     ingredients: List[RecipeIngredientRead] = []
 
+class RecipeSummary(SQLModel):
+    """Listing projection without instructions or ingredient rows"""
+    id: int
+    recipe_name: str
+    image_url: Optional[str] = None
+    estimated_calories: Optional[int] = None
+    preparation_time_minutes: Optional[int] = None
+    created_by_user_id: Optional[int]
+    created_at: datetime
+    ingredient_count: Optional[int] = None
+
 class RecipeUpdate(SQLModel):
     recipe_name: Optional[str] = None
     instructions: Optional[str] = None
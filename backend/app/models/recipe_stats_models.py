@@ -0,0 +1,13 @@
+from datetime import datetime
+from sqlmodel import Field, SQLModel
+
+class RecipeStats(SQLModel, table=True):
+    __tablename__ = "recipe_stats"
+
+    recipe_id: int = Field(foreign_key="recipe.id", primary_key=True)
+    # Popularity counters, aggregated in memory and flushed in batches
+    # (see recipe_stats_service); indexed for top-N listings
+    views: int = Field(default=0, index=True)
+    imports: int = Field(default=0, index=True)
+    cooked: int = Field(default=0, index=True)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,25 @@
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import BaseModel, Field
+
+# Upper bound on sub-requests per POST /batch request
+MAX_BATCH_REQUESTS = 20
+
+class BatchSubRequest(BaseModel):
+    id: Optional[str] = Field(None, max_length=64, description="Client reference echoed in the response")
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    path: str = Field(..., min_length=1, description="API path with optional query string, e.g. '/recipes/12' or '/api/v1/pantry/items?limit=5'")
+    body: Optional[Any] = Field(None, description="JSON body")
+    headers: Dict[str, str] = Field(default_factory=dict, description="Extra headers (Authorization is always the batch's)")
+
+class BatchRequest(BaseModel):
+    requests: List[BatchSubRequest] = Field(..., min_length=1, max_length=MAX_BATCH_REQUESTS)
+
+class BatchSubResponse(BaseModel):
+    id: Optional[str] = None
+    status: int
+    headers: Dict[str, str]
+    # Parsed JSON for JSON responses, text otherwise
+    body: Optional[Any] = None
+
+class BatchResponse(BaseModel):
+    responses: List[BatchSubResponse]
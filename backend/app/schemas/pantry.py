@@ -0,0 +1,47 @@
+from datetime import date
+from typing import List, Optional
+from pydantic import BaseModel
+from app.models.pantry_models import PantryItemRead
+
+# Upper bound on items per POST /pantry/items/bulk request (JSON or CSV)
+MAX_BULK_PANTRY_ITEMS = 1000
+
+class PantryBulkItemError(BaseModel):
+    # Array index for JSON uploads, line number for CSV uploads
+    row: int
+    error: str
+
+class PantryBulkDeleteResponse(BaseModel):
+    deleted: int
+
+class PantryChangesResponse(BaseModel):
+    # Items created or updated since the token, oldest change first
+    items: List[PantryItemRead]
+    # Ids of items deleted since the token
+    deleted: List[int]
+    # Pass as `since` on the next call
+    next_token: str
+
+class PantryExpiryAlertRead(BaseModel):
+    item_id: int
+    item_name: str
+    quantity: float
+    unit: str
+    expiration_date: date
+    # Negative once the item has expired
+    days_until_expiration: int
+    # Day the expiry scan first saw the item inside the window
+    entered_on: date
+
+class PantrySummaryEntry(BaseModel):
+    ingredient_id: Optional[int] = None
+    # Normalized ingredient name the items were grouped by
+    name: str
+    # One of the grouped items' names, for display
+    display_name: str
+    # Base unit of the family (g, ml, un) or the items' own unit if unknown
+    unit: str
+    total_quantity: float
+    item_count: int
+    earliest_expiration: Optional[date] = None
+    total_calories: Optional[float] = None
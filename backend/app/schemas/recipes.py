@@ -0,0 +1,80 @@
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+from app.models.recipe_models import RecipeSummary
+
+# Upper bound on recipes per POST /recipes/bulk request
+MAX_BULK_RECIPES = 1000
+
+class RecipeBulkCreate(BaseModel):
+    # Items are validated one by one so a bad item is reported instead of
+    # rejecting the whole request
+    recipes: List[Dict[str, Any]] = Field(..., max_length=MAX_BULK_RECIPES)
+
+class RecipeBulkItemResult(BaseModel):
+    index: int
+    success: bool
+    recipe_id: Optional[int] = None
+    error: Optional[str] = None
+
+class RecipeBulkCreateResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[RecipeBulkItemResult]
+
+class RecipeImportError(BaseModel):
+    line: int
+    error: str
+
+class RecipeImportResponse(BaseModel):
+    imported: int
+    failed: int
+    # Capped; `failed` has the full count
+    errors: List[RecipeImportError]
+
+class RecipeCacheMetrics(BaseModel):
+    hits: int = Field(..., description="Lookups served from the cache")
+    misses: int = Field(..., description="Lookups that went to the database")
+    hit_rate: float = Field(..., description="Fraction of lookups served from the cache")
+    evictions: int = Field(..., description="Entries evicted to stay within the memory budget")
+    entries: int = Field(..., description="Recipes currently cached")
+    bytes: int = Field(..., description="Serialized size of the cached recipes")
+    max_bytes: int = Field(..., description="Memory budget of the cache")
+
+class RecipeSemanticMatch(BaseModel):
+    recipe: RecipeSummary
+    score: float = Field(..., description="Cosine similarity to the query (0-1, higher is closer)")
+
+class RecipeSemanticSearchResponse(BaseModel):
+    query: str
+    results: List[RecipeSemanticMatch]
+
+class RecipeSimilarMatch(BaseModel):
+    recipe: RecipeSummary
+    similarity: float = Field(..., description="Jaccard similarity of the ingredient sets (0-1)")
+
+class RecipeSimilarResponse(BaseModel):
+    recipe_id: int
+    results: List[RecipeSimilarMatch]
+
+class RecipeRangeFacet(BaseModel):
+    max: int = Field(..., description="Upper bound of the bucket (inclusive)")
+    count: int
+
+class RecipeIngredientFacet(BaseModel):
+    name: str
+    count: int
+
+class RecipeFacets(BaseModel):
+    calories: List[RecipeRangeFacet] = Field(..., description="Recipes with at most `max` kcal")
+    prep_time: List[RecipeRangeFacet] = Field(..., description="Recipes ready in at most `max` minutes")
+    ingredients: List[RecipeIngredientFacet] = Field(..., description="Most common ingredients")
+
+class RecipeTopEntry(BaseModel):
+    recipe: RecipeSummary
+    views: int
+    imports: int
+    cooked: int
+
+class RecipeTopResponse(BaseModel):
+    metric: str
+    results: List[RecipeTopEntry]
@@ -65,3 +65,10 @@ class RecipeRecommendationsResponse(BaseModel):
 class RecommendationsRequest(BaseModel):
     filters: Optional[RecommendationFilters] = None
     sort: Optional[RecommendationSort] = None
+
+class RecommendationCoalescingMetrics(BaseModel):
+    total_calls: int = Field(..., description="Recommendation computations requested")
+    executions: int = Field(..., description="Computations actually executed")
+    coalesced: int = Field(..., description="Requests that joined an identical in-flight computation")
+    in_flight: int = Field(..., description="Computations currently running")
+    coalesce_rate: float = Field(..., description="Fraction of requests served by coalescing")
@@ -0,0 +1,139 @@
+import threading
+from typing import Dict, Iterable, List
+from sqlalchemy import event, inspect, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session as SASession, SessionTransaction
+from sqlmodel import Session, select
+from app.core.text import normalize_ingredient_name
+from app.models.ingredient_models import Ingredient
+from app.models.pantry_models import PantryItem
+from app.models.recipe_models import RecipeIngredient
+
+# Key used to stash ids created in a transaction until it commits, per
+# (nested) transaction that created them
+_PENDING_KEY = "ingredient_dictionary_pending"
+
+_DIALECT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+class IngredientDictionaryService:
+    """
+    Canonical ingredient ids for raw ingredient names.
+
+    A name's canonical form is normalize_ingredient_name; each form has one row in
+    the `ingredient` table. Missing entries are created in the caller's
+    transaction with one multi-row insert. Resolved ids are cached for the
+    process; ids created by a transaction are only cached once it commits, and
+    ids created inside a savepoint are dropped if the savepoint rolls back.
+
+    ORM writes of pantry items and recipe ingredients are resolved by the flush
+    listener below. Code that inserts or updates them through core statements
+    must call resolve and set canonical_ingredient_id itself.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+
+    def resolve(self, db: Session, names: Iterable[str]) -> Dict[str, int]:
+        """
+        Ids for the given raw names, keyed by normalized name (names that normalize
+        to an empty string are left out). Creates missing dictionary entries.
+        """
+        keys = {normalize_ingredient_name(name) for name in names} - {""}
+        with self._lock:
+            found = {key: self._ids[key] for key in keys if key in self._ids}
+        missing = sorted(keys - found.keys())
+        if not missing:
+            return found
+
+        # Statements go through the connection: this also runs during a flush
+        connection = db.connection()
+        table = Ingredient.__table__
+        dialect_insert = _DIALECT_INSERTS.get(connection.dialect.name)
+        if dialect_insert is not None:
+            connection.execute(
+                dialect_insert(table)
+                .values([{"name": key} for key in missing])
+                .on_conflict_do_nothing(index_elements=[table.c.name])
+            )
+        else:
+            existing = set(connection.execute(select(table.c.name).where(table.c.name.in_(missing))).scalars())
+            new_rows = [{"name": key} for key in missing if key not in existing]
+            if new_rows:
+                connection.execute(insert(table), new_rows)
+        resolved = dict(connection.execute(select(table.c.name, table.c.id).where(table.c.name.in_(missing))).all())
+        transaction = db.get_nested_transaction() or db.get_transaction()
+        db.info.setdefault(_PENDING_KEY, {}).setdefault(transaction, {}).update(resolved)
+        found.update(resolved)
+        return found
+
+    def publish(self, ids: Dict[str, int]) -> None:
+        with self._lock:
+            self._ids.update(ids)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ids = {}
+
+
+ingredient_dictionary_service = IngredientDictionaryService()
+
+# Name attribute of each model that carries a canonical_ingredient_id
+_NAME_ATTRIBUTES = {PantryItem: "item_name", RecipeIngredient: "ingredient_name"}
+
+
+@event.listens_for(SASession, "before_flush")
+def _resolve_canonical_ingredients(session, flush_context, instances):
+    """Set canonical_ingredient_id on new pantry items / recipe ingredients and on renamed ones"""
+    targets: List[object] = []
+    for obj in list(session.new) + list(session.dirty):
+        attribute = _NAME_ATTRIBUTES.get(type(obj))
+        if attribute is None:
+            continue
+        if obj.canonical_ingredient_id is None or inspect(obj).attrs[attribute].history.has_changes():
+            targets.append(obj)
+    if not targets:
+        return
+    ids = ingredient_dictionary_service.resolve(
+        session, [getattr(obj, _NAME_ATTRIBUTES[type(obj)]) for obj in targets]
+    )
+    for obj in targets:
+        obj.canonical_ingredient_id = ids.get(normalize_ingredient_name(getattr(obj, _NAME_ATTRIBUTES[type(obj)])))
+
+
+def _is_within(transaction: SessionTransaction, ancestor: SessionTransaction) -> bool:
+    while transaction is not None:
+        if transaction is ancestor:
+            return True
+        transaction = transaction.parent
+    return False
+
+
+@event.listens_for(SASession, "after_commit")
+def _publish_ingredient_ids(session):
+    # Also fired when a savepoint is released: wait for the outer commit
+    if session.in_nested_transaction():
+        return
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        ingredient_dictionary_service.publish({
+            name: ingredient_id for ids in pending.values() for name, ingredient_id in ids.items()
+        })
+
+
+@event.listens_for(SASession, "after_soft_rollback")
+def _discard_savepoint_ingredient_ids(session, previous_transaction):
+    """Ids created inside a rolled-back savepoint (or one nested in it) no longer exist"""
+    pending = session.info.get(_PENDING_KEY)
+    if pending and previous_transaction.nested:
+        for transaction in [t for t in pending if _is_within(t, previous_transaction)]:
+            del pending[transaction]
+
+
+@event.listens_for(SASession, "after_rollback")
+def _discard_ingredient_ids(session):
+    # Savepoint rollbacks are handled above
+    if session.in_nested_transaction():
+        return
+    session.info.pop(_PENDING_KEY, None)
@@ -5,7 +5,8 @@ import re # For parsing measure strings
 
 from app.services.mealdb_service import MealDBService, MealDBMeal
 from app.models.recipe_models import RecipeCreate, RecipeIngredientCreate
-from app.crud.crud_recipe import recipe as crud_recipe
+from app.crud.crud_recipe import recipe as crud_recipe, DuplicateRecipeError
+from app.services.recipe_stats_service import recipe_stats_service
 from app.models.user_models import User
 
 logger = logging.getLogger(__name__)
@@ -237,6 +238,16 @@ class MealDBImportService:
         Returns dict with import result or None if failed
         """
         try:
+            # Already imported: answer without calling MealDB
+            source_id = f"mealdb:{meal_id}"
+            existing_id = crud_recipe.find_duplicate(db, owner_id=user.id, source_id=source_id)
+            if existing_id is not None:
+                return {
+                    "success": False,
+                    "error": f"MealDB recipe {meal_id} already exists in your collection",
+                    "existing_recipe_id": existing_id
+                }
+            
             # Fetch meal from MealDB
             meal = await self.mealdb_service.get_meal_by_id(meal_id)
             
@@ -249,29 +260,24 @@ class MealDBImportService:
             # Convert to RecipeCreate format
             recipe_create = self._convert_mealdb_to_recipe_create(meal)
             
-            # Check if user already has this recipe (by name)
-            existing_recipes = crud_recipe.get_multi_with_filters(
-                db=db,
-                user_id=user.id,
-                skip=0,
-                limit=1,
-                user_created_only=True
-            )
-            
-            for existing_recipe in existing_recipes:
-                if existing_recipe.recipe_name.lower() == meal.name.lower():
-                    return {
-                        "success": False,
-                        "error": f"Recipe '{meal.name}' already exists in your collection"
-                    }
-            
-            # Create the recipe
-            created_recipe = crud_recipe.create_with_user(
-                db=db,
-                obj_in=recipe_create,
-                user_id=user.id
-            )
+            # Create the recipe unless an identical one exists (or the import raced with another)
+            try:
+                created_recipe = crud_recipe.create_with_user(
+                    db=db,
+                    obj_in=recipe_create,
+                    user_id=user.id,
+                    source_id=source_id
+                )
+            except DuplicateRecipeError as e:
+                return {
+                    "success": False,
+                    "error": f"Recipe '{meal.name}' already exists in your collection",
+                    "existing_recipe_id": e.recipe_id
+                }
             
+            # Count the import on the source's canonical recipe, not on this user's copy
+            canonical_id = crud_recipe.get_source_recipe_id(db, source_id=source_id)
+            recipe_stats_service.record(canonical_id or created_recipe.id, "imports")
             logger.info(f"Successfully imported MealDB recipe {meal_id} for user {user.id}")
             
             return {
@@ -0,0 +1,107 @@
+import logging
+import threading
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+from sqlalchemy import Date, Engine, delete, exists, func, insert, literal
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session, select
+from app.core.config import settings
+from app.db.versioning import pantry_pruned_scope, set_versions
+from app.models.pantry_models import PantryExpiryAlert, PantryItem, PantryItemTombstone
+
+logger = logging.getLogger(__name__)
+
+# Items expiring within this many days count as "expiring soon"
+EXPIRY_WINDOW_DAYS = 7
+
+
+class PantryExpiryService:
+    """
+    Daily scan of every pantry for items inside the expiry window.
+
+    One set-based transaction refreshes the `pantryexpiryalert` table for all
+    users: alerts whose item was deleted, lost its date or moved out of the
+    window are dropped, and items that entered the window are added with
+    today's date. Consumers read "what started expiring since day X" with an
+    index lookup instead of rescanning pantries. The same transaction prunes
+    delta-sync tombstones older than PANTRY_TOMBSTONE_RETENTION_DAYS. A
+    background thread runs the scan once per day (checked every
+    PANTRY_EXPIRY_CHECK_SECONDS).
+    """
+
+    def __init__(self, check_seconds: float = settings.PANTRY_EXPIRY_CHECK_SECONDS):
+        self.check_seconds = check_seconds
+        self.last_scan: Optional[date] = None
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def scan(self, bind: Engine, today: Optional[date] = None) -> int:
+        """Refresh the expiry alerts of all users. Returns the number of items that entered the window."""
+        today = today or date.today()
+        horizon = today + timedelta(days=EXPIRY_WINDOW_DAYS)
+        alerts = PantryExpiryAlert.__table__
+        items = PantryItem.__table__
+        with Session(bind) as db:
+            db.execute(delete(alerts).where(~exists().where(
+                items.c.id == alerts.c.item_id,
+                items.c.expiration_date == alerts.c.expiration_date,
+                items.c.expiration_date <= horizon
+            )))
+            entered = db.execute(insert(alerts).from_select(
+                ["item_id", "user_id", "expiration_date", "entered_on"],
+                select(items.c.id, items.c.user_id, items.c.expiration_date, literal(today, Date))
+                .where(
+                    items.c.expiration_date.is_not(None),
+                    items.c.expiration_date <= horizon,
+                    ~exists().where(alerts.c.item_id == items.c.id)
+                )
+            )).rowcount
+            self._prune_tombstones(db, today)
+            db.commit()
+        self.last_scan = today
+        logger.info(f"Pantry expiry scan for {today}: {entered} items entered the expiry window")
+        return entered
+
+    def _prune_tombstones(self, db: Session, today: date) -> None:
+        """
+        Delete tombstones past the retention period, recording per user the
+        highest pruned version: sync tokens below it could miss deletions.
+        """
+        cutoff = datetime.combine(today, time.min) - timedelta(days=settings.PANTRY_TOMBSTONE_RETENTION_DAYS)
+        tombstones = PantryItemTombstone.__table__
+        pruned = db.execute(
+            select(tombstones.c.user_id, func.max(tombstones.c.version))
+            .where(tombstones.c.deleted_at < cutoff)
+            .group_by(tombstones.c.user_id)
+        ).all()
+        if not pruned:
+            return
+        set_versions(db.connection(), {pantry_pruned_scope(user_id): version for user_id, version in pruned})
+        db.execute(delete(tombstones).where(tombstones.c.deleted_at < cutoff))
+
+    def start(self, bind: Engine) -> None:
+        """Start the background scanner (scans right away if today's scan has not run)"""
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, args=(bind,), name="pantry-expiry-scanner", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background scanner"""
+        if self._thread is not None:
+            self._stopping.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self, bind: Engine) -> None:
+        while not self._stopping.is_set():
+            if self.last_scan != date.today():
+                try:
+                    self.scan(bind)
+                except SQLAlchemyError as e:
+                    logger.error(f"Pantry expiry scan failed: {e}")
+            self._stopping.wait(self.check_seconds)
+
+
+pantry_expiry_service = PantryExpiryService()
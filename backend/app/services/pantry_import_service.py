@@ -0,0 +1,140 @@
+"""
+Parsing of bulk pantry uploads (JSON or CSV) into PantryItemCreate rows.
+
+CSV uploads are decoded and parsed as they stream in (quoted fields may span
+lines), with a header row naming the PantryItemBase fields (in any order,
+case-insensitive; unknown columns are ignored). An upload is applied all or nothing: the
+endpoint rejects it if any row is invalid, otherwise crud_pantry.upsert_many
+writes every row in a single transaction.
+"""
+import codecs
+import csv
+from collections import deque
+from typing import Any, AsyncIterable, Deque, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from app.models.pantry_models import PantryItemBase, PantryItemCreate
+from app.schemas.pantry import MAX_BULK_PANTRY_ITEMS
+from app.services.recipe_transfer_service import MAX_LINE_BYTES, MAX_REPORTED_ERRORS, describe_validation_error
+
+CSV_COLUMNS = frozenset(PantryItemBase.model_fields)
+
+ParsedItems = Tuple[List[PantryItemCreate], List[Tuple[int, str]], int]
+
+
+class _Collector:
+    """Accumulates valid items and (row, message) errors for one upload"""
+
+    def __init__(self) -> None:
+        self.items: List[PantryItemCreate] = []
+        self.errors: List[Tuple[int, str]] = []
+        self.failed = 0
+        self.rows = 0
+
+    def add(self, row: int, data: Any) -> None:
+        self.rows += 1
+        if self.rows > MAX_BULK_PANTRY_ITEMS:
+            raise ValueError(f"At most {MAX_BULK_PANTRY_ITEMS} items per upload")
+        try:
+            self.items.append(PantryItemCreate.model_validate(data))
+        except ValidationError as e:
+            self.fail(row, describe_validation_error(e))
+
+    def fail(self, row: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((row, message))
+
+    def result(self) -> ParsedItems:
+        return self.items, self.errors, self.failed
+
+
+def parse_json_items(payload: Any) -> ParsedItems:
+    """Validate a JSON array (or {"items": [...]}) of pantry items; errors are keyed by array index"""
+    if isinstance(payload, dict) and "items" in payload:
+        payload = payload["items"]
+    if not isinstance(payload, list):
+        raise ValueError("Expected a JSON array of pantry items")
+    collector = _Collector()
+    for index, data in enumerate(payload):
+        collector.add(index, data)
+    return collector.result()
+
+
+class _BufferedLines:
+    """Line source of a csv.reader, refilled as the upload streams in"""
+
+    def __init__(self) -> None:
+        self.lines: Deque[str] = deque()
+
+    def __iter__(self) -> "_BufferedLines":
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft()
+
+
+async def _iter_csv_records(chunks: AsyncIterable[bytes]) -> AsyncIterable[Tuple[int, List[str]]]:
+    """
+    Decode a UTF-8 upload (BOM tolerated) and parse it with one csv.reader, so
+    quoted fields may span lines. Yields (first line number, cells) per record;
+    lines are handed to the reader once they complete a record.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    source = _BufferedLines()
+    reader = csv.reader(source)
+    buffer = ""
+    in_quotes = False
+    record_size = 0
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            source.lines.append(line + "\n")
+            record_size += len(line) + 1
+            # An odd number of quotes opens or closes a quoted field ("" is an escaped quote)
+            in_quotes ^= line.count('"') % 2 == 1
+            if not in_quotes:
+                record_size = 0
+                while source.lines:
+                    first_line = reader.line_num + 1
+                    yield first_line, next(reader)
+        if record_size + len(buffer) > MAX_LINE_BYTES:
+            raise ValueError(f"Record at line {reader.line_num + 1} exceeds {MAX_LINE_BYTES} bytes")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        source.lines.append(buffer)
+    first_line = reader.line_num + 1
+    for cells in reader:
+        yield first_line, cells
+        first_line = reader.line_num + 1
+
+
+async def read_csv_items(chunks: AsyncIterable[bytes]) -> ParsedItems:
+    """Parse a streamed CSV upload; errors are keyed by line number"""
+    collector = _Collector()
+    header: Optional[List[str]] = None
+    async for line_number, cells in _iter_csv_records(chunks):
+        if not any(cell.strip() for cell in cells):
+            continue
+        if header is None:
+            header = [cell.strip().lower() for cell in cells]
+            missing = {"item_name", "quantity", "unit"} - set(header)
+            if missing:
+                raise ValueError(f"CSV header is missing column(s): {', '.join(sorted(missing))}")
+            continue
+        if len(cells) > len(header):
+            collector.fail(line_number, f"Expected {len(header)} columns, got {len(cells)}")
+            continue
+        # Empty cells are treated as absent so optional fields fall back to None
+        data = {
+            column: value.strip() for column, value in zip(header, cells)
+            if column in CSV_COLUMNS and value.strip()
+        }
+        collector.add(line_number, data)
+    if header is None:
+        raise ValueError("Empty CSV upload")
+    return collector.result()
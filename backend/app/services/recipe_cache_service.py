@@ -0,0 +1,106 @@
+import logging
+from typing import Any, Dict, Hashable, Iterable, NamedTuple, Optional, Tuple, Union
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, select
+from app.core.config import settings
+from app.core.lru_cache import ByteSizeLRUCache
+from app.db.recipe_changes import RecipeChanges, subscribe
+from app.db.versioning import get_version, recipe_item_scope
+from app.models.recipe_models import Recipe, RecipeRead
+
+logger = logging.getLogger(__name__)
+
+
+class CachedRecipe(NamedTuple):
+    recipe: RecipeRead
+    # Version of the recipe (recipe_item_scope) the snapshot was read at
+    version: int
+
+
+def _listing_key(etag: str) -> Hashable:
+    # Recipe entries are keyed by their integer id
+    return ("listing", etag)
+
+
+class RecipeCacheService:
+    """
+    Read-through cache of recipes with their ingredients, and of listing pages.
+
+    Recipe entries live under their owner's namespace: a cached recipe is only
+    served after checking that the requesting user may see that namespace (their
+    own recipes or the system recipes) and that the recipe's own version still
+    matches the one the entry was read at. The version check keeps the cache
+    correct when another process wrote the recipe; local writes also drop
+    entries eagerly (see app.db.recipe_changes).
+
+    Listing pages are cached as the JSON body sent for them, keyed by their
+    ETag, which already covers the user, the collection version and the query:
+    a write changes the key, and the pages cached under the old one age out of
+    the LRU.
+    """
+
+    def __init__(self, max_bytes: int):
+        self._cache: ByteSizeLRUCache[Union[CachedRecipe, bytes]] = ByteSizeLRUCache(max_bytes)
+
+    def get_with_ingredients(
+        self, db: Session, *, recipe_id: int, user_id: Optional[int] = None
+    ) -> Optional[Tuple[RecipeRead, Optional[int]]]:
+        """
+        Get a recipe with ingredients, from the cache when possible.
+
+        Returns (recipe, version) where version is the recipe's own version,
+        or None as version when the recipe is outside the user's namespaces (the
+        caller must reject it). Returns None if the recipe does not exist.
+        """
+        readable = {None, user_id}
+        scope = recipe_item_scope(recipe_id)
+        cached = self._cache.get(recipe_id)
+        if cached is not None:
+            if cached.recipe.created_by_user_id in readable and get_version(db, scope) == cached.version:
+                return cached.recipe, cached.version
+            self._cache.discard(recipe_id)
+
+        # Read the version first: a write committed after this point bumps it,
+        # so a snapshot cached now can never be mistaken for a newer one
+        version = get_version(db, scope)
+        db_recipe = db.exec(
+            select(Recipe).options(selectinload(Recipe.ingredients)).where(Recipe.id == recipe_id)
+        ).first()
+        if db_recipe is None:
+            return None
+
+        recipe = RecipeRead.model_validate(db_recipe)
+        if recipe.created_by_user_id not in readable:
+            return recipe, None
+        # Serialized size is the accounting unit of the cache budget
+        self._cache.put(recipe_id, CachedRecipe(recipe, version), len(recipe.model_dump_json()))
+        return recipe, version
+
+    def get_listing(self, etag: str) -> Optional[bytes]:
+        """Serialized listing page cached under its ETag, if any"""
+        return self._cache.get(_listing_key(etag))
+
+    def put_listing(self, etag: str, body: bytes) -> None:
+        """Cache a listing page as the JSON body sent for it"""
+        self._cache.put(_listing_key(etag), body, len(body))
+
+    def invalidate(self, recipe_ids: Iterable[int]) -> None:
+        for recipe_id in set(recipe_ids):
+            self._cache.discard(recipe_id)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+    def reset_stats(self) -> None:
+        self._cache.reset_stats()
+
+
+recipe_cache_service = RecipeCacheService(max_bytes=settings.RECIPE_CACHE_MAX_BYTES)
+
+
+@subscribe
+def _drop_changed_recipes(changes: RecipeChanges) -> None:
+    recipe_cache_service.invalidate(changes.recipe_ids)
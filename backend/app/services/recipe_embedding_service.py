@@ -0,0 +1,179 @@
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlmodel import Session, select
+from app.core.embedding import SparseVectorIndex, hashed_term_frequencies
+from app.db.recipe_changes import RecipeChanges, subscribe
+from app.db.versioning import get_recipe_versions
+from app.models.recipe_models import Recipe, RecipeIngredient
+
+logger = logging.getLogger(__name__)
+
+# Check this often for recipes written by other worker processes
+SYNC_INTERVAL_SECONDS = 300
+
+# Relative weight of each recipe field in its embedding
+NAME_WEIGHT = 3.0
+INGREDIENTS_WEIGHT = 2.0
+INSTRUCTIONS_WEIGHT = 1.0
+
+
+class RecipeEmbeddingService:
+    """
+    In-memory semantic index over recipe name, ingredients and instructions.
+
+    Built from the whole catalog once, by one request (the others wait for it).
+    After that it is never rebuilt: committed writes mark recipes as stale and
+    they are re-embedded from the database on the next search, and every
+    SYNC_INTERVAL_SECONDS one request compares per-recipe versions
+    (get_recipe_versions) to mark the recipes written by other processes as
+    stale too.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Held by the one request building or syncing the index
+        self._build_lock = threading.Lock()
+        self._index: Optional[SparseVectorIndex] = None
+        self._owners: Dict[int, Optional[int]] = {}
+        self._stale: Set[int] = set()
+        # Recipe versions as of the last build or sync
+        self._versions: Dict[int, int] = {}
+        self._synced_at = 0.0
+        # Recipes written while a build is loading the catalog (None: no build running)
+        self._building: Optional[Set[int]] = None
+
+    def search(
+        self, db: Session, query: str, user_id: Optional[int], limit: int = 10
+    ) -> List[Tuple[int, float]]:
+        """
+        Recipes visible to user_id (theirs and the system recipes) most similar to
+        the query, as (recipe_id, cosine similarity) best first.
+        """
+        term_frequencies = hashed_term_frequencies([(query, 1.0)])
+        if not term_frequencies:
+            return []
+        self._ensure_built(db)
+        self._refresh_stale(db)
+
+        with self._lock:
+            if self._index is None:
+                return []
+            owners = self._owners
+            return self._index.search(
+                term_frequencies, limit,
+                accept=lambda recipe_id: owners[recipe_id] is None or owners[recipe_id] == user_id
+            )
+
+    def invalidate(self, recipe_ids: Iterable[int]) -> None:
+        """Mark recipes as changed (or deleted); they are re-read on the next search"""
+        with self._lock:
+            if self._index is not None:
+                self._stale.update(recipe_ids)
+            if self._building is not None:
+                self._building.update(recipe_ids)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._index = None
+            self._owners = {}
+            self._stale = set()
+            self._versions = {}
+
+    def _ensure_built(self, db: Session) -> None:
+        if self._index is not None:
+            if time.monotonic() - self._synced_at < SYNC_INTERVAL_SECONDS:
+                return
+            # Due for a sync: one request does it, the others go on with the index
+            if not self._build_lock.acquire(blocking=False):
+                return
+            try:
+                self._sync(db)
+            finally:
+                self._build_lock.release()
+            return
+        # Nothing to serve yet: wait for a build in progress and reuse it
+        with self._build_lock:
+            if self._index is None:
+                self._build(db)
+
+    def _build(self, db: Session) -> None:
+        with self._lock:
+            self._building = set()
+        started = time.monotonic()
+        versions = get_recipe_versions(db)
+        documents = _load_documents(db)
+        index = SparseVectorIndex()
+        owners = {}
+        for recipe_id, owner_id, term_frequencies in documents:
+            owners[recipe_id] = owner_id
+            index.add(recipe_id, term_frequencies)
+        with self._lock:
+            # Writes committed while the catalog was loading may be missing from it
+            self._index, self._owners, self._stale = index, owners, self._building
+            self._versions, self._synced_at, self._building = versions, started, None
+        logger.info(f"Built recipe embedding index with {len(documents)} recipes")
+
+    def _sync(self, db: Session) -> None:
+        """Mark recipes created, changed or deleted since the last sync as stale"""
+        started = time.monotonic()
+        versions = get_recipe_versions(db)
+        with self._lock:
+            previous, self._versions, self._synced_at = self._versions, versions, started
+            self._stale.update(
+                recipe_id for recipe_id in previous.keys() | versions.keys()
+                if previous.get(recipe_id) != versions.get(recipe_id)
+            )
+
+    def _refresh_stale(self, db: Session) -> None:
+        with self._lock:
+            stale, self._stale = self._stale, set()
+        if not stale:
+            return
+        documents = _load_documents(db, recipe_ids=stale)
+        with self._lock:
+            if self._index is None:
+                return
+            for recipe_id in stale:
+                self._index.remove(recipe_id)
+                self._owners.pop(recipe_id, None)
+            for recipe_id, owner_id, term_frequencies in documents:
+                self._owners[recipe_id] = owner_id
+                self._index.add(recipe_id, term_frequencies)
+
+
+def _load_documents(
+    db: Session, recipe_ids: Optional[Set[int]] = None
+) -> List[Tuple[int, Optional[int], Dict[int, float]]]:
+    """(recipe id, owner, term frequencies) of every recipe, or only of recipe_ids"""
+    recipe_query = select(Recipe.id, Recipe.created_by_user_id, Recipe.recipe_name, Recipe.instructions)
+    ingredient_query = select(RecipeIngredient.recipe_id, RecipeIngredient.ingredient_name)
+    if recipe_ids is not None:
+        recipe_query = recipe_query.where(Recipe.id.in_(recipe_ids))
+        ingredient_query = ingredient_query.where(RecipeIngredient.recipe_id.in_(recipe_ids))
+
+    ingredient_names: Dict[int, List[str]] = {}
+    for recipe_id, name in db.exec(ingredient_query):
+        ingredient_names.setdefault(recipe_id, []).append(name)
+
+    return [
+        (
+            recipe_id,
+            owner_id,
+            hashed_term_frequencies([
+                (name, NAME_WEIGHT),
+                (" ".join(ingredient_names.get(recipe_id, ())), INGREDIENTS_WEIGHT),
+                (instructions or "", INSTRUCTIONS_WEIGHT),
+            ])
+        )
+        for recipe_id, owner_id, name, instructions in db.exec(recipe_query)
+    ]
+
+
+recipe_embedding_service = RecipeEmbeddingService()
+
+
+@subscribe
+def _refresh_changed_recipes(changes: RecipeChanges) -> None:
+    recipe_embedding_service.invalidate(changes.recipe_ids)
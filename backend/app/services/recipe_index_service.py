@@ -0,0 +1,181 @@
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, select
+from app.db.recipe_changes import RecipeChanges, subscribe
+from app.models.recipe_models import Recipe, RecipeIngredient
+
+logger = logging.getLogger(__name__)
+
+
+class RecipeIndexEntry:
+    """Detached snapshot of a recipe together with its ingredients"""
+
+    __slots__ = ("recipe", "ingredients")
+
+    def __init__(self, recipe: Recipe, ingredients: Tuple[RecipeIngredient, ...]):
+        self.recipe = recipe
+        self.ingredients = ingredients
+
+    @classmethod
+    def from_db(cls, db_recipe: Recipe) -> "RecipeIndexEntry":
+        """Copy a loaded recipe into plain (session-less) model instances"""
+        recipe = Recipe(
+            id=db_recipe.id,
+            recipe_name=db_recipe.recipe_name,
+            instructions=db_recipe.instructions,
+            estimated_calories=db_recipe.estimated_calories,
+            preparation_time_minutes=db_recipe.preparation_time_minutes,
+            image_url=db_recipe.image_url,
+            created_by_user_id=db_recipe.created_by_user_id,
+            created_at=db_recipe.created_at,
+        )
+        ingredients = tuple(
+            RecipeIngredient(
+                id=ingredient.id,
+                recipe_id=ingredient.recipe_id,
+                ingredient_name=ingredient.ingredient_name,
+                required_quantity=ingredient.required_quantity,
+                required_unit=ingredient.required_unit,
+                normalized_name=ingredient.normalized_name,
+                canonical_ingredient_id=ingredient.canonical_ingredient_id,
+            )
+            for ingredient in db_recipe.ingredients
+        )
+        return cls(recipe=recipe, ingredients=ingredients)
+
+
+class RecipeIndex:
+    """
+    Immutable collection of recipe snapshots.
+    Indexes are never modified in place - a change produces a new index.
+    """
+
+    def __init__(self, entries: Iterable[RecipeIndexEntry] = ()):
+        self._entries: Tuple[RecipeIndexEntry, ...] = tuple(entries)
+        self._recipe_ids = frozenset(entry.recipe.id for entry in self._entries)
+
+    @property
+    def entries(self) -> Tuple[RecipeIndexEntry, ...]:
+        return self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, recipe_id: int) -> bool:
+        return recipe_id in self._recipe_ids
+
+
+class RecipeIndexService:
+    """
+    Two-tier recipe index used by the recommendation engine.
+
+    - One shared index with every system recipe (created_by_user_id is None),
+      identical for all users and built once.
+    - One small overlay index per user with their personal/imported recipes.
+
+    A user's candidate set is the shared index merged with their overlay.
+    Writes to a personal recipe only drop that user's overlay.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._shared: Optional[RecipeIndex] = None
+        self._overlays: Dict[int, RecipeIndex] = {}
+        # Bumped on every invalidation so a build racing with a write is discarded
+        self._generation = 0
+
+    def get_shared_index(self, db: Session) -> RecipeIndex:
+        """Get the shared system recipe index, building it on first use"""
+        index = self._shared
+        if index is None:
+            generation = self._generation
+            index = self._load(db, Recipe.created_by_user_id.is_(None))
+            with self._lock:
+                if generation == self._generation:
+                    self._shared = index
+            logger.info(f"Built shared recipe index with {len(index)} system recipes")
+        return index
+
+    def get_user_overlay(self, db: Session, user_id: int) -> RecipeIndex:
+        """Get the overlay index with recipes owned by a user"""
+        index = self._overlays.get(user_id)
+        if index is None:
+            generation = self._generation
+            index = self._load(db, Recipe.created_by_user_id == user_id)
+            with self._lock:
+                if generation == self._generation:
+                    self._overlays[user_id] = index
+            logger.debug(f"Built recipe overlay for user {user_id} with {len(index)} recipes")
+        return index
+
+    def get_candidates(self, db: Session, user_id: int) -> List[RecipeIndexEntry]:
+        """Merge the shared index and the user's overlay into one candidate list"""
+        shared = self.get_shared_index(db)
+        overlay = self.get_user_overlay(db, user_id)
+        return list(shared.entries) + list(overlay.entries)
+
+    def invalidate_shared(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._shared = None
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            self._generation += 1
+            self._overlays.pop(user_id, None)
+
+    def invalidate(
+        self,
+        owner_ids: Iterable[Optional[int]] = (),
+        recipe_ids: Iterable[int] = ()
+    ) -> None:
+        """
+        Drop the indexes affected by a write.
+        owner_ids holds recipe owners (None for system recipes); recipe_ids is used
+        when only the recipe is known (e.g. an ingredient row changed).
+        """
+        owners: Set[Optional[int]] = set(owner_ids)
+        recipe_ids = set(recipe_ids)
+        if not owners and not recipe_ids:
+            return
+
+        with self._lock:
+            self._generation += 1
+            if recipe_ids:
+                if self._shared is not None and any(rid in self._shared for rid in recipe_ids):
+                    owners.add(None)
+                for user_id, overlay in self._overlays.items():
+                    if any(rid in overlay for rid in recipe_ids):
+                        owners.add(user_id)
+
+            if None in owners:
+                self._shared = None
+            for owner_id in owners:
+                if owner_id is not None:
+                    self._overlays.pop(owner_id, None)
+
+    def clear(self) -> None:
+        """Drop every index (e.g. after the schema is recreated)"""
+        with self._lock:
+            self._generation += 1
+            self._shared = None
+            self._overlays.clear()
+
+    def _load(self, db: Session, condition) -> RecipeIndex:
+        recipes = db.exec(
+            select(Recipe)
+            .options(selectinload(Recipe.ingredients))
+            .where(condition)
+            .order_by(Recipe.id)
+        ).all()
+        return RecipeIndex(RecipeIndexEntry.from_db(recipe) for recipe in recipes)
+
+
+recipe_index_service = RecipeIndexService()
+
+
+@subscribe
+def _drop_changed_indexes(changes: RecipeChanges) -> None:
+    recipe_index_service.invalidate(owner_ids=changes.owner_ids, recipe_ids=changes.recipe_ids)
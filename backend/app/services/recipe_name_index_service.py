@@ -0,0 +1,161 @@
+import logging
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+from sqlmodel import Session, select
+from app.core.symspell import SymSpellIndex
+from app.core.text import folded_words
+from app.db.recipe_changes import RecipeChanges, subscribe
+from app.models.recipe_models import Recipe
+
+logger = logging.getLogger(__name__)
+
+# Rebuild after this many seconds so writes made by other worker processes show up
+INDEX_MAX_AGE_SECONDS = 300
+# Upper bound on fuzzy matches handed to the listing query
+MAX_FUZZY_MATCHES = 1000
+
+
+def max_typos(word: str) -> int:
+    """Typos tolerated in a query word: none for short words, up to two for long ones"""
+    if len(word) <= 3:
+        return 0
+    return 1 if len(word) <= 5 else 2
+
+
+class RecipeNameIndexService:
+    """
+    Typo-tolerant in-memory index over recipe names (symmetric-delete dictionary).
+
+    Built from the whole catalog on first use and kept current by committed
+    recipe changes (app.db.recipe_changes); also rebuilt every INDEX_MAX_AGE_SECONDS to pick up writes from
+    other processes (by one request at a time, the others keep using the
+    previous index). Lookups are restricted to one owner (None: system recipes),
+    matching the visibility rules of recipe listings.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Held by the one request (re)building the index
+        self._build_lock = threading.Lock()
+        self._index: Optional[SymSpellIndex] = None
+        self._recipes: Dict[int, Tuple[Optional[int], Tuple[str, ...]]] = {}
+        self._built_at = 0.0
+        # Bumped on every applied change so a build racing with a write is discarded
+        self._generation = 0
+
+    def search(self, db: Session, query: str, owner_id: Optional[int]) -> Dict[int, int]:
+        """
+        Recipes of owner_id whose name fuzzily contains every word of the query.
+        Returns recipe id -> total edit distance (lower is better), best matches first,
+        at most MAX_FUZZY_MATCHES.
+        """
+        words = folded_words(query)
+        if not words:
+            return {}
+        self._ensure_built(db)
+
+        with self._lock:
+            if self._index is None:
+                return {}
+            scores: Optional[Dict[int, int]] = None
+            for word in set(words):
+                word_scores: Dict[int, int] = {}
+                for match, distance in self._index.lookup(word, max_typos(word)).items():
+                    for recipe_id in self._index.keys_for(match):
+                        if self._recipes[recipe_id][0] != owner_id:
+                            continue
+                        if distance < word_scores.get(recipe_id, distance + 1):
+                            word_scores[recipe_id] = distance
+                if scores is None:
+                    scores = word_scores
+                else:
+                    scores = {
+                        recipe_id: score + word_scores[recipe_id]
+                        for recipe_id, score in scores.items() if recipe_id in word_scores
+                    }
+                if not scores:
+                    return {}
+
+        best = sorted(scores.items(), key=lambda item: (item[1], item[0]))[:MAX_FUZZY_MATCHES]
+        return dict(best)
+
+    def apply_changes(
+        self, upserts: Iterable[Tuple[int, Optional[int], str]] = (), deletes: Iterable[int] = ()
+    ) -> None:
+        """Apply committed writes: (id, owner, name) for new/changed recipes, ids for deleted ones"""
+        with self._lock:
+            self._generation += 1
+            if self._index is None:
+                return
+            for recipe_id in deletes:
+                self._remove(recipe_id)
+            for recipe_id, owner_id, name in upserts:
+                self._remove(recipe_id)
+                self._add(recipe_id, owner_id, name)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._index = None
+            self._recipes = {}
+
+    def _ensure_built(self, db: Session) -> None:
+        if self._index is not None:
+            if time.monotonic() - self._built_at < INDEX_MAX_AGE_SECONDS:
+                return
+            # Expired: rebuild unless another request already is
+            if not self._build_lock.acquire(blocking=False):
+                return
+        else:
+            # Nothing to serve yet: wait for a build in progress and reuse it
+            self._build_lock.acquire()
+            if self._index is not None:
+                self._build_lock.release()
+                return
+        try:
+            self._build(db)
+        finally:
+            self._build_lock.release()
+
+    def _build(self, db: Session) -> None:
+        generation = self._generation
+        started = time.monotonic()
+        rows = db.exec(select(Recipe.id, Recipe.created_by_user_id, Recipe.recipe_name)).all()
+        index = SymSpellIndex()
+        recipes = {}
+        for recipe_id, owner_id, name in rows:
+            words = tuple(folded_words(name))
+            recipes[recipe_id] = (owner_id, words)
+            for word in words:
+                index.add(word, recipe_id)
+        with self._lock:
+            if generation == self._generation or self._index is None:
+                # A write committed during the build may be missing from it: serve
+                # it for this lookup only and rebuild on the next one
+                self._index, self._recipes = index, recipes
+                self._built_at = started if generation == self._generation else 0.0
+        logger.info(f"Built recipe name index with {len(rows)} recipes and {len(index)} words")
+
+    def _add(self, recipe_id: int, owner_id: Optional[int], name: str) -> None:
+        words = tuple(folded_words(name))
+        self._recipes[recipe_id] = (owner_id, words)
+        for word in words:
+            self._index.add(word, recipe_id)
+
+    def _remove(self, recipe_id: int) -> None:
+        entry = self._recipes.pop(recipe_id, None)
+        if entry is not None:
+            for word in entry[1]:
+                self._index.remove(word, recipe_id)
+
+
+recipe_name_index_service = RecipeNameIndexService()
+
+
+@subscribe
+def _apply_name_changes(changes: RecipeChanges) -> None:
+    recipe_name_index_service.apply_changes(
+        [(recipe_id, owner_id, name) for recipe_id, (owner_id, name) in changes.names.items()],
+        changes.deleted_ids,
+    )
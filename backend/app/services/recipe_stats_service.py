@@ -0,0 +1,145 @@
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+from sqlalchemy import Engine
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session, select
+from app.core.config import settings
+from app.models.recipe_models import Recipe
+from app.models.recipe_stats_models import RecipeStats
+
+logger = logging.getLogger(__name__)
+
+# Counters kept per recipe, in RecipeStats column order
+RECIPE_STAT_EVENTS = ("views", "imports", "cooked")
+
+# Flush early once this many recipes have pending counts
+MAX_PENDING_RECIPES = 5000
+
+_DIALECT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+class RecipeStatsService:
+    """
+    Write-behind popularity counters.
+
+    Events only increment in-memory counters on the request path. A background
+    thread adds them to the `recipe_stats` table every RECIPE_STATS_FLUSH_SECONDS
+    in one multi-row upsert (and on shutdown), so a crash loses at most one
+    flush interval of counts. Counts from a failed flush are kept for the next one.
+    """
+
+    def __init__(self, flush_seconds: float = settings.RECIPE_STATS_FLUSH_SECONDS):
+        self.flush_seconds = flush_seconds
+        self._lock = threading.Lock()
+        self._pending: Dict[int, List[int]] = {}
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def record(self, recipe_id: int, event: str, count: int = 1) -> None:
+        """Count an event ("views", "imports" or "cooked") for a recipe"""
+        index = RECIPE_STAT_EVENTS.index(event)
+        with self._lock:
+            counters = self._pending.get(recipe_id)
+            if counters is None:
+                counters = self._pending[recipe_id] = [0] * len(RECIPE_STAT_EVENTS)
+            counters[index] += count
+            if len(self._pending) >= MAX_PENDING_RECIPES:
+                self._wake.set()
+
+    def pending(self) -> Dict[int, Dict[str, int]]:
+        """Counts not flushed yet, per recipe"""
+        with self._lock:
+            return {
+                recipe_id: dict(zip(RECIPE_STAT_EVENTS, counters))
+                for recipe_id, counters in self._pending.items()
+            }
+
+    def flush(self, bind: Engine) -> int:
+        """Add the pending counts to recipe_stats in one transaction. Returns the number of recipes written."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        try:
+            with Session(bind) as db:
+                # Recipes deleted since the event was recorded are dropped
+                existing = db.exec(select(Recipe.id).where(Recipe.id.in_(pending))).all()
+                now = datetime.utcnow()
+                rows = [
+                    {"recipe_id": recipe_id, **dict(zip(RECIPE_STAT_EVENTS, pending[recipe_id])), "updated_at": now}
+                    for recipe_id in sorted(existing)
+                ]
+                if rows:
+                    self._upsert(db, rows)
+                db.commit()
+            return len(rows)
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to flush recipe stats for {len(pending)} recipes: {e}")
+            self._restore(pending)
+            return 0
+
+    def start(self, bind: Engine) -> None:
+        """Start the background flusher"""
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, args=(bind,), name="recipe-stats-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self, bind: Engine) -> None:
+        """Stop the background flusher and flush what is left"""
+        if self._thread is not None:
+            self._stopping.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        self.flush(bind)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending = {}
+
+    def _run(self, bind: Engine) -> None:
+        while not self._stopping.is_set():
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            self.flush(bind)
+
+    def _upsert(self, db: Session, rows: List[dict]) -> None:
+        table = RecipeStats.__table__
+        dialect_insert = _DIALECT_INSERTS.get(db.get_bind().dialect.name)
+        if dialect_insert is not None:
+            statement = dialect_insert(table).values(rows)
+            db.execute(statement.on_conflict_do_update(
+                index_elements=[table.c.recipe_id],
+                set_={
+                    **{event: table.c[event] + statement.excluded[event] for event in RECIPE_STAT_EVENTS},
+                    "updated_at": statement.excluded.updated_at,
+                }
+            ))
+            return
+        for row in rows:
+            result = db.execute(
+                table.update()
+                .where(table.c.recipe_id == row["recipe_id"])
+                .values(
+                    **{event: table.c[event] + row[event] for event in RECIPE_STAT_EVENTS},
+                    updated_at=row["updated_at"]
+                )
+            )
+            if result.rowcount == 0:
+                db.execute(table.insert().values(**row))
+
+    def _restore(self, pending: Dict[int, List[int]]) -> None:
+        with self._lock:
+            for recipe_id, counts in pending.items():
+                counters = self._pending.setdefault(recipe_id, [0] * len(RECIPE_STAT_EVENTS))
+                for index, count in enumerate(counts):
+                    counters[index] += count
+
+
+recipe_stats_service = RecipeStatsService()
@@ -0,0 +1,174 @@
+"""
+Streaming export / import of recipe collections as (gzipped) NDJSON.
+
+Export walks the user's recipes through a server-side cursor in fixed-size
+batches, compressing as it goes, so memory use does not grow with the size of
+the collection. Import decompresses and parses the upload chunk by chunk and
+inserts valid recipes in batches through crud_recipe.create_many_with_user.
+"""
+import json
+import logging
+import zlib
+from typing import AsyncIterable, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.orm import selectinload
+from starlette.concurrency import run_in_threadpool
+from sqlmodel import Session, select
+
+from app.crud.crud_recipe import recipe as crud_recipe
+from app.models.recipe_models import Recipe, RecipeCreate, RecipeRead
+
+logger = logging.getLogger(__name__)
+
+EXPORT_BATCH_SIZE = 500
+IMPORT_BATCH_SIZE = 500
+# Compressed bytes buffered before a chunk is sent to the client
+EXPORT_CHUNK_SIZE = 64 * 1024
+# Import errors reported back in the response (the rest are only counted)
+MAX_REPORTED_ERRORS = 100
+MAX_LINE_BYTES = 1024 * 1024
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def iter_export_gzip(bind, user_id: int, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+    """
+    Yield the user's recipes (with ingredients) as gzipped NDJSON, one RecipeRead per line.
+
+    Uses its own session on `bind`: the response is streamed after the request's
+    session has been closed.
+    """
+    compressor = zlib.compressobj(wbits=31)  # gzip container
+    pending: List[bytes] = []
+    pending_size = 0
+    with Session(bind) as db:
+        result = db.exec(
+            select(Recipe)
+            .options(selectinload(Recipe.ingredients))
+            .where(Recipe.created_by_user_id == user_id)
+            .order_by(Recipe.id)
+            .execution_options(yield_per=batch_size)
+        )
+        for batch in result.partitions():
+            lines = b"".join(
+                RecipeRead.model_validate(recipe).model_dump_json().encode() + b"\n" for recipe in batch
+            )
+            # Drop the batch from the identity map so memory stays flat
+            for recipe in batch:
+                for ingredient in recipe.ingredients:
+                    db.expunge(ingredient)
+                db.expunge(recipe)
+            chunk = compressor.compress(lines)
+            if chunk:
+                pending.append(chunk)
+                pending_size += len(chunk)
+            if pending_size >= EXPORT_CHUNK_SIZE:
+                yield b"".join(pending)
+                pending, pending_size = [], 0
+    pending.append(compressor.flush())
+    yield b"".join(pending)
+
+
+def describe_validation_error(error: ValidationError) -> str:
+    """One-line summary of a validation error ("field: message; ...")"""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in error.errors()
+    )
+
+
+async def _iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterable[Tuple[int, bytes]]:
+    """
+    Decompress (if gzipped) and split an upload into numbered lines.
+
+    Gzipped input is inflated at most MAX_LINE_BYTES at a time, so a small but
+    highly compressed upload is rejected once a line grows past the limit
+    instead of being inflated into memory first.
+    """
+    decompressor: Optional["zlib._Decompress"] = None
+    first = True
+    buffer = b""
+    line_number = 0
+
+    def split(data: bytes) -> List[bytes]:
+        nonlocal buffer
+        *lines, buffer = (buffer + data).split(b"\n")
+        if len(buffer) > MAX_LINE_BYTES:
+            raise ValueError(f"Line {line_number + len(lines) + 1} exceeds {MAX_LINE_BYTES} bytes")
+        return lines
+
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        if first:
+            first = False
+            if chunk[:2] == _GZIP_MAGIC:
+                decompressor = zlib.decompressobj(wbits=31)
+        while chunk:
+            if decompressor:
+                data = decompressor.decompress(chunk, MAX_LINE_BYTES)
+                chunk = decompressor.unconsumed_tail
+            else:
+                data, chunk = chunk, b""
+            for line in split(data):
+                line_number += 1
+                yield line_number, line
+    if decompressor:
+        for line in split(decompressor.flush()):
+            line_number += 1
+            yield line_number, line
+    for line in buffer.split(b"\n"):
+        line_number += 1
+        yield line_number, line
+
+
+async def import_ndjson(
+    db: Session, chunks: AsyncIterable[bytes], user_id: int, batch_size: int = IMPORT_BATCH_SIZE
+) -> Tuple[int, int, List[Tuple[int, str]]]:
+    """
+    Import recipes from an NDJSON (optionally gzipped) upload for a user.
+
+    Every line is validated as a RecipeCreate (ids and timestamps from an export
+    are ignored) and inserted in batches. Returns (imported, failed, errors) where
+    errors holds (line number, message) for up to MAX_REPORTED_ERRORS failures.
+    """
+    imported = failed = 0
+    errors: List[Tuple[int, str]] = []
+    batch: List[Tuple[int, RecipeCreate]] = []
+
+    def record_error(line_number: int, message: str) -> None:
+        nonlocal failed
+        failed += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append((line_number, message))
+
+    async def flush() -> None:
+        nonlocal imported
+        results = await run_in_threadpool(
+            crud_recipe.create_many_with_user, db, objs_in=[recipe for _, recipe in batch], user_id=user_id
+        )
+        for (line_number, _), (recipe_id, error) in zip(batch, results):
+            if recipe_id is None:
+                record_error(line_number, error or "Insert failed")
+            else:
+                imported += 1
+        batch.clear()
+
+    async for line_number, line in _iter_lines(chunks):
+        if not line.strip():
+            continue
+        try:
+            batch.append((line_number, RecipeCreate.model_validate(json.loads(line))))
+        except ValidationError as e:
+            record_error(line_number, describe_validation_error(e))
+            continue
+        except ValueError as e:
+            record_error(line_number, f"Invalid JSON: {e}")
+            continue
+        if len(batch) >= batch_size:
+            await flush()
+    if batch:
+        await flush()
+
+    logger.info(f"Imported {imported} recipes for user {user_id} ({failed} failed)")
+    return imported, failed, errors
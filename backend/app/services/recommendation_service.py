@@ -6,6 +6,9 @@ from app.models.pantry_models import PantryItem
 from app.models.recipe_models import Recipe, RecipeIngredient
 from app.models.user_preference_models import UserPreference
 from app.crud.crud_user_preferences import user_preference as user_preference_crud
+from app.services.pantry_expiry_service import EXPIRY_WINDOW_DAYS
+from app.services.recipe_index_service import recipe_index_service
+from app.core.singleflight import SingleFlight
 from app.schemas.recommendations import (
     RecommendedRecipe, 
     MatchingIngredient, 
@@ -79,13 +82,11 @@ class RecommendationService:
                 message="Sua despensa está vazia. Adicione alguns itens para receber recomendações de receitas!"
             )
         
-        # Get all available recipes with ingredients
-        recipes = db.exec(
-            select(Recipe).where(
-                (Recipe.created_by_user_id == user_id) | 
-                (Recipe.created_by_user_id.is_(None))  # System recipes
-            )
-        ).all()
+        # Get all available recipes with ingredients: the shared system recipe
+        # index merged with the user's own overlay
+        candidates = recipe_index_service.get_candidates(db, user_id)
+        recipes = [entry.recipe for entry in candidates]
+        ingredients_by_recipe = {entry.recipe.id: entry.ingredients for entry in candidates}
         
         if not recipes:
             logger.info("No recipes found in the system")
@@ -114,9 +115,7 @@ class RecommendationService:
         
         for recipe in recipes:
             # Get recipe ingredients
-            recipe_ingredients = db.exec(
-                select(RecipeIngredient).where(RecipeIngredient.recipe_id == recipe.id)
-            ).all()
+            recipe_ingredients = ingredients_by_recipe.get(recipe.id, ())
             
             if not recipe_ingredients:
                 continue  # Skip recipes without ingredients
@@ -315,7 +314,13 @@ class RecommendationService:
         missing_ingredients = []
         expiring_ingredients_used = []
         
-        # Create a lookup for pantry items by name (case-insensitive)
+        # Pantry items by canonical ingredient id (exact matches), and by name
+        # (case-insensitive) for the fuzzy fallback
+        pantry_by_ingredient = {
+            item.canonical_ingredient_id: item
+            for item in pantry_items
+            if item.canonical_ingredient_id is not None
+        }
         pantry_lookup = {
             item.item_name.lower().strip(): item 
             for item in pantry_items
@@ -328,7 +333,9 @@ class RecommendationService:
             ingredient_name_lower = recipe_ingredient.ingredient_name.lower().strip()
             
             # Try to find matching pantry item
-            pantry_item = self._find_matching_pantry_item(ingredient_name_lower, pantry_lookup)
+            pantry_item = pantry_by_ingredient.get(recipe_ingredient.canonical_ingredient_id)
+            if pantry_item is None:
+                pantry_item = self._find_matching_pantry_item(ingredient_name_lower, pantry_lookup)
             
             if pantry_item:
                 matched_ingredients_count += 1
@@ -337,7 +344,7 @@ class RecommendationService:
                 expiring_ingredient = None
                 if pantry_item.expiration_date:
                     days_until_expiration = (pantry_item.expiration_date - date.today()).days
-                    if days_until_expiration <= 7:  # Expiring within a week
+                    if days_until_expiration <= EXPIRY_WINDOW_DAYS:  # Expiring within a week
                         expiring_ingredient = ExpiringIngredient(
                             pantry_item_id=pantry_item.id,
                             pantry_item_name=pantry_item.item_name,
@@ -475,6 +482,31 @@ class RecommendationService:
 # Create service instance
 recommendation_service = RecommendationService()
 
+# Concurrent identical requests (same user + same parameters) share one computation
+recommendation_flights = SingleFlight()
+
+def _recommendation_key(
+    user_id: int,
+    filters: Optional[RecommendationFilters],
+    sort: Optional[RecommendationSort],
+    use_preferences: bool,
+    min_matching_ingredients: Optional[int],
+    limit: Optional[int],
+    prioritize_expiring: bool
+) -> tuple:
+    """Normalize request parameters into a hashable coalescing key"""
+    filters = filters or RecommendationFilters()
+    sort = sort or RecommendationSort()
+    return (
+        user_id,
+        tuple(sorted(filters.model_dump().items())),
+        (sort.sort_by, sort.sort_order),
+        use_preferences,
+        min_matching_ingredients,
+        limit,
+        prioritize_expiring,
+    )
+
 def get_recipe_recommendations(
     db: Session, 
     user_id: int,
@@ -486,13 +518,23 @@ def get_recipe_recommendations(
     prioritize_expiring: bool = False
 ) -> RecipeRecommendationsResponse:
     """Service function for the API endpoint"""
-    return recommendation_service.get_recommendations(
-        db=db, 
-        user_id=user_id, 
-        filters=filters, 
-        sort=sort,
-        use_preferences=use_preferences,
-        min_matching_ingredients=min_matching_ingredients,
-        limit=limit,
-        prioritize_expiring=prioritize_expiring
+    key = _recommendation_key(
+        user_id, filters, sort, use_preferences, min_matching_ingredients, limit, prioritize_expiring
     )
+    return recommendation_flights.do(
+        key,
+        lambda: recommendation_service.get_recommendations(
+            db=db, 
+            user_id=user_id, 
+            filters=filters, 
+            sort=sort,
+            use_preferences=use_preferences,
+            min_matching_ingredients=min_matching_ingredients,
+            limit=limit,
+            prioritize_expiring=prioritize_expiring
+        )
+    )
+
+def get_recommendation_coalescing_stats() -> Dict[str, Any]:
+    """Metrics on how often concurrent recommendation requests were coalesced"""
+    return recommendation_flights.stats()
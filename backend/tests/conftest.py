@@ -11,6 +11,13 @@ from app.db.session import engine as app_engine, get_db_session as original_get_
 from app.crud.crud_user import user as crud_user
 from app.schemas.user import UserCreate
 from app.models.user_models import User
+from app.services.ingredient_dictionary_service import ingredient_dictionary_service
+from app.services.recipe_index_service import recipe_index_service
+from app.services.recipe_cache_service import recipe_cache_service
+from app.services.recipe_embedding_service import recipe_embedding_service
+from app.services.recipe_similarity_service import recipe_similarity_service
+from app.services.recipe_stats_service import recipe_stats_service
+from app.services.recipe_name_index_service import recipe_name_index_service
 
 
 @pytest.fixture(scope="function")
@@ -20,6 +27,13 @@ def session_fixture():
     and dropped after. Ensures each test runs with a clean database.
     """
     SQLModel.metadata.create_all(app_engine)
+    recipe_index_service.clear()
+    recipe_cache_service.clear()
+    recipe_name_index_service.clear()
+    recipe_embedding_service.clear()
+    recipe_similarity_service.clear()
+    recipe_stats_service.clear()
+    ingredient_dictionary_service.clear()
     with Session(app_engine) as session:
         yield session
     SQLModel.metadata.drop_all(app_engine)
@@ -0,0 +1,120 @@
+"""
+Unit tests for POST /batch (several API requests in one round trip).
+"""
+
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.models.user_models import User
+from app.models.recipe_models import RecipeCreate
+from app.crud.crud_recipe import recipe as crud_recipe
+from app.crud.crud_user import user as crud_user
+from app.schemas.batch import MAX_BATCH_REQUESTS
+
+
+def _recipe(session: Session, name: str, user_id=None):
+    return crud_recipe.create_with_user(
+        session, obj_in=RecipeCreate(recipe_name=name, instructions="Misturar"), user_id=user_id
+    )
+
+
+class TestBatchEndpoint:
+    """Test batching of API sub-requests"""
+
+    def test_responses_come_back_in_order(self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User):
+        mine = _recipe(session_fixture, "Minha", user_id=test_user.id)
+        system = _recipe(session_fixture, "Do Sistema")
+
+        response = client.post(
+            "/api/v1/batch",
+            json={"requests": [
+                {"id": "me", "path": "/auth/me"},
+                {"id": "pantry", "path": "/pantry/items"},
+                {"id": "mine", "path": f"/recipes/{mine.id}"},
+                {"id": "system", "path": f"/api/v1/recipes/{system.id}"},
+                {"id": "list", "path": "/recipes?view=summary&limit=5"},
+            ]},
+            headers={"Authorization": f"Bearer {test_user_token}"}
+        )
+
+        assert response.status_code == 200
+        items = response.json()["responses"]
+        assert [item["id"] for item in items] == ["me", "pantry", "mine", "system", "list"]
+        assert all(item["status"] == 200 for item in items)
+        assert items[0]["body"]["email"] == test_user.email
+        assert items[2]["body"]["recipe_name"] == "Minha"
+        assert items[3]["body"]["recipe_name"] == "Do Sistema"
+        assert items[2]["headers"]["etag"]
+        assert [r["recipe_name"] for r in items[4]["body"]["recipes"]] == ["Minha"]
+
+    def test_user_is_looked_up_once(self, client: TestClient, test_user_token: str, test_user: User):
+        with patch.object(crud_user, "get_by_email", wraps=crud_user.get_by_email) as lookup:
+            response = client.post(
+                "/api/v1/batch",
+                json={"requests": [{"path": "/auth/me"}, {"path": "/pantry/items"}, {"path": "/recipes"}]},
+                headers={"Authorization": f"Bearer {test_user_token}"}
+            )
+
+        assert [item["status"] for item in response.json()["responses"]] == [200, 200, 200]
+        assert lookup.call_count == 1
+
+    def test_writes_run_in_order(self, client: TestClient, test_user_token: str):
+        response = client.post(
+            "/api/v1/batch",
+            json={"requests": [
+                {"path": "/recipes?limit=5"},
+                {"method": "POST", "path": "/recipes/", "body": {"recipe_name": "Nova", "instructions": "Cozer"}},
+                {"path": "/recipes?limit=5"},
+            ]},
+            headers={"Authorization": f"Bearer {test_user_token}"}
+        )
+
+        before, created, after = response.json()["responses"]
+        assert before["body"]["total"] == 0
+        assert created["status"] == 200
+        assert [r["id"] for r in after["body"]["recipes"]] == [created["body"]["id"]]
+
+    def test_errors_are_reported_per_item(self, client: TestClient, test_user_token: str):
+        response = client.post(
+            "/api/v1/batch",
+            json={"requests": [
+                {"path": "/recipes/999999"},
+                {"path": "/no-such-endpoint"},
+                {"method": "POST", "path": "/batch", "body": {"requests": []}},
+                {"method": "POST", "path": "/recipes/", "body": {"instructions": "sem nome"}},
+            ]},
+            headers={"Authorization": f"Bearer {test_user_token}"}
+        )
+
+        assert [item["status"] for item in response.json()["responses"]] == [404, 404, 400, 422]
+
+    def test_anonymous_batch(self, client: TestClient, session_fixture: Session):
+        system = _recipe(session_fixture, "Do Sistema")
+
+        response = client.post(
+            "/api/v1/batch",
+            json={"requests": [{"path": f"/recipes/{system.id}"}, {"path": "/auth/me"}]}
+        )
+
+        public, private = response.json()["responses"]
+        assert public["status"] == 200
+        assert private["status"] in (401, 403)
+
+    def test_invalid_token_is_not_trusted(self, client: TestClient):
+        response = client.post(
+            "/api/v1/batch",
+            json={"requests": [{"path": "/auth/me"}]},
+            headers={"Authorization": "Bearer not-a-token"}
+        )
+
+        assert response.json()["responses"][0]["status"] == 401
+
+    def test_too_many_requests_is_rejected(self, client: TestClient):
+        response = client.post(
+            "/api/v1/batch",
+            json={"requests": [{"path": "/recipes"}] * (MAX_BATCH_REQUESTS + 1)}
+        )
+
+        assert response.status_code == 422
@@ -0,0 +1,138 @@
+"""
+Unit tests for ETag / If-None-Match handling on recipe and pantry reads.
+"""
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.models.user_models import User
+from app.models.recipe_models import Recipe, RecipeCreate, RecipeIngredientCreate, RecipeUpdate
+from app.crud.crud_recipe import recipe as crud_recipe
+from app.db.versioning import get_version, pantry_scope, recipe_scope
+from app.core.etag import etag_matches
+
+
+def _auth(token: str, etag: str = None):
+    headers = {"Authorization": f"Bearer {token}"}
+    if etag:
+        headers["If-None-Match"] = etag
+    return headers
+
+
+def _create(session: Session, user_id=None, name="Bolo"):
+    return crud_recipe.create_with_user(
+        session,
+        obj_in=RecipeCreate(
+            recipe_name=name,
+            instructions="Assar",
+            ingredients=[RecipeIngredientCreate(ingredient_name="Farinha", required_quantity=1.0, required_unit="g")]
+        ),
+        user_id=user_id
+    )
+
+
+class TestRecipeConditionalGet:
+    """Test conditional GET for /recipes and /recipes/{id}"""
+
+    def test_recipe_list_revalidation(self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User):
+        _create(session_fixture, user_id=test_user.id)
+        first = client.get("/api/v1/recipes", headers=_auth(test_user_token))
+        etag = first.headers["ETag"]
+
+        cached = client.get("/api/v1/recipes", headers=_auth(test_user_token, etag))
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["ETag"] == etag
+
+        _create(session_fixture, user_id=test_user.id, name="Pudim")
+        changed = client.get("/api/v1/recipes", headers=_auth(test_user_token, etag))
+        assert changed.status_code == 200
+        assert changed.json()["total"] == 2
+        assert changed.headers["ETag"] != etag
+
+    def test_different_queries_have_different_etags(self, client: TestClient, test_user_token: str):
+        first = client.get("/api/v1/recipes?limit=5", headers=_auth(test_user_token)).headers["ETag"]
+        second = client.get("/api/v1/recipes?limit=6", headers=_auth(test_user_token)).headers["ETag"]
+        assert first != second
+
+    def test_escaped_query_values_do_not_collide(self, client: TestClient, test_user_token: str):
+        escaped = client.get("/api/v1/recipes?ingredients=alho%26limit%3D1", headers=_auth(test_user_token))
+        split = client.get("/api/v1/recipes?ingredients=alho&limit=1", headers=_auth(test_user_token))
+        assert escaped.headers["ETag"] != split.headers["ETag"]
+
+    def test_other_users_writes_do_not_change_etag(self, client: TestClient, test_user_token: str, session_fixture: Session):
+        etag = client.get("/api/v1/recipes", headers=_auth(test_user_token)).headers["ETag"]
+
+        _create(session_fixture, user_id=None)
+
+        assert client.get("/api/v1/recipes", headers=_auth(test_user_token, etag)).status_code == 304
+
+    def test_recipe_detail_revalidation(self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User):
+        created = _create(session_fixture, user_id=test_user.id)
+        first = client.get(f"/api/v1/recipes/{created.id}", headers=_auth(test_user_token))
+        assert first.status_code == 200
+        etag = first.headers["ETag"]
+
+        assert client.get(f"/api/v1/recipes/{created.id}", headers=_auth(test_user_token, etag)).status_code == 304
+
+        crud_recipe.update_with_ingredients(
+            session_fixture,
+            db_obj=created,
+            obj_in=RecipeUpdate(ingredients=[RecipeIngredientCreate(ingredient_name="Farinha", required_quantity=2.0, required_unit="g")])
+        )
+        changed = client.get(f"/api/v1/recipes/{created.id}", headers=_auth(test_user_token, etag))
+        assert changed.status_code == 200
+        assert changed.json()["ingredients"][0]["required_quantity"] == 2.0
+
+    def test_revalidation_still_checks_access(self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User):
+        other = Recipe(recipe_name="Secreta", instructions="x", created_by_user_id=test_user.id + 1)
+        session_fixture.add(other)
+        session_fixture.commit()
+
+        response = client.get(f"/api/v1/recipes/{other.id}", headers=_auth(test_user_token, "*"))
+        assert response.status_code == 403
+        assert client.get("/api/v1/recipes/9999", headers=_auth(test_user_token, "*")).status_code == 404
+
+    def test_bulk_create_bumps_version(self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User):
+        before = get_version(session_fixture, recipe_scope(test_user.id))
+
+        client.post(
+            "/api/v1/recipes/bulk",
+            json={"recipes": [{"recipe_name": "A", "instructions": "x", "ingredients": []}]},
+            headers=_auth(test_user_token)
+        )
+
+        assert get_version(session_fixture, recipe_scope(test_user.id)) > before
+
+
+class TestPantryConditionalGet:
+    """Test conditional GET for /pantry/items"""
+
+    def test_pantry_list_revalidation(self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User):
+        created = client.post(
+            "/api/v1/pantry/items",
+            json={"item_name": "Leite", "quantity": 1, "unit": "l"},
+            headers=_auth(test_user_token)
+        ).json()
+        etag = client.get("/api/v1/pantry/items", headers=_auth(test_user_token)).headers["ETag"]
+
+        assert client.get("/api/v1/pantry/items", headers=_auth(test_user_token, etag)).status_code == 304
+
+        client.put(f"/api/v1/pantry/items/{created['id']}", json={"quantity": 2}, headers=_auth(test_user_token))
+        changed = client.get("/api/v1/pantry/items", headers=_auth(test_user_token, etag))
+        assert changed.status_code == 200
+        assert changed.json()[0]["quantity"] == 2
+
+        client.delete(f"/api/v1/pantry/items/{created['id']}", headers=_auth(test_user_token))
+        assert get_version(session_fixture, pantry_scope(test_user.id)) == 3
+
+
+class TestEtagMatching:
+    """Test If-None-Match parsing"""
+
+    def test_etag_matches(self):
+        assert etag_matches('"a", "b"', '"b"')
+        assert etag_matches('W/"b"', '"b"')
+        assert etag_matches("*", '"b"')
+        assert not etag_matches('"a"', '"b"')
+        assert not etag_matches(None, '"b"')
@@ -0,0 +1,150 @@
+"""
+Unit tests for the ingredient dictionary and canonical_ingredient_id resolution.
+"""
+
+from sqlmodel import Session, select
+
+from app.models.user_models import User
+from app.models.ingredient_models import Ingredient
+from app.models.pantry_models import PantryItem, PantryItemCreate, PantryItemUpdate
+from app.models.recipe_models import RecipeCreate, RecipeIngredient, RecipeIngredientCreate, RecipeUpdate
+from app.crud.crud_pantry import pantry as crud_pantry
+from app.crud.crud_recipe import recipe as crud_recipe
+from app.services.ingredient_dictionary_service import ingredient_dictionary_service
+from app.services.recommendation_service import recommendation_service
+
+
+def _recipe(session: Session, name: str, ingredients, user_id=None):
+    return crud_recipe.create_with_user(
+        session,
+        obj_in=RecipeCreate(
+            recipe_name=name,
+            instructions="Misturar",
+            ingredients=[
+                RecipeIngredientCreate(ingredient_name=ingredient, required_quantity=1.0, required_unit="un")
+                for ingredient in ingredients
+            ]
+        ),
+        user_id=user_id
+    )
+
+
+def _dictionary(session: Session):
+    return {row.name: row.id for row in session.exec(select(Ingredient)).all()}
+
+
+def _canonical_ids(session: Session, recipe_id: int):
+    session.expire_all()
+    return {
+        row.ingredient_name: row.canonical_ingredient_id
+        for row in session.exec(select(RecipeIngredient).where(RecipeIngredient.recipe_id == recipe_id)).all()
+    }
+
+
+class TestCanonicalIngredientResolution:
+    """Test that writes resolve names to dictionary ids"""
+
+    def test_orm_writes_share_one_entry_per_normalized_name(self, session_fixture: Session, test_user: User):
+        created = _recipe(session_fixture, "Limonada", ["Limão", "Açúcar"])
+        item = crud_pantry.create_with_user(
+            session_fixture, obj_in=PantryItemCreate(item_name=" LIMAO ", quantity=2, unit="un"), user_id=test_user.id
+        )
+
+        dictionary = _dictionary(session_fixture)
+        assert set(dictionary) == {"limao", "acucar"}
+        assert _canonical_ids(session_fixture, created.id) == {"Limão": dictionary["limao"], "Açúcar": dictionary["acucar"]}
+        assert item.canonical_ingredient_id == dictionary["limao"]
+
+    def test_rename_resolves_again(self, session_fixture: Session, test_user: User):
+        item = crud_pantry.create_with_user(
+            session_fixture, obj_in=PantryItemCreate(item_name="Leite", quantity=1, unit="l"), user_id=test_user.id
+        )
+
+        crud_pantry.update_by_user(
+            session_fixture, db_obj=item, obj_in=PantryItemUpdate(item_name="Natas"), user_id=test_user.id
+        )
+
+        assert item.canonical_ingredient_id == _dictionary(session_fixture)["natas"]
+
+    def test_core_write_paths_resolve(self, session_fixture: Session, test_user: User):
+        results = crud_recipe.create_many_with_user(
+            session_fixture,
+            objs_in=[RecipeCreate(
+                recipe_name="Arroz Doce",
+                instructions="Cozer",
+                ingredients=[RecipeIngredientCreate(ingredient_name="Arroz", required_quantity=1.0, required_unit="kg")]
+            )],
+            user_id=test_user.id
+        )
+        recipe_id = results[0][0]
+        recipe = crud_recipe.get(session_fixture, id=recipe_id)
+        crud_recipe.update_with_ingredients(
+            session_fixture, db_obj=recipe,
+            obj_in=RecipeUpdate(ingredients=[
+                RecipeIngredientCreate(ingredient_name="Arroz", required_quantity=2.0, required_unit="kg"),
+                RecipeIngredientCreate(ingredient_name="Canela", required_quantity=1.0, required_unit="g"),
+            ])
+        )
+        items, _, _ = crud_pantry.upsert_many(
+            session_fixture, objs_in=[PantryItemCreate(item_name="Canela", quantity=1, unit="g")], user_id=test_user.id
+        )
+
+        dictionary = _dictionary(session_fixture)
+        assert _canonical_ids(session_fixture, recipe_id) == {"Arroz": dictionary["arroz"], "Canela": dictionary["canela"]}
+        assert items[0].canonical_ingredient_id == dictionary["canela"]
+
+    def test_ids_from_rolled_back_savepoints_are_not_cached(self, session_fixture: Session):
+        with session_fixture.begin_nested():
+            ingredient_dictionary_service.resolve(session_fixture, ["Ghee"])
+        try:
+            with session_fixture.begin_nested():
+                with session_fixture.begin_nested():
+                    ingredient_dictionary_service.resolve(session_fixture, ["Tahini"])
+                raise ValueError("item rejected")
+        except ValueError:
+            pass
+        session_fixture.commit()
+
+        dictionary = _dictionary(session_fixture)
+        assert set(dictionary) == {"ghee"}
+        assert ingredient_dictionary_service._ids == dictionary
+
+    def test_ids_from_rolled_back_transactions_are_not_cached(self, session_fixture: Session, test_user: User):
+        session_fixture.add(PantryItem(item_name="Ghee", quantity=1, unit="g", user_id=test_user.id))
+        session_fixture.flush()
+        session_fixture.rollback()
+
+        assert _dictionary(session_fixture) == {}
+        item = crud_pantry.create_with_user(
+            session_fixture, obj_in=PantryItemCreate(item_name="Ghee", quantity=1, unit="g"), user_id=test_user.id
+        )
+        assert item.canonical_ingredient_id == _dictionary(session_fixture)["ghee"]
+
+
+class TestCanonicalIngredientMatching:
+    """Test reads that match on canonical ids"""
+
+    def test_ingredient_filter_matches_normalized_names(self, session_fixture: Session):
+        _recipe(session_fixture, "Limonada", ["Limão Siciliano", "Água"])
+        _recipe(session_fixture, "Chá", ["Água"])
+
+        results = crud_recipe.get_multi_with_filters(session_fixture, ingredients=["limao", "agua"])
+
+        assert [recipe.recipe_name for recipe in results] == ["Limonada"]
+
+    def test_recommendations_match_by_canonical_id(self, session_fixture: Session, test_user: User):
+        _recipe(session_fixture, "Limonada", ["limao"])
+        crud_pantry.create_with_user(
+            session_fixture, obj_in=PantryItemCreate(item_name="Limão", quantity=3, unit="un"), user_id=test_user.id
+        )
+
+        response = recommendation_service.get_recommendations(session_fixture, test_user.id, use_preferences=False)
+
+        assert [r.recipe_name for r in response.recommendations] == ["Limonada"]
+        assert response.recommendations[0].missing_ingredients == []
+
+    def test_cache_is_used_after_commit(self, session_fixture: Session, test_user: User):
+        _recipe(session_fixture, "Limonada", ["Limão"])
+
+        assert ingredient_dictionary_service.resolve(session_fixture, ["LIMÃO"]) == {"limao": _dictionary(session_fixture)["limao"]}
+        assert "ingredient_dictionary_pending" not in session_fixture.info
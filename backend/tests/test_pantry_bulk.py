@@ -0,0 +1,202 @@
+"""
+Unit tests for POST /pantry/items/bulk and DELETE /pantry/items?expired_before=.
+"""
+
+from datetime import date
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session, select
+
+from app.models.user_models import User
+from app.models.pantry_models import PantryItem, PantryItemCreate
+from app.crud.crud_pantry import pantry as crud_pantry
+from app.db.versioning import get_version, pantry_scope
+
+
+def _item(name: str, quantity: float = 1.0, unit: str = "kg", **extra):
+    return {"item_name": name, "quantity": quantity, "unit": unit, **extra}
+
+
+class TestPantryBulkUpsert:
+    """Test bulk pantry upserts from JSON and CSV"""
+
+    def test_json_upload_creates_items(self, client: TestClient, test_user_token: str):
+        response = client.post(
+            "/api/v1/pantry/items/bulk",
+            json=[_item("Arroz"), _item("Leite", 2, "L"), _item("Ovos", 12, "un")],
+            headers={"Authorization": f"Bearer {test_user_token}"}
+        )
+
+        assert response.status_code == 200
+        assert [item["item_name"] for item in response.json()] == ["Arroz", "Leite", "Ovos"]
+
+    def test_merges_with_existing_items_by_name_and_unit(
+        self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User
+    ):
+        existing = crud_pantry.create_with_user(
+            session_fixture,
+            obj_in=PantryItemCreate(item_name="Limão", quantity=2, unit="un", expiration_date=date(2026, 11, 10)),
+            user_id=test_user.id
+        )
+
+        response = client.post(
+            "/api/v1/pantry/items/bulk",
+            json=[
+                _item("limao", 3, "UN", expiration_date="2026-11-05"),
+                _item("Limão", 1, "kg"),
+            ],
+            headers={"Authorization": f"Bearer {test_user_token}"}
+        )
+
+        data = response.json()
+        assert len(data) == 2
+        merged = data[0]
+        assert merged["id"] == existing.id
+        assert merged["quantity"] == 5
+        # The earliest expiration wins
+        assert merged["expiration_date"] == "2026-11-05"
+        assert len(session_fixture.exec(select(PantryItem).where(PantryItem.user_id == test_user.id)).all()) == 2
+
+    def test_duplicates_within_upload_are_merged(self, client: TestClient, test_user_token: str):
+        response = client.post(
+            "/api/v1/pantry/items/bulk",
+            json={"items": [_item("Farinha", 1), _item("farinha ", 0.5)]},
+            headers={"Authorization": f"Bearer {test_user_token}"}
+        )
+
+        assert [item["quantity"] for item in response.json()] == [1.5]
+
+    def test_invalid_items_reject_the_upload(
+        self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User
+    ):
+        response = client.post(
+            "/api/v1/pantry/items/bulk",
+            json=[_item("Sal"), {"item_name": "Açúcar"}, _item("Azeite", "muito")],
+            headers={"Authorization": f"Bearer {test_user_token}"}
+        )
+
+        assert response.status_code == 422
+        assert [error["row"] for error in response.json()["detail"]] == [1, 2]
+        assert session_fixture.exec(select(PantryItem).where(PantryItem.user_id == test_user.id)).all() == []
+
+    def test_pantry_version_is_locked_before_reading_stored_items(
+        self, session_fixture: Session, test_user: User
+    ):
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement.split()[0] + (" pantryitem" if "FROM pantryitem" in statement else ""))
+
+        engine = session_fixture.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            crud_pantry.upsert_many(session_fixture, objs_in=[PantryItemCreate(**_item("Arroz"))], user_id=test_user.id)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert statements.index("INSERT") < statements.index("SELECT pantryitem")
+
+    def test_csv_upload(self, client: TestClient, test_user_token: str):
+        csv_body = (
+            "﻿Item_Name,quantity,unit,expiration_date\r\n"
+            "Tomate,4,un,2026-11-01\r\n"
+            "\"Queijo, fatiado\",200,g,\r\n"
+            "tomate,2,un,\r\n"
+        ).encode()
+
+        response = client.post(
+            "/api/v1/pantry/items/bulk",
+            content=iter([csv_body[:17], csv_body[17:40], csv_body[40:]]),
+            headers={"Authorization": f"Bearer {test_user_token}", "Content-Type": "text/csv"}
+        )
+
+        assert response.status_code == 200
+        by_name = {item["item_name"]: item for item in response.json()}
+        assert len(by_name) == 2
+        assert by_name["Tomate"]["quantity"] == 6
+        assert by_name["Queijo, fatiado"]["expiration_date"] is None
+
+    def test_csv_quoted_field_may_span_lines(self, client: TestClient, test_user_token: str):
+        csv_body = (
+            "item_name,quantity,unit\n"
+            "\"Queijo\nfatiado\",200,g\n"
+            "Pimento,lots,un\n"
+        ).encode()
+
+        response = client.post(
+            "/api/v1/pantry/items/bulk",
+            content=iter([csv_body[:30], csv_body[30:]]),
+            headers={"Authorization": f"Bearer {test_user_token}", "Content-Type": "text/csv"}
+        )
+
+        assert response.status_code == 422
+        assert [error["row"] for error in response.json()["detail"]] == [4]
+
+    def test_invalid_csv_row_is_reported_by_line(self, client: TestClient, test_user_token: str):
+        response = client.post(
+            "/api/v1/pantry/items/bulk",
+            content=b"item_name,quantity,unit\nArroz,1,kg\n\nPimento,lots,un\n",
+            headers={"Authorization": f"Bearer {test_user_token}", "Content-Type": "text/csv"}
+        )
+
+        assert response.status_code == 422
+        assert [error["row"] for error in response.json()["detail"]] == [4]
+
+    def test_csv_without_required_columns_is_rejected(self, client: TestClient, test_user_token: str):
+        response = client.post(
+            "/api/v1/pantry/items/bulk",
+            content=b"name,qty\nArroz,1\n",
+            headers={"Authorization": f"Bearer {test_user_token}", "Content-Type": "text/csv"}
+        )
+
+        assert response.status_code == 400
+
+    def test_non_array_json_is_rejected(self, client: TestClient, test_user_token: str):
+        response = client.post(
+            "/api/v1/pantry/items/bulk",
+            json={"recipes": []},
+            headers={"Authorization": f"Bearer {test_user_token}"}
+        )
+
+        assert response.status_code == 400
+
+    def test_bulk_upsert_bumps_pantry_version(self, session_fixture: Session, test_user: User):
+        before = get_version(session_fixture, pantry_scope(test_user.id))
+
+        items, created, updated = crud_pantry.upsert_many(
+            session_fixture, objs_in=[PantryItemCreate(**_item("Massa"))], user_id=test_user.id
+        )
+
+        assert (len(items), created, updated) == (1, 1, 0)
+        assert get_version(session_fixture, pantry_scope(test_user.id)) != before
+
+
+class TestPantryDeleteExpired:
+    """Test DELETE /pantry/items?expired_before="""
+
+    def test_deletes_only_expired_items_of_user(
+        self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User
+    ):
+        for name, expiration in [("Iogurte", date(2026, 10, 1)), ("Natas", date(2026, 10, 18)),
+                                 ("Manteiga", date(2026, 12, 1)), ("Sal", None)]:
+            crud_pantry.create_with_user(
+                session_fixture,
+                obj_in=PantryItemCreate(**_item(name), expiration_date=expiration),
+                user_id=test_user.id
+            )
+
+        response = client.delete(
+            "/api/v1/pantry/items?expired_before=2026-10-19",
+            headers={"Authorization": f"Bearer {test_user_token}"}
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"deleted": 2}
+        remaining = client.get("/api/v1/pantry/items", headers={"Authorization": f"Bearer {test_user_token}"}).json()
+        assert sorted(item["item_name"] for item in remaining) == ["Manteiga", "Sal"]
+
+    def test_date_is_required(self, client: TestClient, test_user_token: str):
+        response = client.delete("/api/v1/pantry/items", headers={"Authorization": f"Bearer {test_user_token}"})
+
+        assert response.status_code == 422
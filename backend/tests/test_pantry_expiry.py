@@ -0,0 +1,98 @@
+"""
+Unit tests for the daily pantry expiry scan and GET /pantry/expiry-alerts.
+"""
+
+from datetime import date, timedelta
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.models.user_models import User
+from app.models.pantry_models import PantryExpiryAlert, PantryItemCreate
+from app.crud.crud_pantry import pantry as crud_pantry
+from app.crud.crud_user import user as crud_user
+from app.schemas.user import UserCreate
+from app.services.pantry_expiry_service import PantryExpiryService
+
+TODAY = date(2026, 10, 19)
+
+
+def _item(session: Session, user_id: int, name: str, expires_in=None):
+    expiration = TODAY + timedelta(days=expires_in) if expires_in is not None else None
+    return crud_pantry.create_with_user(
+        session,
+        obj_in=PantryItemCreate(item_name=name, quantity=1, unit="un", expiration_date=expiration),
+        user_id=user_id
+    )
+
+
+def _alerts(session: Session):
+    session.expire_all()
+    return {
+        alert.item_id: alert.entered_on
+        for alert in session.exec(select(PantryExpiryAlert)).all()
+    }
+
+
+class TestPantryExpiryScan:
+    """Test the set-based expiry scan"""
+
+    def test_scan_covers_all_users(self, session_fixture: Session, test_user: User):
+        other = crud_user.create(
+            session_fixture, obj_in=UserCreate(email="other@example.com", username="other", password="otherpassword123")
+        )
+        milk = _item(session_fixture, test_user.id, "Leite", 2)
+        expired = _item(session_fixture, test_user.id, "Iogurte", -1)
+        _item(session_fixture, test_user.id, "Arroz", 60)
+        _item(session_fixture, test_user.id, "Sal")
+        cheese = _item(session_fixture, other.id, "Queijo", 7)
+
+        assert PantryExpiryService().scan(session_fixture.get_bind(), today=TODAY) == 3
+        assert _alerts(session_fixture) == {milk.id: TODAY, expired.id: TODAY, cheese.id: TODAY}
+
+    def test_rescan_only_adds_new_entrants(self, session_fixture: Session, test_user: User):
+        service = PantryExpiryService()
+        milk = _item(session_fixture, test_user.id, "Leite", 2)
+        butter = _item(session_fixture, test_user.id, "Manteiga", 8)
+        service.scan(session_fixture.get_bind(), today=TODAY)
+
+        tomorrow = TODAY + timedelta(days=1)
+        assert service.scan(session_fixture.get_bind(), today=tomorrow) == 1
+        assert _alerts(session_fixture) == {milk.id: TODAY, butter.id: tomorrow}
+        assert service.last_scan == tomorrow
+
+    def test_stale_alerts_are_dropped(self, session_fixture: Session, test_user: User):
+        service = PantryExpiryService()
+        milk = _item(session_fixture, test_user.id, "Leite", 2)
+        eggs = _item(session_fixture, test_user.id, "Ovos", 3)
+        service.scan(session_fixture.get_bind(), today=TODAY)
+
+        eggs.expiration_date = TODAY + timedelta(days=30)
+        session_fixture.add(eggs)
+        session_fixture.commit()
+        session_fixture.delete(milk)
+        session_fixture.commit()
+        service.scan(session_fixture.get_bind(), today=TODAY)
+
+        assert _alerts(session_fixture) == {}
+
+
+class TestPantryExpiryAlertsEndpoint:
+    """Test GET /pantry/expiry-alerts"""
+
+    def test_lists_alerts_of_current_user(
+        self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User
+    ):
+        today = date.today()
+        service = PantryExpiryService()
+        _item(session_fixture, test_user.id, "Leite", (today - TODAY).days + 3)
+        service.scan(session_fixture.get_bind(), today=today - timedelta(days=1))
+        _item(session_fixture, test_user.id, "Natas", (today - TODAY).days + 1)
+        service.scan(session_fixture.get_bind(), today=today)
+
+        headers = {"Authorization": f"Bearer {test_user_token}"}
+        data = client.get("/api/v1/pantry/expiry-alerts", headers=headers).json()
+        assert [(a["item_name"], a["days_until_expiration"]) for a in data] == [("Natas", 1), ("Leite", 3)]
+
+        recent = client.get(f"/api/v1/pantry/expiry-alerts?since={today.isoformat()}", headers=headers).json()
+        assert [a["item_name"] for a in recent] == ["Natas"]
@@ -0,0 +1,109 @@
+"""
+Unit tests for GET /pantry/summary.
+"""
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, insert
+from sqlmodel import Session
+
+from app.models.user_models import User
+from app.models.pantry_models import PantryItem, PantryItemCreate
+from app.crud.crud_pantry import pantry as crud_pantry
+
+
+def _auth(token: str, etag: str = None):
+    headers = {"Authorization": f"Bearer {token}"}
+    if etag:
+        headers["If-None-Match"] = etag
+    return headers
+
+
+def _add(session: Session, user_id: int, name: str, quantity: float, unit: str, **extra):
+    crud_pantry.create_with_user(
+        session, obj_in=PantryItemCreate(item_name=name, quantity=quantity, unit=unit, **extra), user_id=user_id
+    )
+
+
+class TestPantrySummary:
+    """Test pantry aggregation by ingredient and unit family"""
+
+    def test_groups_by_name_and_unit_family(
+        self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User
+    ):
+        _add(session_fixture, test_user.id, "Leite", 1, "L", expiration_date="2026-11-03", calories_per_unit=640)
+        _add(session_fixture, test_user.id, "leite ", 500, "ml", expiration_date="2026-10-30")
+        _add(session_fixture, test_user.id, "Leite", 2, "pacotes")
+        _add(session_fixture, test_user.id, "Ovos", 1, "dúzia", calories_per_unit=900)
+        _add(session_fixture, test_user.id, "ovos", 3, "un", calories_per_unit=75)
+
+        response = client.get("/api/v1/pantry/summary", headers=_auth(test_user_token))
+
+        assert response.status_code == 200
+        summary = [
+            (e["name"], e["unit"], e["total_quantity"], e["item_count"], e["earliest_expiration"], e["total_calories"])
+            for e in response.json()
+        ]
+        assert summary == [
+            ("leite", "ml", 1500, 2, "2026-10-30", 640),
+            ("leite", "pacotes", 2, 1, None, None),
+            ("ovos", "un", 15, 2, None, 1125),
+        ]
+
+    def test_summary_is_one_query(self, session_fixture: Session, test_user: User):
+        user_id = test_user.id
+        for i in range(5):
+            _add(session_fixture, user_id, f"Item {i % 2}", 1, "kg")
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = session_fixture.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            rows = crud_pantry.summarize_by_user(session_fixture, user_id=user_id)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert len(statements) == 1 and "GROUP BY" in statements[0]
+        assert [(row["name"], row["total_quantity"]) for row in rows] == [("item 0", 3000), ("item 1", 2000)]
+
+    def test_summary_revalidates_with_etag(
+        self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User
+    ):
+        _add(session_fixture, test_user.id, "Arroz", 1, "kg")
+        etag = client.get("/api/v1/pantry/summary", headers=_auth(test_user_token)).headers["ETag"]
+
+        assert client.get("/api/v1/pantry/summary", headers=_auth(test_user_token, etag)).status_code == 304
+
+        _add(session_fixture, test_user.id, "Arroz", 500, "g")
+        changed = client.get("/api/v1/pantry/summary", headers=_auth(test_user_token, etag))
+        assert changed.status_code == 200
+        assert changed.json()[0]["total_quantity"] == 1500
+
+    def test_units_are_matched_case_and_space_insensitively(self, session_fixture: Session, test_user: User):
+        _add(session_fixture, test_user.id, "Arroz", 1, " KG ")
+        _add(session_fixture, test_user.id, "Arroz", 500, "g")
+        _add(session_fixture, test_user.id, "Arroz", 2, "Pacotes")
+        _add(session_fixture, test_user.id, "Arroz", 1, "pacotes")
+
+        rows = crud_pantry.summarize_by_user(session_fixture, user_id=test_user.id)
+
+        assert [(row["unit"], row["total_quantity"]) for row in rows] == [("g", 1500), ("pacotes", 3)]
+
+    def test_items_without_dictionary_entry_fold_like_dictionary_names(
+        self, session_fixture: Session, test_user: User
+    ):
+        # Core inserts skip dictionary resolution, like rows written before it existed
+        session_fixture.execute(insert(PantryItem.__table__), [
+            {"item_name": "Açúcar", "quantity": 1, "unit": "kg", "user_id": test_user.id, "version": 0},
+            {"item_name": "acucar ", "quantity": 200, "unit": "g", "user_id": test_user.id, "version": 0},
+        ])
+        _add(session_fixture, test_user.id, "AÇÚCAR", 100, "g")
+
+        rows = crud_pantry.summarize_by_user(session_fixture, user_id=test_user.id)
+
+        assert [(row["name"], row["unit"], row["total_quantity"], row["item_count"]) for row in rows] == [
+            ("acucar", "g", 1300, 3)
+        ]
+        assert rows[0]["ingredient_id"] is not None
@@ -0,0 +1,140 @@
+"""
+Unit tests for pantry delta sync (GET /pantry/items/changes).
+"""
+
+from datetime import date, timedelta
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.models.user_models import User
+from app.models.pantry_models import PantryItemCreate, PantryItemTombstone
+from app.crud.crud_pantry import pantry as crud_pantry
+from app.crud.crud_user import user as crud_user
+from app.core.config import settings
+from app.schemas.user import UserCreate
+from app.services.pantry_expiry_service import PantryExpiryService
+
+
+def _auth(token: str):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _changes(client: TestClient, token: str, since=None):
+    url = "/api/v1/pantry/items/changes" + (f"?since={since}" if since is not None else "")
+    response = client.get(url, headers=_auth(token))
+    assert response.status_code == 200
+    return response.json()
+
+
+def _create(client: TestClient, token: str, name: str, **extra):
+    return client.post(
+        "/api/v1/pantry/items",
+        json={"item_name": name, "quantity": 1, "unit": "un", **extra},
+        headers=_auth(token)
+    ).json()
+
+
+class TestPantryDeltaSync:
+    """Test the pantry change feed"""
+
+    def test_first_call_returns_full_snapshot(self, client: TestClient, test_user_token: str):
+        _create(client, test_user_token, "Arroz")
+        _create(client, test_user_token, "Feijão")
+
+        data = _changes(client, test_user_token)
+
+        assert [item["item_name"] for item in data["items"]] == ["Arroz", "Feijão"]
+        assert data["deleted"] == []
+        assert data["next_token"] == "2"
+
+    def test_nothing_changed_returns_empty_lists(self, client: TestClient, test_user_token: str):
+        _create(client, test_user_token, "Arroz")
+        token = _changes(client, test_user_token)["next_token"]
+
+        data = _changes(client, test_user_token, token)
+
+        assert data == {"items": [], "deleted": [], "next_token": token}
+
+    def test_returns_only_rows_changed_since_token(self, client: TestClient, test_user_token: str):
+        rice = _create(client, test_user_token, "Arroz")
+        beans = _create(client, test_user_token, "Feijão")
+        milk = _create(client, test_user_token, "Leite")
+        token = _changes(client, test_user_token)["next_token"]
+
+        client.put(f"/api/v1/pantry/items/{rice['id']}", json={"quantity": 3}, headers=_auth(test_user_token))
+        client.delete(f"/api/v1/pantry/items/{beans['id']}", headers=_auth(test_user_token))
+        eggs = _create(client, test_user_token, "Ovos")
+
+        data = _changes(client, test_user_token, token)
+
+        assert [(item["id"], item["quantity"]) for item in data["items"]] == [(rice["id"], 3), (eggs["id"], 1)]
+        assert data["deleted"] == [beans["id"]]
+        assert milk["id"] not in [item["id"] for item in data["items"]]
+        assert int(data["next_token"]) > int(token)
+        assert _changes(client, test_user_token, data["next_token"])["items"] == []
+
+    def test_writes_stamp_version_and_updated_at(self, client: TestClient, test_user_token: str):
+        created = _create(client, test_user_token, "Sal")
+
+        updated = client.put(
+            f"/api/v1/pantry/items/{created['id']}", json={"quantity": 2}, headers=_auth(test_user_token)
+        ).json()
+
+        assert updated["version"] > created["version"]
+        assert updated["updated_at"] >= created["updated_at"]
+
+    def test_bulk_writes_are_in_the_feed(
+        self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User
+    ):
+        crud_pantry.create_with_user(
+            session_fixture,
+            obj_in=PantryItemCreate(item_name="Iogurte", quantity=1, unit="un", expiration_date=date(2026, 1, 1)),
+            user_id=test_user.id
+        )
+        token = _changes(client, test_user_token)["next_token"]
+
+        client.post(
+            "/api/v1/pantry/items/bulk",
+            json=[{"item_name": "Massa", "quantity": 1, "unit": "kg"}],
+            headers=_auth(test_user_token)
+        )
+        client.delete("/api/v1/pantry/items?expired_before=2026-10-19", headers=_auth(test_user_token))
+
+        data = _changes(client, test_user_token, token)
+        assert [item["item_name"] for item in data["items"]] == ["Massa"]
+        assert len(data["deleted"]) == 1
+        assert len(session_fixture.exec(select(PantryItemTombstone)).all()) == 1
+
+    def test_feed_is_per_user(self, client: TestClient, test_user_token: str, session_fixture: Session):
+        other = crud_user.create(
+            session_fixture, obj_in=UserCreate(email="other@example.com", username="other", password="otherpassword123")
+        )
+        crud_pantry.create_with_user(
+            session_fixture, obj_in=PantryItemCreate(item_name="Vinho", quantity=1, unit="l"), user_id=other.id
+        )
+
+        assert _changes(client, test_user_token, 0)["items"] == []
+
+    def test_invalid_token_returns_400(self, client: TestClient, test_user_token: str):
+        response = client.get("/api/v1/pantry/items/changes?since=abc", headers=_auth(test_user_token))
+
+        assert response.status_code == 400
+
+    def test_token_older_than_pruned_tombstones_requires_full_resync(
+        self, client: TestClient, test_user_token: str, session_fixture: Session
+    ):
+        rice = _create(client, test_user_token, "Arroz")
+        _create(client, test_user_token, "Feijão")
+        stale = _changes(client, test_user_token)["next_token"]
+        client.delete(f"/api/v1/pantry/items/{rice['id']}", headers=_auth(test_user_token))
+        current = _changes(client, test_user_token, stale)["next_token"]
+
+        later = date.today() + timedelta(days=settings.PANTRY_TOMBSTONE_RETENTION_DAYS + 1)
+        PantryExpiryService().scan(session_fixture.get_bind(), today=later)
+
+        assert session_fixture.exec(select(PantryItemTombstone)).all() == []
+        response = client.get(f"/api/v1/pantry/items/changes?since={stale}", headers=_auth(test_user_token))
+        assert response.status_code == 410
+        assert _changes(client, test_user_token, current)["deleted"] == []
+        assert [item["item_name"] for item in _changes(client, test_user_token)["items"]] == ["Feijão"]
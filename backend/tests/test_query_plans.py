@@ -0,0 +1,167 @@
+"""
+Query-plan regression tests for the hot read paths.
+
+The queries the application actually sends are captured while running the CRUD
+functions and fed back through EXPLAIN. A plain scan of recipe, recipeingredient
+or pantryitem fails the test.
+
+The in-memory SQLite database used by the suite serves as the stand-in planner.
+Set TEST_POSTGRES_URL (an empty scratch database) to also check the plans on
+PostgreSQL, with sequential scans disabled so any query that cannot use an
+index still shows up as a Seq Scan.
+"""
+
+import os
+import re
+from typing import Callable, List, Tuple
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlmodel import Session, SQLModel
+
+from app.models.user_models import User
+from app.models.pantry_models import PantryItem
+from app.models.recipe_models import RecipeCreate, RecipeIngredientCreate
+from app.crud.crud_pantry import pantry as crud_pantry
+from app.crud.crud_recipe import recipe as crud_recipe
+from app.services.recipe_index_service import recipe_index_service
+
+HOT_TABLES = ("recipe", "recipeingredient", "pantryitem")
+
+_SQLITE_FULL_SCAN = re.compile(r"^SCAN (%s)$" % "|".join(HOT_TABLES))
+
+
+def _hot_queries(session: Session, user_id: int) -> List[Tuple[str, Callable[[], object]]]:
+    return [
+        ("pantry expiring soon", lambda: crud_pantry.get_multi_by_user(
+            session, user_id=user_id, expiring_soon=True, sort_by="expiration_date"
+        )),
+        ("pantry list", lambda: crud_pantry.get_multi_by_user(session, user_id=user_id)),
+        ("pantry summary", lambda: crud_pantry.summarize_by_user(session, user_id=user_id)),
+        ("own recipes", lambda: crud_recipe.get_multi_with_filters(session, user_id=user_id, sort_by="name")),
+        ("system recipes", lambda: crud_recipe.get_multi_with_filters(session, user_id=None, sort_by="calories")),
+        ("own recipes after cursor", lambda: crud_recipe.get_multi_with_filters(
+            session, user_id=user_id, sort_by="calories", sort_order="desc", after=(500, 1)
+        )),
+        ("visible recipes", lambda: crud_recipe.get_multi_by_user(session, user_id=user_id)),
+        ("shared recommendation index", lambda: recipe_index_service.get_shared_index(session)),
+        ("user recommendation overlay", lambda: recipe_index_service.get_user_overlay(session, user_id)),
+    ]
+
+
+def _seed(session: Session, user_id: int) -> None:
+    for owner in (None, user_id):
+        crud_recipe.create_with_user(
+            session,
+            obj_in=RecipeCreate(
+                recipe_name="Sopa",
+                instructions="Ferver",
+                ingredients=[RecipeIngredientCreate(ingredient_name="Água", required_quantity=1.0, required_unit="l")]
+            ),
+            user_id=owner
+        )
+    session.add(PantryItem(item_name="Leite", quantity=1, unit="l", user_id=user_id))
+    session.commit()
+    recipe_index_service.clear()
+
+
+def _capture_selects(session: Session, run: Callable[[], object]) -> List[Tuple[str, object]]:
+    captured = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "collectionversion" not in statement:
+            captured.append((statement, parameters))
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        run()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return captured
+
+
+def _postgres_seq_scans(plan: dict) -> List[str]:
+    scans = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in HOT_TABLES:
+        scans.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        scans.extend(_postgres_seq_scans(child))
+    return scans
+
+
+class TestHotQueryPlans:
+    """EXPLAIN QUERY PLAN on SQLite: hot queries must search an index"""
+
+    def test_no_full_table_scans(self, session_fixture: Session, test_user: User):
+        _seed(session_fixture, test_user.id)
+
+        for name, run in _hot_queries(session_fixture, test_user.id):
+            statements = _capture_selects(session_fixture, run)
+            assert statements, name
+            for statement, parameters in statements:
+                plan = session_fixture.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+                details = [row[-1] for row in plan]
+                scans = [detail for detail in details if _SQLITE_FULL_SCAN.match(detail)]
+                assert not scans, f"{name}: {scans}\n{statement}"
+
+    def test_visibility_predicate_uses_owner_index(self, session_fixture: Session, test_user: User):
+        _seed(session_fixture, test_user.id)
+
+        (statement, parameters), *_ = [
+            captured for captured in _capture_selects(
+                session_fixture, lambda: crud_recipe.get_multi_by_user(session_fixture, user_id=test_user.id)
+            )
+            if "FROM recipe " in captured[0]
+        ]
+        details = [row[-1] for row in session_fixture.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+
+        owner_searches = [detail for detail in details if "created_by_user_id=?" in detail]
+        assert len(owner_searches) == 2, details
+
+    def test_cursor_page_seeks_the_keyset_index(self, session_fixture: Session, test_user: User):
+        _seed(session_fixture, test_user.id)
+
+        (statement, parameters), *_ = [
+            captured for captured in _capture_selects(
+                session_fixture, lambda: crud_recipe.get_multi_with_filters(
+                    session_fixture, user_id=test_user.id, sort_by="calories", after=(500, 1)
+                )
+            )
+            if "FROM recipe " in captured[0]
+        ]
+        details = [row[-1] for row in session_fixture.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+
+        # One range per branch: keys after the cursor, then the NULL tail
+        seeks = [detail for detail in details if "ix_recipe_owner_calories_id" in detail]
+        assert seeks == [
+            "SEARCH recipe USING COVERING INDEX ix_recipe_owner_calories_id (created_by_user_id=? AND estimated_calories>?)",
+            "SEARCH recipe USING COVERING INDEX ix_recipe_owner_calories_id (created_by_user_id=? AND estimated_calories=?)",
+        ], details
+
+@pytest.mark.skipif(not os.getenv("TEST_POSTGRES_URL"), reason="TEST_POSTGRES_URL not set")
+class TestHotQueryPlansPostgres:
+    """EXPLAIN (FORMAT JSON) on PostgreSQL: hot queries must not Seq Scan"""
+
+    def test_no_sequential_scans(self):
+        engine = create_engine(os.environ["TEST_POSTGRES_URL"])
+        SQLModel.metadata.create_all(engine)
+        try:
+            with Session(engine) as session:
+                user = User(email="plans@example.com", username="plans", hashed_password="x")
+                session.add(user)
+                session.commit()
+                _seed(session, user.id)
+
+                for name, run in _hot_queries(session, user.id):
+                    for statement, parameters in _capture_selects(session, run):
+                        connection = session.connection()
+                        connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+                        plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+                        scans = _postgres_seq_scans(plan[0]["Plan"])
+                        assert not scans, f"{name}: Seq Scan on {scans}\n{statement}"
+                session.rollback()
+        finally:
+            recipe_index_service.clear()
+            SQLModel.metadata.drop_all(engine)
+            engine.dispose()
@@ -0,0 +1,91 @@
+"""
+Unit tests for POST /recipes/bulk.
+"""
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.models.user_models import User
+from app.models.recipe_models import Recipe, RecipeCreate, RecipeIngredient, RecipeIngredientCreate
+from app.crud.crud_recipe import recipe as crud_recipe
+from app.services.recipe_index_service import recipe_index_service
+
+
+def _payload(name: str, ingredients=("Sal",)):
+    return {
+        "recipe_name": name,
+        "instructions": "Misturar",
+        "estimated_calories": 200,
+        "ingredients": [
+            {"ingredient_name": ingredient, "required_quantity": 1.0, "required_unit": "g"}
+            for ingredient in ingredients
+        ]
+    }
+
+
+class TestRecipeBulkCreate:
+    """Test batched recipe creation"""
+
+    def test_bulk_create(self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User):
+        response = client.post(
+            "/api/v1/recipes/bulk",
+            json={"recipes": [_payload(f"Recipe {i}", ("Limão", "Açúcar")) for i in range(5)]},
+            headers={"Authorization": f"Bearer {test_user_token}"}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["created"] == 5 and data["failed"] == 0
+        assert [r["index"] for r in data["results"]] == list(range(5))
+
+        recipes = session_fixture.exec(select(Recipe).order_by(Recipe.id)).all()
+        assert [r.recipe_name for r in recipes] == [f"Recipe {i}" for i in range(5)]
+        assert [r.id for r in recipes] == [r["recipe_id"] for r in data["results"]]
+        assert all(r.created_by_user_id == test_user.id for r in recipes)
+
+        names = session_fixture.exec(select(RecipeIngredient.normalized_name)).all()
+        assert sorted(set(names)) == ["acucar", "limao"] and len(names) == 10
+
+    def test_invalid_items_are_reported_individually(self, client: TestClient, test_user_token: str):
+        missing_name = _payload("x")
+        del missing_name["recipe_name"]
+
+        response = client.post(
+            "/api/v1/recipes/bulk",
+            json={"recipes": [_payload("Good 1"), missing_name, _payload("Good 2")]},
+            headers={"Authorization": f"Bearer {test_user_token}"}
+        )
+
+        data = response.json()
+        assert data["created"] == 2 and data["failed"] == 1
+        failed = data["results"][1]
+        assert failed["success"] is False and failed["recipe_id"] is None
+        assert "recipe_name" in failed["error"]
+        assert data["results"][2]["success"] is True
+
+    def test_database_error_only_fails_that_item(self, session_fixture: Session, test_user: User):
+        bad = RecipeCreate(
+            recipe_name="Bad",
+            instructions="Misturar",
+            ingredients=[RecipeIngredientCreate.model_construct(ingredient_name="Sal", required_quantity=None, required_unit="g")]
+        )
+        good = [RecipeCreate(**_payload(f"Good {i}")) for i in range(2)]
+
+        results = crud_recipe.create_many_with_user(session_fixture, objs_in=[good[0], bad, good[1]], user_id=test_user.id)
+
+        assert [recipe_id is not None for recipe_id, _ in results] == [True, False, True]
+        assert results[1][1]
+        names = session_fixture.exec(select(Recipe.recipe_name).order_by(Recipe.id)).all()
+        assert names == ["Good 0", "Good 1"]
+        assert len(session_fixture.exec(select(RecipeIngredient)).all()) == 2
+
+    def test_bulk_create_invalidates_recipe_index(self, session_fixture: Session, test_user: User):
+        assert len(recipe_index_service.get_user_overlay(session_fixture, test_user.id)) == 0
+
+        crud_recipe.create_many_with_user(session_fixture, objs_in=[RecipeCreate(**_payload("New"))], user_id=test_user.id)
+
+        assert len(recipe_index_service.get_user_overlay(session_fixture, test_user.id)) == 1
+
+    def test_requires_authentication(self, client: TestClient):
+        response = client.post("/api/v1/recipes/bulk", json={"recipes": [_payload("x")]})
+        assert response.status_code in (401, 403)
@@ -0,0 +1,161 @@
+"""
+Unit tests for the recipe read-through cache.
+"""
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.models.user_models import User
+from app.models.recipe_models import Recipe, RecipeCreate, RecipeIngredientCreate, RecipeUpdate
+from app.crud.crud_recipe import recipe as crud_recipe
+from app.core.lru_cache import ByteSizeLRUCache
+from app.db.versioning import bump_versions, recipe_item_scope
+from app.services.recipe_cache_service import recipe_cache_service
+
+
+def _create(session: Session, user_id=None, name="Bolo"):
+    return crud_recipe.create_with_user(
+        session,
+        obj_in=RecipeCreate(
+            recipe_name=name,
+            instructions="Assar",
+            ingredients=[RecipeIngredientCreate(ingredient_name="Farinha", required_quantity=1.0, required_unit="g")]
+        ),
+        user_id=user_id
+    )
+
+
+def _count_recipe_loads(session: Session):
+    loads = []
+
+    def record(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM recipe" in statement and "collectionversion" not in statement:
+            loads.append(statement)
+
+    event.listen(session.get_bind(), "before_cursor_execute", record)
+    return loads, lambda: event.remove(session.get_bind(), "before_cursor_execute", record)
+
+
+class TestRecipeCache:
+    """Test the read-through cache behind GET /recipes/{id}"""
+
+    def test_second_read_is_served_from_cache(self, session_fixture: Session):
+        created = _create(session_fixture)
+        recipe_cache_service.reset_stats()
+
+        first, version = recipe_cache_service.get_with_ingredients(session_fixture, recipe_id=created.id)
+        loads, stop = _count_recipe_loads(session_fixture)
+        try:
+            second, _ = recipe_cache_service.get_with_ingredients(session_fixture, recipe_id=created.id)
+        finally:
+            stop()
+
+        assert second is first
+        assert loads == []
+        stats = recipe_cache_service.stats()
+        assert stats["hits"] == 1 and stats["misses"] == 1
+        assert stats["entries"] == 1 and stats["bytes"] > 0
+
+    def test_write_invalidates_entry(self, session_fixture: Session):
+        created = _create(session_fixture)
+        recipe_cache_service.get_with_ingredients(session_fixture, recipe_id=created.id)
+
+        crud_recipe.update_with_ingredients(session_fixture, db_obj=created, obj_in=RecipeUpdate(recipe_name="Tarte"))
+
+        recipe, _ = recipe_cache_service.get_with_ingredients(session_fixture, recipe_id=created.id)
+        assert recipe.recipe_name == "Tarte"
+
+    def test_version_change_from_elsewhere_is_detected(self, session_fixture: Session):
+        created = _create(session_fixture)
+        recipe_cache_service.get_with_ingredients(session_fixture, recipe_id=created.id)
+
+        # Simulate a write committed by another process: no local invalidation
+        session_fixture.connection().exec_driver_sql("UPDATE recipe SET recipe_name = 'Outro' WHERE id = %d" % created.id)
+        bump_versions(session_fixture.connection(), [recipe_item_scope(created.id)])
+        session_fixture.commit()
+
+        recipe, _ = recipe_cache_service.get_with_ingredients(session_fixture, recipe_id=created.id)
+        assert recipe.recipe_name == "Outro"
+
+    def test_write_to_another_recipe_keeps_entry(self, session_fixture: Session):
+        created = _create(session_fixture)
+        other = _create(session_fixture, name="Pudim")
+        cached, _ = recipe_cache_service.get_with_ingredients(session_fixture, recipe_id=created.id)
+
+        crud_recipe.update_with_ingredients(session_fixture, db_obj=other, obj_in=RecipeUpdate(recipe_name="Flan"))
+
+        recipe, _ = recipe_cache_service.get_with_ingredients(session_fixture, recipe_id=created.id)
+        assert recipe is cached
+
+    def test_listing_pages_are_cached_per_version(self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User):
+        _create(session_fixture, user_id=test_user.id)
+        headers = {"Authorization": f"Bearer {test_user_token}"}
+        response = client.get("/api/v1/recipes/?view=summary", headers=headers)
+        first = response.json()
+        # Cached as the body that was sent
+        assert recipe_cache_service.get_listing(response.headers["etag"]) == response.content
+
+        loads, stop = _count_recipe_loads(session_fixture)
+        try:
+            second = client.get("/api/v1/recipes/?view=summary", headers=headers).json()
+        finally:
+            stop()
+        assert second == first
+        assert loads == []
+
+        _create(session_fixture, user_id=test_user.id, name="Tarte")
+        assert client.get("/api/v1/recipes/?view=summary", headers=headers).json()["total"] == 2
+
+    def test_other_users_recipe_is_not_served(self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User):
+        other = Recipe(recipe_name="Secreta", instructions="x", created_by_user_id=test_user.id + 1)
+        session_fixture.add(other)
+        session_fixture.commit()
+
+        assert client.get(f"/api/v1/recipes/{other.id}", headers={"Authorization": f"Bearer {test_user_token}"}).status_code == 403
+        assert recipe_cache_service.stats()["entries"] == 0
+
+    def test_own_recipe_is_not_served_to_anonymous(self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User):
+        created = _create(session_fixture, user_id=test_user.id)
+        headers = {"Authorization": f"Bearer {test_user_token}"}
+        assert client.get(f"/api/v1/recipes/{created.id}", headers=headers).status_code == 200
+
+        assert client.get(f"/api/v1/recipes/{created.id}").status_code == 403
+
+    def test_metrics_endpoint(self, client: TestClient, test_user_token: str):
+        response = client.get("/api/v1/recipes/cache/metrics", headers={"Authorization": f"Bearer {test_user_token}"})
+
+        assert response.status_code == 200
+        assert set(response.json()) == {"hits", "misses", "hit_rate", "evictions", "entries", "bytes", "max_bytes"}
+
+
+class TestByteSizeLRUCache:
+    """Test LRU eviction with byte accounting"""
+
+    def test_evicts_least_recently_used_to_fit(self):
+        cache = ByteSizeLRUCache(max_bytes=10)
+        cache.put("a", 1, 4)
+        cache.put("b", 2, 4)
+        cache.get("a")
+        cache.put("c", 3, 4)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1 and cache.get("c") == 3
+        stats = cache.stats()
+        assert stats["evictions"] == 1 and stats["bytes"] == 8 and stats["entries"] == 2
+
+    def test_replacing_a_key_updates_size(self):
+        cache = ByteSizeLRUCache(max_bytes=10)
+        cache.put("a", 1, 4)
+        cache.put("a", 2, 6)
+
+        assert cache.get("a") == 2
+        assert cache.stats()["bytes"] == 6
+
+    def test_oversized_values_are_not_cached(self):
+        cache = ByteSizeLRUCache(max_bytes=10)
+        cache.put("a", 1, 4)
+        cache.put("big", 2, 11)
+
+        assert cache.get("big") is None
+        assert cache.get("a") == 1
@@ -0,0 +1,94 @@
+"""
+Unit tests for the dispatch of committed recipe writes to the recipe caches and indexes.
+"""
+
+from unittest.mock import patch
+
+from sqlmodel import Session
+
+from app.models.user_models import User
+from app.models.pantry_models import PantryItem
+from app.models.recipe_models import Recipe, RecipeIngredient
+from app.services.recipe_cache_service import recipe_cache_service
+from app.services.recipe_name_index_service import recipe_name_index_service
+
+
+def _recipe(session: Session, name: str, user_id=None) -> Recipe:
+    recipe = Recipe(recipe_name=name, instructions="Misturar", created_by_user_id=user_id)
+    session.add(recipe)
+    session.commit()
+    return recipe
+
+
+def _invalidated(mock) -> set:
+    return {recipe_id for call in mock.call_args_list for recipe_id in call.args[0]}
+
+
+class TestRecipeChanges:
+    """Test the session listeners of app.db.recipe_changes"""
+
+    def test_flushes_without_recipes_leave_the_session_alone(self, session_fixture: Session, test_user: User):
+        session_fixture.add(PantryItem(item_name="Arroz", quantity=1, unit="kg", user_id=test_user.id))
+        session_fixture.flush()
+
+        assert "recipe_changes_pending" not in session_fixture.info
+        session_fixture.commit()
+
+    def test_one_dispatch_per_transaction(self, session_fixture: Session):
+        first = _recipe(session_fixture, "Bolo")
+        second = _recipe(session_fixture, "Pudim")
+
+        with patch.object(recipe_cache_service, "invalidate") as invalidate:
+            first.recipe_name = "Bolo de Milho"
+            session_fixture.flush()
+            session_fixture.add(RecipeIngredient(
+                recipe_id=second.id, ingredient_name="Leite", required_quantity=1.0, required_unit="l"
+            ))
+            session_fixture.flush()
+            invalidate.assert_not_called()
+            session_fixture.commit()
+
+        invalidate.assert_called_once()
+        assert _invalidated(invalidate) == {first.id, second.id}
+        assert "recipe_changes_pending" not in session_fixture.info
+
+    def test_rolled_back_savepoints_are_not_dispatched(self, session_fixture: Session):
+        kept = _recipe(session_fixture, "Bolo")
+        dropped = _recipe(session_fixture, "Pudim")
+
+        with patch.object(recipe_cache_service, "invalidate") as invalidate:
+            with session_fixture.begin_nested():
+                kept.recipe_name = "Bolo de Milho"
+            savepoint = session_fixture.begin_nested()
+            dropped.recipe_name = "Pudim de Leite"
+            session_fixture.flush()
+            savepoint.rollback()
+            session_fixture.commit()
+
+        assert _invalidated(invalidate) == {kept.id}
+
+    def test_rollback_discards_changes(self, session_fixture: Session):
+        recipe = _recipe(session_fixture, "Bolo")
+
+        with patch.object(recipe_cache_service, "invalidate") as invalidate:
+            recipe.recipe_name = "Bolo de Milho"
+            session_fixture.flush()
+            session_fixture.rollback()
+            session_fixture.commit()
+
+        invalidate.assert_not_called()
+
+    def test_names_follow_flush_order(self, session_fixture: Session):
+        recipe = _recipe(session_fixture, "Bolo")
+
+        with patch.object(recipe_name_index_service, "apply_changes") as apply_changes:
+            recipe.recipe_name = "Bolo de Milho"
+            session_fixture.flush()
+            with session_fixture.begin_nested():
+                recipe.recipe_name = "Bolo de Fubá"
+            recipe.recipe_name = "Broa"
+            session_fixture.commit()
+
+        upserts, deletes = apply_changes.call_args.args
+        assert list(upserts) == [(recipe.id, None, "Broa")]
+        assert not deletes
@@ -0,0 +1,136 @@
+"""
+Unit tests for content-hash / source-id recipe deduplication.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.models.user_models import User
+from app.models.recipe_models import RecipeCreate, RecipeIngredientCreate, RecipeUpdate
+from app.crud.crud_recipe import recipe as crud_recipe, DuplicateRecipeError
+from app.core.text import recipe_content_hash
+from app.services.mealdb_service import MealDBIngredient, MealDBMeal
+from app.services.mealdb_import_service import MealDBImportService
+
+
+def _recipe(name: str, ingredients=("ovos", "açúcar"), quantity: float = 1.0) -> RecipeCreate:
+    return RecipeCreate(
+        recipe_name=name,
+        instructions="Misturar",
+        ingredients=[
+            RecipeIngredientCreate(ingredient_name=ingredient, required_quantity=quantity, required_unit="g")
+            for ingredient in ingredients
+        ]
+    )
+
+
+class TestRecipeContentHash:
+    """Test the normalized recipe fingerprint"""
+
+    def test_near_identical_copies_share_a_hash(self):
+        assert recipe_content_hash("Pão de Ló", ["Ovos", "açúcar"]) == recipe_content_hash("pao de lo!", ["acucar ", "ovos"])
+
+    def test_different_recipes_differ(self):
+        assert recipe_content_hash("Pão de Ló", ["ovos"]) != recipe_content_hash("Pão de Ló", ["ovos", "farinha"])
+        assert recipe_content_hash("Pão de Ló", ["ovos"]) != recipe_content_hash("Pão", ["ovos"])
+
+
+class TestRecipeDeduplication:
+    """Test duplicate detection on create, update, bulk create and import"""
+
+    def test_create_rejects_near_identical_copy(self, session_fixture: Session, test_user: User):
+        created = crud_recipe.create_with_user(session_fixture, obj_in=_recipe("Pão de Ló"), user_id=test_user.id)
+
+        with pytest.raises(DuplicateRecipeError) as exc_info:
+            crud_recipe.create_with_user(
+                session_fixture, obj_in=_recipe("PAO DE LO", ("Açúcar", "Ovos"), quantity=3), user_id=test_user.id
+            )
+
+        assert exc_info.value.recipe_id == created.id
+
+    def test_same_recipe_for_other_owners_is_allowed(self, session_fixture: Session, test_user: User):
+        crud_recipe.create_with_user(session_fixture, obj_in=_recipe("Pão de Ló"), user_id=test_user.id)
+        crud_recipe.create_with_user(session_fixture, obj_in=_recipe("Pão de Ló"))
+
+        with pytest.raises(DuplicateRecipeError):
+            crud_recipe.create_with_user(session_fixture, obj_in=_recipe("Pão de Ló"))
+
+    def test_update_into_duplicate_is_rejected(self, session_fixture: Session, test_user: User):
+        first = crud_recipe.create_with_user(session_fixture, obj_in=_recipe("Bolo"), user_id=test_user.id)
+        second = crud_recipe.create_with_user(session_fixture, obj_in=_recipe("Pudim"), user_id=test_user.id)
+
+        with pytest.raises(DuplicateRecipeError) as exc_info:
+            crud_recipe.update_with_ingredients(session_fixture, db_obj=second, obj_in=RecipeUpdate(recipe_name="bolo"))
+
+        assert exc_info.value.recipe_id == first.id
+        assert crud_recipe.get(session_fixture, id=second.id).recipe_name == "Pudim"
+
+    def test_update_refreshes_hash(self, session_fixture: Session, test_user: User):
+        created = crud_recipe.create_with_user(session_fixture, obj_in=_recipe("Bolo"), user_id=test_user.id)
+
+        crud_recipe.update_with_ingredients(
+            session_fixture, db_obj=created,
+            obj_in=RecipeUpdate(ingredients=[RecipeIngredientCreate(ingredient_name="farinha", required_quantity=1.0, required_unit="g")])
+        )
+
+        assert crud_recipe.find_duplicate(
+            session_fixture, owner_id=test_user.id, content_hash=recipe_content_hash("Bolo", ["farinha"])
+        ) == created.id
+
+    def test_bulk_create_reports_duplicates(self, session_fixture: Session, test_user: User):
+        existing = crud_recipe.create_with_user(session_fixture, obj_in=_recipe("Bolo"), user_id=test_user.id)
+
+        results = crud_recipe.create_many_with_user(
+            session_fixture, objs_in=[_recipe("Pudim"), _recipe("bolo"), _recipe("Pudim ")], user_id=test_user.id
+        )
+
+        assert results[0][1] is None
+        assert results[1] == (None, f"Duplicate of recipe {existing.id}")
+        assert results[2] == (None, f"Duplicate of recipe {results[0][0]}")
+
+    def test_endpoint_returns_conflict(self, client: TestClient, test_user_token: str):
+        headers = {"Authorization": f"Bearer {test_user_token}"}
+        payload = _recipe("Arroz Doce").model_dump()
+
+        first = client.post("/api/v1/recipes/", json=payload, headers=headers)
+        second = client.post("/api/v1/recipes/", json=payload, headers=headers)
+
+        assert first.status_code == 200
+        assert second.status_code == 409
+        assert second.json()["detail"] == f"Duplicate of recipe {first.json()['id']}"
+
+
+class TestMealDBImportDeduplication:
+    """Test that MealDB imports are deduplicated by source id and content"""
+
+    def _meal(self, name: str = "Teriyaki Chicken") -> MealDBMeal:
+        return MealDBMeal(
+            id="52772", name=name, category="Chicken", instructions="Cook",
+            ingredients=[MealDBIngredient(name="soy sauce", measure="1 cup")]
+        )
+
+    def test_reimport_is_rejected_without_fetching(self, session_fixture: Session, test_user: User):
+        service = MealDBImportService()
+        with patch.object(service.mealdb_service, "get_meal_by_id", AsyncMock(return_value=self._meal())) as fetch:
+            first = asyncio.run(service.import_meal_by_id(session_fixture, "52772", test_user))
+            second = asyncio.run(service.import_meal_by_id(session_fixture, "52772", test_user))
+
+        assert first["success"] is True
+        assert second["success"] is False
+        assert second["existing_recipe_id"] == first["recipe_id"]
+        assert fetch.await_count == 1
+
+    def test_identical_user_recipe_blocks_import(self, session_fixture: Session, test_user: User):
+        existing = crud_recipe.create_with_user(
+            session_fixture, obj_in=_recipe("teriyaki chicken", ("Soy Sauce",)), user_id=test_user.id
+        )
+        service = MealDBImportService()
+        with patch.object(service.mealdb_service, "get_meal_by_id", AsyncMock(return_value=self._meal())):
+            result = asyncio.run(service.import_meal_by_id(session_fixture, "52772", test_user))
+
+        assert result["success"] is False
+        assert result["existing_recipe_id"] == existing.id
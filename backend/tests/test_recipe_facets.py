@@ -0,0 +1,94 @@
+"""
+Unit tests for facet counts on GET /recipes (facets=true).
+"""
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.models.user_models import User
+from app.models.recipe_models import RecipeCreate, RecipeIngredientCreate
+from app.crud.crud_recipe import recipe as crud_recipe
+
+
+def _create(session: Session, name: str, kcal, minutes, ingredients, user_id=None):
+    crud_recipe.create_with_user(
+        session,
+        obj_in=RecipeCreate(
+            recipe_name=name,
+            instructions="Cozinhar",
+            estimated_calories=kcal,
+            preparation_time_minutes=minutes,
+            ingredients=[
+                RecipeIngredientCreate(ingredient_name=ingredient, required_quantity=1.0, required_unit="g")
+                for ingredient in ingredients
+            ]
+        ),
+        user_id=user_id
+    )
+
+
+def _seed(session: Session, user_id=None):
+    _create(session, "Salada de Frango", 250, 15, ["Frango", "alface"], user_id)
+    _create(session, "Frango Assado", 450, 60, ["frango", "batata", "alho"], user_id)
+    _create(session, "Sopa de Legumes", 120, 30, ["batata", "cenoura"], user_id)
+    _create(session, "Lasanha", 900, 90, ["massa", "carne", "alho"], user_id)
+    _create(session, "Sem Dados", None, None, ["frango"], user_id)
+
+
+class TestRecipeFacets:
+    """Test one-pass facet counts"""
+
+    def test_bucket_and_ingredient_counts(self, session_fixture: Session):
+        _seed(session_fixture)
+
+        facets = crud_recipe.facet_counts(session_fixture, ingredient_limit=3)
+
+        assert facets["calories"] == [(300, 2), (500, 3), (800, 3)]
+        assert facets["prep_time"] == [(15, 1), (30, 2), (60, 3)]
+        assert facets["ingredients"] == [("frango", 3), ("alho", 2), ("batata", 2)]
+
+    def test_facets_follow_filters(self, session_fixture: Session):
+        _seed(session_fixture)
+
+        facets = crud_recipe.facet_counts(session_fixture, ingredients=["frango"], max_prep_time=30)
+
+        assert facets["calories"] == [(300, 1), (500, 1), (800, 1)]
+        assert facets["ingredients"] == [("alface", 1), ("frango", 1)]
+
+    def test_facets_use_two_queries(self, session_fixture: Session):
+        _seed(session_fixture)
+        statements = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = session_fixture.get_bind()
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            crud_recipe.facet_counts(session_fixture, search="frango")
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+
+        assert len(statements) == 2
+
+    def test_endpoint_returns_facets(self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User):
+        _seed(session_fixture, user_id=test_user.id)
+        _create(session_fixture, "Do Sistema", 100, 10, ["frango"])
+
+        response = client.get(
+            "/api/v1/recipes?facets=true&limit=1",
+            headers={"Authorization": f"Bearer {test_user_token}"}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["recipes"]) == 1
+        assert data["facets"]["calories"][0] == {"max": 300, "count": 2}
+        assert data["facets"]["prep_time"][-1] == {"max": 60, "count": 3}
+        assert data["facets"]["ingredients"][0] == {"name": "frango", "count": 3}
+
+    def test_facets_are_opt_in(self, client: TestClient, test_user_token: str):
+        response = client.get("/api/v1/recipes", headers={"Authorization": f"Bearer {test_user_token}"})
+
+        assert response.json()["facets"] is None
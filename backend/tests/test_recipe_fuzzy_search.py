@@ -0,0 +1,177 @@
+"""
+Unit tests for typo-tolerant recipe name search (GET /recipes?search=...&fuzzy=true).
+"""
+
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.models.user_models import User
+from app.models.recipe_models import Recipe, RecipeCreate, RecipeIngredientCreate, RecipeUpdate
+from app.crud.crud_recipe import recipe as crud_recipe
+from app.core.symspell import SymSpellIndex, edit_distance
+from app.services.recipe_name_index_service import recipe_name_index_service
+
+
+def _create(session: Session, name: str, user_id=None):
+    return crud_recipe.create_with_user(
+        session,
+        obj_in=RecipeCreate(
+            recipe_name=name,
+            instructions="Cozinhar",
+            ingredients=[RecipeIngredientCreate(ingredient_name="sal", required_quantity=1.0, required_unit="g")]
+        ),
+        user_id=user_id
+    )
+
+
+def _names(session: Session, search: str, **kwargs):
+    return [r.recipe_name for r in crud_recipe.get_multi_with_filters(session, search=search, fuzzy=True, **kwargs)]
+
+
+class TestRecipeFuzzySearch:
+    """Test fuzzy recipe name matching"""
+
+    def test_misspelled_words_match(self, session_fixture: Session):
+        _create(session_fixture, "Bacalhau com Natas")
+        _create(session_fixture, "Spaghetti Carbonara")
+        _create(session_fixture, "Caldo Verde")
+
+        assert _names(session_fixture, "bacalhao") == ["Bacalhau com Natas"]
+        assert _names(session_fixture, "carbonaro") == ["Spaghetti Carbonara"]
+        assert _names(session_fixture, "spagheti carbonra") == ["Spaghetti Carbonara"]
+
+    def test_accents_and_case_are_ignored(self, session_fixture: Session):
+        _create(session_fixture, "Frango com Limão")
+
+        assert _names(session_fixture, "LIMAO frango") == ["Frango com Limão"]
+
+    def test_short_words_must_match_exactly(self, session_fixture: Session):
+        _create(session_fixture, "Arroz de Pato")
+
+        assert _names(session_fixture, "pato") == ["Arroz de Pato"]
+        assert _names(session_fixture, "gato") == ["Arroz de Pato"]
+        assert _names(session_fixture, "pat") == []
+
+    def test_closer_matches_rank_first(self, session_fixture: Session):
+        _create(session_fixture, "Sopa de Tomate")
+        _create(session_fixture, "Sopa de Tomates")
+
+        assert _names(session_fixture, "tomate") == ["Sopa de Tomate", "Sopa de Tomates"]
+
+    def test_count_matches_results(self, session_fixture: Session):
+        for i in range(3):
+            _create(session_fixture, f"Feijoada {i}")
+        _create(session_fixture, "Bolo")
+
+        assert crud_recipe.count_with_filters(session_fixture, search="fejoada", fuzzy=True) == 3
+
+    def test_index_follows_updates_and_deletes(self, session_fixture: Session):
+        _create(session_fixture, "Bolo")
+        created = _create(session_fixture, "Old Name")
+        assert _names(session_fixture, "bolo") == ["Bolo"]
+
+        crud_recipe.update_with_ingredients(session_fixture, db_obj=created, obj_in=RecipeUpdate(recipe_name="Francesinha"))
+        assert _names(session_fixture, "francezinha") == ["Francesinha"]
+
+        for ingredient in created.ingredients:
+            session_fixture.delete(ingredient)
+        session_fixture.delete(created)
+        session_fixture.commit()
+        assert _names(session_fixture, "francesinha") == []
+
+    def test_bulk_created_recipes_are_indexed(self, session_fixture: Session):
+        _create(session_fixture, "Bolo")
+        assert _names(session_fixture, "bolo") == ["Bolo"]
+
+        crud_recipe.create_many_with_user(session_fixture, objs_in=[
+            RecipeCreate(recipe_name="Arroz Doce", instructions="Cozer", ingredients=[])
+        ])
+
+        assert _names(session_fixture, "aroz doce") == ["Arroz Doce"]
+
+    def test_rolled_back_changes_are_not_indexed(self, session_fixture: Session):
+        _create(session_fixture, "Bolo")
+        assert _names(session_fixture, "bolo") == ["Bolo"]
+
+        session_fixture.add(Recipe(recipe_name="Pudim Flan", instructions="Cozer"))
+        session_fixture.flush()
+        session_fixture.rollback()
+
+        assert _names(session_fixture, "pudim") == []
+
+    def test_expired_index_is_served_while_another_request_rebuilds(self, session_fixture: Session):
+        _create(session_fixture, "Bolo")
+        assert _names(session_fixture, "bolo") == ["Bolo"]
+        recipe_name_index_service._built_at = 0.0
+
+        with patch.object(recipe_name_index_service, "_build", wraps=recipe_name_index_service._build) as build:
+            with recipe_name_index_service._build_lock:
+                assert _names(session_fixture, "bolo") == ["Bolo"]
+            assert build.call_count == 0
+
+            _names(session_fixture, "bolo")
+            _names(session_fixture, "bolo")
+            assert build.call_count == 1
+
+    def test_fuzzy_search_respects_visibility(self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User):
+        _create(session_fixture, "Minha Feijoada", user_id=test_user.id)
+        _create(session_fixture, "Feijoada do Sistema")
+
+        response = client.get(
+            "/api/v1/recipes?search=feijoda&fuzzy=true",
+            headers={"Authorization": f"Bearer {test_user_token}"}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 1
+        assert [r["recipe_name"] for r in data["recipes"]] == ["Minha Feijoada"]
+
+    def test_without_fuzzy_typos_do_not_match(self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User):
+        _create(session_fixture, "Bacalhau com Natas", user_id=test_user.id)
+
+        response = client.get(
+            "/api/v1/recipes?search=bacalhao",
+            headers={"Authorization": f"Bearer {test_user_token}"}
+        )
+
+        assert response.json()["total"] == 0
+
+
+class TestSymSpellIndex:
+    """Test the symmetric-delete index and edit distance"""
+
+    def test_edit_distance(self):
+        assert edit_distance("bacalhau", "bacalhao", 2) == 1
+        assert edit_distance("carbonara", "carbonraa", 2) == 1
+        assert edit_distance("natas", "nata", 2) == 1
+        assert edit_distance("bolo", "francesinha", 2) == 3
+
+    def test_lookup_finds_words_within_distance(self):
+        index = SymSpellIndex()
+        index.add("carbonara", 1)
+        index.add("caldo", 2)
+
+        assert index.lookup("carbonaro", 1) == {"carbonara": 1}
+        assert index.lookup("cldo", 1) == {"caldo": 1}
+        assert index.lookup("xyz", 2) == {}
+
+    def test_typo_past_prefix_is_found(self):
+        index = SymSpellIndex(prefix_length=4)
+        index.add("bacalhau", 1)
+
+        assert index.lookup("bacalhaus", 1) == {"bacalhau": 1}
+        assert index.lookup("bacxyzau", 2) == {}
+
+    def test_remove_drops_word_with_last_key(self):
+        index = SymSpellIndex()
+        index.add("bolo", 1)
+        index.add("bolo", 2)
+
+        index.remove("bolo", 1)
+        assert index.keys_for("bolo") == {2}
+        index.remove("bolo", 2)
+        assert index.lookup("bolo", 1) == {}
+        assert len(index) == 0
@@ -0,0 +1,124 @@
+"""
+Unit tests for the two-tier recommendation index
+(shared system recipe index + per-user overlays).
+"""
+
+import pytest
+from sqlmodel import Session
+
+from app.models.user_models import User
+from app.models.pantry_models import PantryItem
+from app.models.recipe_models import RecipeCreate, RecipeIngredientCreate, RecipeUpdate
+from app.crud.crud_recipe import recipe as crud_recipe
+from app.crud.crud_user import user as crud_user
+from app.schemas.user import UserCreate
+from app.services.recipe_index_service import recipe_index_service
+from app.services.recommendation_service import RecommendationService
+
+
+def _recipe(name: str, *ingredients: str) -> RecipeCreate:
+    return RecipeCreate(
+        recipe_name=name,
+        instructions=f"Cook {name}",
+        estimated_calories=400,
+        preparation_time_minutes=20,
+        ingredients=[
+            RecipeIngredientCreate(ingredient_name=ingredient, required_quantity=1.0, required_unit="unit")
+            for ingredient in ingredients
+        ]
+    )
+
+
+@pytest.fixture
+def other_user(session_fixture: Session) -> User:
+    return crud_user.create(
+        session_fixture,
+        obj_in=UserCreate(email="other@example.com", username="otheruser", password="testpassword123")
+    )
+
+
+class TestRecipeIndex:
+    """Test the shared index / per-user overlay split"""
+
+    def test_candidates_merge_shared_and_own_recipes(self, session_fixture: Session, test_user: User, other_user: User):
+        crud_recipe.create_with_user(session_fixture, obj_in=_recipe("System Soup", "onion"), user_id=None)
+        crud_recipe.create_with_user(session_fixture, obj_in=_recipe("My Pasta", "pasta"), user_id=test_user.id)
+        crud_recipe.create_with_user(session_fixture, obj_in=_recipe("Their Cake", "flour"), user_id=other_user.id)
+
+        candidates = recipe_index_service.get_candidates(session_fixture, test_user.id)
+        names = sorted(entry.recipe.recipe_name for entry in candidates)
+
+        assert names == ["My Pasta", "System Soup"]
+        by_name = {entry.recipe.recipe_name: entry for entry in candidates}
+        assert [i.ingredient_name for i in by_name["My Pasta"].ingredients] == ["pasta"]
+
+    def test_shared_index_is_reused_across_users(self, session_fixture: Session, test_user: User, other_user: User):
+        crud_recipe.create_with_user(session_fixture, obj_in=_recipe("System Soup", "onion"), user_id=None)
+
+        recipe_index_service.get_candidates(session_fixture, test_user.id)
+        shared = recipe_index_service.get_shared_index(session_fixture)
+        recipe_index_service.get_candidates(session_fixture, other_user.id)
+
+        assert recipe_index_service.get_shared_index(session_fixture) is shared
+
+    def test_personal_write_only_rebuilds_owner_overlay(self, session_fixture: Session, test_user: User, other_user: User):
+        crud_recipe.create_with_user(session_fixture, obj_in=_recipe("System Soup", "onion"), user_id=None)
+        recipe_index_service.get_candidates(session_fixture, test_user.id)
+        recipe_index_service.get_candidates(session_fixture, other_user.id)
+        shared = recipe_index_service.get_shared_index(session_fixture)
+        other_overlay = recipe_index_service.get_user_overlay(session_fixture, other_user.id)
+
+        created = crud_recipe.create_with_user(session_fixture, obj_in=_recipe("My Pasta", "pasta"), user_id=test_user.id)
+
+        assert recipe_index_service.get_shared_index(session_fixture) is shared
+        assert recipe_index_service.get_user_overlay(session_fixture, other_user.id) is other_overlay
+        assert created.id in recipe_index_service.get_user_overlay(session_fixture, test_user.id)
+
+    def test_ingredient_update_refreshes_overlay(self, session_fixture: Session, test_user: User):
+        created = crud_recipe.create_with_user(session_fixture, obj_in=_recipe("My Pasta", "pasta"), user_id=test_user.id)
+        recipe_index_service.get_candidates(session_fixture, test_user.id)
+
+        crud_recipe.update_with_ingredients(
+            session_fixture,
+            db_obj=created,
+            obj_in=RecipeUpdate(ingredients=[
+                RecipeIngredientCreate(ingredient_name="rice", required_quantity=1.0, required_unit="cup")
+            ])
+        )
+
+        overlay = recipe_index_service.get_user_overlay(session_fixture, test_user.id)
+        assert [i.ingredient_name for i in overlay.entries[0].ingredients] == ["rice"]
+
+    def test_system_write_rebuilds_shared_index(self, session_fixture: Session, test_user: User):
+        crud_recipe.create_with_user(session_fixture, obj_in=_recipe("System Soup", "onion"), user_id=None)
+        shared = recipe_index_service.get_shared_index(session_fixture)
+
+        crud_recipe.create_with_user(session_fixture, obj_in=_recipe("System Salad", "lettuce"), user_id=None)
+
+        rebuilt = recipe_index_service.get_shared_index(session_fixture)
+        assert rebuilt is not shared
+        assert len(rebuilt) == 2
+
+    def test_unrelated_commits_leave_indexes_alone(self, session_fixture: Session, test_user: User):
+        crud_recipe.create_with_user(session_fixture, obj_in=_recipe("System Soup", "onion"), user_id=None)
+        shared = recipe_index_service.get_shared_index(session_fixture)
+        generation = recipe_index_service._generation
+
+        session_fixture.add(PantryItem(item_name="onion", quantity=1.0, unit="kg", user_id=test_user.id))
+        session_fixture.commit()
+
+        assert recipe_index_service._generation == generation
+        assert recipe_index_service.get_shared_index(session_fixture) is shared
+
+    def test_recommendations_see_recipes_added_after_first_call(self, session_fixture: Session, test_user: User):
+        session_fixture.add(PantryItem(item_name="pasta", quantity=1.0, unit="kg", user_id=test_user.id))
+        session_fixture.commit()
+        service = RecommendationService()
+
+        first = service.get_recommendations(db=session_fixture, user_id=test_user.id, use_preferences=False)
+        assert first.recommendations == []
+
+        crud_recipe.create_with_user(session_fixture, obj_in=_recipe("My Pasta", "pasta"), user_id=test_user.id)
+
+        second = service.get_recommendations(db=session_fixture, user_id=test_user.id, use_preferences=False)
+        assert [r.recipe_name for r in second.recommendations] == ["My Pasta"]
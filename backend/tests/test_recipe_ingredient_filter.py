@@ -0,0 +1,79 @@
+"""
+Unit tests for the normalized ingredient-name filter of recipe listings.
+"""
+
+from sqlmodel import Session, select
+
+from app.models.recipe_models import RecipeCreate, RecipeIngredient, RecipeIngredientCreate, RecipeUpdate
+from app.crud.crud_recipe import recipe as crud_recipe
+from app.core.text import normalize_ingredient_name
+
+
+def _create(session: Session, name: str, ingredient_names):
+    return crud_recipe.create_with_user(
+        session,
+        obj_in=RecipeCreate(
+            recipe_name=name,
+            instructions="Misturar",
+            ingredients=[
+                RecipeIngredientCreate(ingredient_name=ingredient, required_quantity=1.0, required_unit="un")
+                for ingredient in ingredient_names
+            ]
+        ),
+        user_id=None
+    )
+
+
+def _names(session: Session, ingredients):
+    return sorted(r.recipe_name for r in crud_recipe.get_multi_with_filters(session, ingredients=ingredients))
+
+
+class TestRecipeIngredientFilter:
+    """Test the single-query ingredient filter on normalized names"""
+
+    def test_normalized_name_is_stored(self, session_fixture: Session):
+        _create(session_fixture, "Tarte", ["  Limão  Verde ", "AÇÚCAR"])
+
+        stored = session_fixture.exec(select(RecipeIngredient.normalized_name)).all()
+
+        assert sorted(stored) == ["acucar", "limao verde"]
+
+    def test_normalized_name_follows_updates(self, session_fixture: Session):
+        created = _create(session_fixture, "Tarte", ["Limão"])
+
+        crud_recipe.update_with_ingredients(
+            session_fixture,
+            db_obj=created,
+            obj_in=RecipeUpdate(ingredients=[RecipeIngredientCreate(ingredient_name="Maçã", required_quantity=2, required_unit="un")])
+        )
+
+        assert _names(session_fixture, ["maca"]) == ["Tarte"]
+        assert _names(session_fixture, ["limão"]) == []
+
+    def test_all_ingredients_are_required(self, session_fixture: Session):
+        _create(session_fixture, "Tarte de Maçã", ["Maçã", "Nozes", "Farinha"])
+        _create(session_fixture, "Salada", ["Maçã", "Alface"])
+
+        assert _names(session_fixture, ["maçã", "NOZES"]) == ["Tarte de Maçã"]
+        assert _names(session_fixture, ["maca"]) == ["Salada", "Tarte de Maçã"]
+
+    def test_substring_match_is_accent_insensitive(self, session_fixture: Session):
+        _create(session_fixture, "Frango Assado", ["Peito de Frango", "Açafrão"])
+
+        assert _names(session_fixture, ["frango", "acafrao"]) == ["Frango Assado"]
+
+    def test_one_ingredient_row_cannot_satisfy_two_terms(self, session_fixture: Session):
+        _create(session_fixture, "Frango", ["Peito de Frango"])
+
+        assert _names(session_fixture, ["peito", "frango"]) == ["Frango"]
+        assert _names(session_fixture, ["peito", "arroz"]) == []
+
+    def test_duplicate_terms_count_once(self, session_fixture: Session):
+        _create(session_fixture, "Arroz", ["Arroz"])
+
+        assert _names(session_fixture, ["Arroz", "arroz "]) == ["Arroz"]
+        assert crud_recipe.count_with_filters(session_fixture, ingredients=["Arroz", "arroz "]) == 1
+
+    def test_normalize_ingredient_name(self):
+        assert normalize_ingredient_name("  Crème   Brûlée ") == "creme brulee"
+        assert normalize_ingredient_name("") == ""
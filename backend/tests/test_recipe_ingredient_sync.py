@@ -0,0 +1,106 @@
+"""
+Unit tests for diff-based ingredient updates in update_with_ingredients.
+"""
+
+from sqlalchemy import event
+from sqlmodel import Session, select
+
+from app.models.user_models import User
+from app.models.recipe_models import RecipeCreate, RecipeIngredient, RecipeIngredientCreate, RecipeUpdate
+from app.crud.crud_recipe import recipe as crud_recipe
+from app.services.recipe_index_service import recipe_index_service
+
+
+def _ingredient(name: str, quantity: float = 1.0, unit: str = "g"):
+    return RecipeIngredientCreate(ingredient_name=name, required_quantity=quantity, required_unit=unit)
+
+
+def _create(session: Session, ingredients, user_id=None):
+    return crud_recipe.create_with_user(
+        session,
+        obj_in=RecipeCreate(recipe_name="Bolo", instructions="Assar", ingredients=ingredients),
+        user_id=user_id
+    )
+
+
+def _stored(session: Session, recipe_id: int):
+    rows = session.exec(
+        select(RecipeIngredient).where(RecipeIngredient.recipe_id == recipe_id).order_by(RecipeIngredient.id)
+    ).all()
+    return {row.ingredient_name: (row.id, row.required_quantity, row.required_unit) for row in rows}
+
+
+class TestRecipeIngredientSync:
+    """Test that only changed ingredient rows are written"""
+
+    def test_unchanged_rows_keep_their_ids(self, session_fixture: Session):
+        created = _create(session_fixture, [_ingredient("Farinha", 200), _ingredient("Ovos", 3, "un")])
+        before = _stored(session_fixture, created.id)
+
+        updated = crud_recipe.update_with_ingredients(
+            session_fixture,
+            db_obj=created,
+            obj_in=RecipeUpdate(ingredients=[_ingredient("Farinha", 250), _ingredient("Ovos", 3, "un"), _ingredient("Açúcar", 100)])
+        )
+
+        after = _stored(session_fixture, created.id)
+        assert after["Ovos"] == before["Ovos"]
+        assert after["Farinha"] == (before["Farinha"][0], 250, "g")
+        assert "Açúcar" in after
+        assert sorted(i.ingredient_name for i in updated.ingredients) == ["Açúcar", "Farinha", "Ovos"]
+
+    def test_sync_reports_changed_names(self, session_fixture: Session):
+        created = _create(session_fixture, [_ingredient("Farinha"), _ingredient("Ovos"), _ingredient("Leite")])
+
+        changes = crud_recipe.sync_ingredients(
+            session_fixture,
+            recipe_id=created.id,
+            ingredients=[_ingredient("farinha"), _ingredient("Ovos"), _ingredient("Manteiga")]
+        )
+        session_fixture.commit()
+
+        assert changes.added == {"manteiga"}
+        assert changes.updated == {"farinha"}  # spelling changed
+        assert changes.removed == {"leite"}
+        assert changes.changed_names == {"manteiga", "farinha", "leite"}
+        assert sorted(_stored(session_fixture, created.id)) == ["Manteiga", "Ovos", "farinha"]
+
+    def test_identical_list_issues_no_writes(self, session_fixture: Session):
+        created = _create(session_fixture, [_ingredient("Farinha"), _ingredient("Ovos")])
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement.split()[0].upper())
+
+        engine = session_fixture.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            changes = crud_recipe.sync_ingredients(
+                session_fixture, recipe_id=created.id, ingredients=[_ingredient("Ovos"), _ingredient("Farinha")]
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert not changes.changed_names
+        assert set(statements) == {"SELECT"}
+
+    def test_duplicate_names_are_paired_in_order(self, session_fixture: Session):
+        created = _create(session_fixture, [_ingredient("Sal", 1), _ingredient("Sal", 2)])
+
+        changes = crud_recipe.sync_ingredients(session_fixture, recipe_id=created.id, ingredients=[_ingredient("Sal", 1)])
+        session_fixture.commit()
+
+        assert changes.removed == {"sal"} and not changes.added and not changes.updated
+        assert [q for _, q, _ in _stored(session_fixture, created.id).values()] == [1]
+
+    def test_ingredient_changes_refresh_recipe_index(self, session_fixture: Session, test_user: User):
+        created = _create(session_fixture, [_ingredient("Farinha")], user_id=test_user.id)
+        overlay = recipe_index_service.get_user_overlay(session_fixture, test_user.id)
+        assert [i.ingredient_name for i in overlay.entries[0].ingredients] == ["Farinha"]
+
+        crud_recipe.update_with_ingredients(
+            session_fixture, db_obj=created, obj_in=RecipeUpdate(ingredients=[_ingredient("Centeio")])
+        )
+
+        overlay = recipe_index_service.get_user_overlay(session_fixture, test_user.id)
+        assert [i.ingredient_name for i in overlay.entries[0].ingredients] == ["Centeio"]
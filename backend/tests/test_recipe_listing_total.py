@@ -0,0 +1,89 @@
+"""
+Unit tests for the single-query page + total of GET /recipes.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+from sqlmodel import Session
+
+from app.models.user_models import User
+from app.models.recipe_models import Recipe
+from app.crud.crud_recipe import recipe as crud_recipe
+from app.services.recipe_name_index_service import recipe_name_index_service
+
+
+@pytest.fixture
+def user_recipes(session_fixture: Session, test_user: User):
+    """Five user recipes, three of them under 400 kcal"""
+    for i, kcal in enumerate([200, 300, 350, 600, 800]):
+        session_fixture.add(Recipe(
+            recipe_name=f"Recipe {i}",
+            instructions="Mix",
+            estimated_calories=kcal,
+            created_by_user_id=test_user.id
+        ))
+    session_fixture.commit()
+
+
+class TestRecipeListingTotal:
+    """Test that the list query returns the same total as a separate count"""
+
+    def test_total_matches_count(self, session_fixture: Session, test_user: User, user_recipes):
+        recipes, total, is_estimate = crud_recipe.get_multi_with_total(
+            session_fixture, user_id=test_user.id, limit=2, max_calories=400
+        )
+
+        assert len(recipes) == 2
+        assert total == 3 == crud_recipe.count_with_filters(session_fixture, user_id=test_user.id, max_calories=400)
+        assert is_estimate is False
+
+    def test_page_past_the_end_still_reports_total(self, session_fixture: Session, test_user: User, user_recipes):
+        recipes, total, _ = crud_recipe.get_multi_with_total(session_fixture, user_id=test_user.id, skip=50, limit=2)
+
+        assert recipes == []
+        assert total == 5
+
+    def test_no_matches(self, session_fixture: Session, test_user: User, user_recipes):
+        recipes, total, _ = crud_recipe.get_multi_with_total(session_fixture, user_id=test_user.id, max_calories=10)
+
+        assert recipes == []
+        assert total == 0
+
+    def test_cursor_page_reports_full_total(self, client: TestClient, test_user_token: str, user_recipes):
+        headers = {"Authorization": f"Bearer {test_user_token}"}
+        first = client.get("/api/v1/recipes?limit=2", headers=headers).json()
+        second = client.get(f"/api/v1/recipes?limit=2&cursor={first['next_cursor']}", headers=headers).json()
+
+        assert first["total"] == second["total"] == 5
+
+    def test_estimate_falls_back_to_exact_on_sqlite(self, client: TestClient, test_user_token: str, user_recipes):
+        response = client.get(
+            "/api/v1/recipes?total=estimate&max_calories=400",
+            headers={"Authorization": f"Bearer {test_user_token}"}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 3
+        assert data["total_is_estimate"] is False
+
+    def test_estimate_explains_expanded_in_lists(self):
+        db = MagicMock()
+        db.get_bind.return_value.dialect = postgresql.dialect()
+        explain = db.connection.return_value.exec_driver_sql
+        explain.return_value.scalar.return_value = [{"Plan": {"Plan Rows": 2}}]
+
+        with patch.object(recipe_name_index_service, "search", return_value={4: 0, 7: 1}):
+            estimate = crud_recipe.estimate_count_with_filters(db, user_id=1, search="bolo", fuzzy=True)
+
+        statement, parameters = explain.call_args.args
+        assert estimate == 2
+        assert "POSTCOMPILE" not in statement
+        assert sorted(value for value in parameters.values() if value in (4, 7)) == [4, 7]
+
+    def test_invalid_total_mode_is_rejected(self, client: TestClient, test_user_token: str):
+        response = client.get("/api/v1/recipes?total=fast", headers={"Authorization": f"Bearer {test_user_token}"})
+        assert response.status_code == 422
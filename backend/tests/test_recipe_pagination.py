@@ -0,0 +1,115 @@
+"""
+Unit tests for keyset (cursor) pagination of GET /recipes.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.models.user_models import User
+from app.models.recipe_models import Recipe
+from app.core.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+
+@pytest.fixture
+def many_recipes(session_fixture: Session, test_user: User):
+    """Seven user recipes with distinct timestamps, some without calories"""
+    base = datetime(2025, 1, 1, 12, 0, 0)
+    calories = [300, None, 150, 300, 500, None, 50]
+    for i, kcal in enumerate(calories):
+        session_fixture.add(Recipe(
+            recipe_name=f"Recipe {chr(ord('G') - i)}",
+            instructions="Mix",
+            estimated_calories=kcal,
+            preparation_time_minutes=10 + i,
+            created_by_user_id=test_user.id,
+            created_at=base + timedelta(minutes=i)
+        ))
+    session_fixture.commit()
+
+
+def _walk(client: TestClient, token: str, params: str):
+    """Follow next_cursor until exhausted, returning recipe names in order"""
+    names = []
+    cursor = None
+    for _ in range(20):
+        url = f"/api/v1/recipes?limit=3&{params}"
+        if cursor:
+            url += f"&cursor={cursor}"
+        response = client.get(url, headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 200
+        data = response.json()
+        names.extend(r["recipe_name"] for r in data["recipes"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            return names
+    raise AssertionError("cursor pagination did not terminate")
+
+
+class TestRecipeKeysetPagination:
+    """Test cursor-based pagination for GET /recipes"""
+
+    def test_default_order_is_created_at(self, client: TestClient, test_user_token: str, many_recipes):
+        names = _walk(client, test_user_token, "")
+        assert names == [f"Recipe {c}" for c in "GFEDCBA"]
+
+    def test_sort_by_name_desc(self, client: TestClient, test_user_token: str, many_recipes):
+        names = _walk(client, test_user_token, "sort_by=name&sort_order=desc")
+        assert names == [f"Recipe {c}" for c in "GFEDCBA"]
+
+    def test_sort_by_calories_with_ties_and_nulls(self, client: TestClient, test_user_token: str, many_recipes):
+        names = _walk(client, test_user_token, "sort_by=calories")
+        # 50, 150, 300 (two rows, id order), 500, then NULLs by id
+        assert names == ["Recipe A", "Recipe E", "Recipe G", "Recipe D", "Recipe C", "Recipe F", "Recipe B"]
+
+    def test_sort_by_calories_desc_keeps_nulls_last(self, client: TestClient, test_user_token: str, many_recipes):
+        names = _walk(client, test_user_token, "sort_by=calories&sort_order=desc")
+        assert names == ["Recipe C", "Recipe D", "Recipe G", "Recipe E", "Recipe A", "Recipe B", "Recipe F"]
+
+    def test_cursor_pages_match_offset_pages(self, client: TestClient, test_user_token: str, many_recipes):
+        headers = {"Authorization": f"Bearer {test_user_token}"}
+        offset_names = []
+        for skip in (0, 3, 6):
+            data = client.get(f"/api/v1/recipes?limit=3&skip={skip}&sort_by=prep_time", headers=headers).json()
+            offset_names.extend(r["recipe_name"] for r in data["recipes"])
+
+        assert _walk(client, test_user_token, "sort_by=prep_time") == offset_names
+
+    def test_last_page_has_no_cursor(self, client: TestClient, test_user_token: str, many_recipes):
+        response = client.get("/api/v1/recipes?limit=50", headers={"Authorization": f"Bearer {test_user_token}"})
+        data = response.json()
+        assert len(data["recipes"]) == 7
+        assert data["next_cursor"] is None
+        assert data["total"] == 7
+
+    def test_invalid_cursor_returns_400(self, client: TestClient, test_user_token: str):
+        response = client.get("/api/v1/recipes?cursor=not-a-cursor", headers={"Authorization": f"Bearer {test_user_token}"})
+        assert response.status_code == 400
+
+    def test_cursor_for_other_sort_is_rejected(self, client: TestClient, test_user_token: str):
+        cursor = encode_cursor("name", "asc", "Recipe A", 1)
+        response = client.get(
+            f"/api/v1/recipes?sort_by=calories&cursor={cursor}",
+            headers={"Authorization": f"Bearer {test_user_token}"}
+        )
+        assert response.status_code == 400
+
+
+class TestCursorCodec:
+    """Test the opaque cursor encoding"""
+
+    def test_round_trip_datetime(self):
+        moment = datetime(2025, 6, 1, 8, 30, 15, 123)
+        cursor = encode_cursor("created_at", "desc", moment, 42)
+        assert decode_cursor(cursor, "created_at", "desc") == (moment, 42)
+
+    def test_round_trip_null_value(self):
+        cursor = encode_cursor("calories", "asc", None, 7)
+        assert decode_cursor(cursor, "calories", "asc") == (None, 7)
+
+    def test_mismatched_order_is_rejected(self):
+        cursor = encode_cursor("calories", "asc", 100, 7)
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor, "calories", "desc")
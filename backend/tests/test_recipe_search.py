@@ -0,0 +1,97 @@
+"""
+Unit tests for full-text recipe search (FTS5 backend on SQLite).
+"""
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.models.user_models import User
+from app.models.recipe_models import RecipeCreate, RecipeIngredientCreate, RecipeUpdate
+from app.crud.crud_recipe import recipe as crud_recipe
+from app.db.fulltext import tokenize_query
+
+
+def _create(session: Session, name: str, instructions: str, user_id=None):
+    return crud_recipe.create_with_user(
+        session,
+        obj_in=RecipeCreate(
+            recipe_name=name,
+            instructions=instructions,
+            ingredients=[RecipeIngredientCreate(ingredient_name="sal", required_quantity=1.0, required_unit="g")]
+        ),
+        user_id=user_id
+    )
+
+
+class TestRecipeFullTextSearch:
+    """Test the full-text search backend used by GET /recipes?search="""
+
+    def test_prefix_match_on_name(self, session_fixture: Session):
+        _create(session_fixture, "Spaghetti Carbonara", "Cook the pasta")
+        _create(session_fixture, "Caldo Verde", "Boil the potatoes")
+
+        results = crud_recipe.get_multi_with_filters(session_fixture, search="carbon")
+
+        assert [r.recipe_name for r in results] == ["Spaghetti Carbonara"]
+
+    def test_search_is_accent_insensitive(self, session_fixture: Session):
+        _create(session_fixture, "Frango com Limão", "Grelhar o frango")
+
+        assert len(crud_recipe.get_multi_with_filters(session_fixture, search="limao")) == 1
+        assert len(crud_recipe.get_multi_with_filters(session_fixture, search="LIMÃO")) == 1
+
+    def test_all_terms_are_required(self, session_fixture: Session):
+        _create(session_fixture, "Bacalhau com Natas", "Desfiar o bacalhau")
+        _create(session_fixture, "Bacalhau à Brás", "Fritar a batata palha")
+
+        results = crud_recipe.get_multi_with_filters(session_fixture, search="bacalhau natas")
+
+        assert [r.recipe_name for r in results] == ["Bacalhau com Natas"]
+
+    def test_name_matches_rank_above_instruction_matches(self, session_fixture: Session):
+        _create(session_fixture, "Arroz de Pato", "Servir com salada de tomate")
+        _create(session_fixture, "Salada de Tomate", "Cortar e temperar")
+
+        results = crud_recipe.get_multi_with_filters(session_fixture, search="tomate")
+
+        assert [r.recipe_name for r in results] == ["Salada de Tomate", "Arroz de Pato"]
+
+    def test_count_matches_results(self, session_fixture: Session):
+        for i in range(3):
+            _create(session_fixture, f"Sopa {i}", "Ferver")
+        _create(session_fixture, "Bolo", "Assar")
+
+        assert crud_recipe.count_with_filters(session_fixture, search="sopa") == 3
+        assert len(crud_recipe.get_multi_with_filters(session_fixture, search="sopa", limit=2)) == 2
+
+    def test_index_follows_updates(self, session_fixture: Session):
+        created = _create(session_fixture, "Old Name", "Nothing special")
+
+        crud_recipe.update_with_ingredients(session_fixture, db_obj=created, obj_in=RecipeUpdate(recipe_name="Feijoada"))
+
+        assert crud_recipe.count_with_filters(session_fixture, search="feijoada") == 1
+        assert crud_recipe.count_with_filters(session_fixture, search="old") == 0
+
+    def test_search_syntax_is_not_interpreted(self, session_fixture: Session):
+        _create(session_fixture, "Pão de Ló", "Bater os ovos")
+
+        assert crud_recipe.count_with_filters(session_fixture, search='pão" * (') == 1
+        assert crud_recipe.count_with_filters(session_fixture, search='"(') == 0
+
+    def test_search_respects_visibility(self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User):
+        _create(session_fixture, "Minha Feijoada", "Cozer o feijão", user_id=test_user.id)
+        _create(session_fixture, "Feijoada do Sistema", "Cozer o feijão")
+
+        response = client.get(
+            "/api/v1/recipes?search=feijoada",
+            headers={"Authorization": f"Bearer {test_user_token}"}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 1
+        assert [r["recipe_name"] for r in data["recipes"]] == ["Minha Feijoada"]
+
+    def test_tokenize_query(self):
+        assert tokenize_query('Frango, "limão" & arroz!') == ["frango", "limão", "arroz"]
+        assert tokenize_query("  ") == []
@@ -0,0 +1,163 @@
+"""
+Unit tests for semantic recipe search (GET /recipes/semantic-search).
+"""
+
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlmodel import Session
+
+from app.models.user_models import User
+from app.models.recipe_models import Recipe, RecipeCreate, RecipeIngredientCreate, RecipeUpdate
+from app.crud.crud_recipe import recipe as crud_recipe
+from app.core.embedding import SparseVectorIndex, hashed_term_frequencies
+from app.db.versioning import bump_versions, recipe_item_scope
+from app.services import recipe_embedding_service as embedding_module
+from app.services.recipe_embedding_service import recipe_embedding_service
+
+
+def _create(session: Session, name: str, ingredients, instructions: str = "Cozinhar", user_id=None):
+    return crud_recipe.create_with_user(
+        session,
+        obj_in=RecipeCreate(
+            recipe_name=name,
+            instructions=instructions,
+            ingredients=[
+                RecipeIngredientCreate(ingredient_name=ingredient, required_quantity=1.0, required_unit="g")
+                for ingredient in ingredients
+            ]
+        ),
+        user_id=user_id
+    )
+
+
+def _search(session: Session, query: str, user_id=None, limit: int = 10):
+    matches = recipe_embedding_service.search(session, query, user_id, limit=limit)
+    names = dict(
+        (row.id, row.recipe_name) for row in crud_recipe.get_summaries(session, ids=[r for r, _ in matches])
+    )
+    return [names[recipe_id] for recipe_id, _ in matches]
+
+
+class TestRecipeSemanticSearch:
+    """Test similarity search over recipe name, ingredients and instructions"""
+
+    def test_best_match_comes_first(self, session_fixture: Session):
+        _create(session_fixture, "Salmão Grelhado", ["salmão", "limão", "azeite"], "Grelhar o peixe com limão")
+        _create(session_fixture, "Feijoada", ["feijão preto", "chouriço", "carne de porco"], "Cozer lentamente")
+        _create(session_fixture, "Bolo de Chocolate", ["farinha", "chocolate", "açúcar"], "Levar ao forno")
+
+        assert _search(session_fixture, "peixe leve com limao")[0] == "Salmão Grelhado"
+        assert _search(session_fixture, "something with chocolate")[0] == "Bolo de Chocolate"
+
+    def test_unrelated_query_returns_nothing(self, session_fixture: Session):
+        _create(session_fixture, "Feijoada", ["feijão preto"], "Cozer")
+
+        assert _search(session_fixture, "xyzzy qwv") == []
+
+    def test_index_follows_creates_and_updates(self, session_fixture: Session):
+        created = _create(session_fixture, "Sopa", ["água"], "Ferver")
+        assert _search(session_fixture, "bacalhau") == []
+
+        _create(session_fixture, "Bacalhau com Natas", ["bacalhau", "natas"])
+        assert _search(session_fixture, "bacalhau") == ["Bacalhau com Natas"]
+
+        crud_recipe.update_with_ingredients(
+            session_fixture, db_obj=created,
+            obj_in=RecipeUpdate(ingredients=[RecipeIngredientCreate(ingredient_name="camarão", required_quantity=1.0, required_unit="g")])
+        )
+        assert _search(session_fixture, "camarao") == ["Sopa"]
+
+    def test_bulk_created_recipes_are_indexed(self, session_fixture: Session):
+        _create(session_fixture, "Sopa", ["água"])
+        assert _search(session_fixture, "pudim") == []
+
+        crud_recipe.create_many_with_user(session_fixture, objs_in=[
+            RecipeCreate(recipe_name="Pudim Flan", instructions="Caramelizar", ingredients=[])
+        ])
+
+        assert _search(session_fixture, "pudim") == ["Pudim Flan"]
+
+    def test_sync_refreshes_only_recipes_written_elsewhere(self, session_fixture: Session):
+        pudding = _create(session_fixture, "Pudim Flan", ["ovos", "leite"])
+        _create(session_fixture, "Sopa", ["água"])
+        assert _search(session_fixture, "pudim") == ["Pudim Flan"]
+        # A core UPDATE plus a version bump, as another worker process would commit
+        session_fixture.execute(update(Recipe).where(Recipe.id == pudding.id).values(recipe_name="Doce Caramelo"))
+        bump_versions(session_fixture.connection(), [recipe_item_scope(pudding.id)])
+        session_fixture.commit()
+        recipe_embedding_service._synced_at = 0.0
+
+        with patch.object(embedding_module, "_load_documents", wraps=embedding_module._load_documents) as load:
+            with recipe_embedding_service._build_lock:
+                assert _search(session_fixture, "caramelo") == []
+            assert load.call_count == 0
+
+            assert _search(session_fixture, "caramelo") == ["Doce Caramelo"]
+            assert [call.kwargs.get("recipe_ids") for call in load.call_args_list] == [{pudding.id}]
+
+    def test_endpoint_respects_visibility(self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User):
+        _create(session_fixture, "Sardinhas Assadas", ["sardinha"], user_id=test_user.id)
+        _create(session_fixture, "Sardinhas do Sistema", ["sardinha"])
+        _create(session_fixture, "Sardinhas de Outro", ["sardinha"], user_id=test_user.id + 1)
+
+        response = client.get(
+            "/api/v1/recipes/semantic-search?q=sardinhas",
+            headers={"Authorization": f"Bearer {test_user_token}"}
+        )
+        anonymous = client.get("/api/v1/recipes/semantic-search?q=sardinhas")
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert sorted(r["recipe"]["recipe_name"] for r in results) == ["Sardinhas Assadas", "Sardinhas do Sistema"]
+        assert all(0 < r["score"] <= 1 for r in results)
+        assert [r["recipe"]["recipe_name"] for r in anonymous.json()["results"]] == ["Sardinhas do Sistema"]
+
+    def test_endpoint_requires_query(self, client: TestClient):
+        assert client.get("/api/v1/recipes/semantic-search").status_code == 422
+
+
+class TestSparseVectorIndex:
+    """Test the hashed TF-IDF vectors and the inverted index"""
+
+    def test_identical_text_scores_highest(self):
+        index = SparseVectorIndex()
+        index.add(1, hashed_term_frequencies([("arroz de pato", 1.0)]))
+        index.add(2, hashed_term_frequencies([("bolo de laranja", 1.0)]))
+
+        (key, score), (_, other_score) = index.search(hashed_term_frequencies([("arroz de pato", 1.0)]), limit=2)
+        assert key == 1
+        # Not exactly 1: only the query is weighted by IDF
+        assert score > 0.95
+        assert other_score < 0.5
+
+    def test_accents_and_plurals_overlap(self):
+        index = SparseVectorIndex()
+        index.add(1, hashed_term_frequencies([("limões", 1.0)]))
+
+        assert index.search(hashed_term_frequencies([("limoes", 1.0)]), limit=1)[0][0] == 1
+        assert index.search(hashed_term_frequencies([("limao", 1.0)]), limit=1)[0][0] == 1
+
+    def test_removed_rows_are_compacted(self):
+        index = SparseVectorIndex()
+        for key in range(3000):
+            index.add(key, hashed_term_frequencies([(f"receita {key}", 1.0)]))
+        for key in range(2000):
+            index.remove(key)
+
+        assert len(index._keys) < 3000
+        assert len(index) == 1000
+        assert index.search(hashed_term_frequencies([("receita 2500", 1.0)]), limit=1)[0][0] == 2500
+        assert index.search(hashed_term_frequencies([("receita 5", 1.0)]), limit=1)[0][0] != 5
+
+    def test_remove_and_accept_filter(self):
+        index = SparseVectorIndex()
+        index.add(1, hashed_term_frequencies([("caldo verde", 1.0)]))
+        index.add(2, hashed_term_frequencies([("caldo verde", 1.0)]))
+
+        assert [key for key, _ in index.search(hashed_term_frequencies([("caldo", 1.0)]), 5, accept=lambda k: k == 2)] == [2]
+        index.remove(1)
+        index.remove(2)
+        assert len(index) == 0
+        assert index.search(hashed_term_frequencies([("caldo", 1.0)]), 5) == []
@@ -0,0 +1,169 @@
+"""
+Unit tests for "more like this" recipes (GET /recipes/{id}/similar).
+"""
+
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from sqlmodel import Session
+
+from app.models.user_models import User
+from app.models.recipe_models import Recipe, RecipeCreate, RecipeIngredient, RecipeIngredientCreate, RecipeUpdate
+from app.crud.crud_recipe import recipe as crud_recipe
+from app.core.minhash import MinHashLSH, jaccard
+from app.services import recipe_similarity_service as similarity_module
+from app.services.recipe_similarity_service import recipe_similarity_service
+
+
+def _create(session: Session, name: str, ingredients, user_id=None):
+    return crud_recipe.create_with_user(
+        session,
+        obj_in=RecipeCreate(
+            recipe_name=name,
+            instructions="Cozinhar",
+            ingredients=[
+                RecipeIngredientCreate(ingredient_name=ingredient, required_quantity=1.0, required_unit="g")
+                for ingredient in ingredients
+            ]
+        ),
+        user_id=user_id
+    )
+
+
+def _similar(session: Session, recipe_id: int, user_id=None):
+    return [similar_id for similar_id, _ in recipe_similarity_service.similar(session, recipe_id, user_id)]
+
+
+class TestRecipeSimilarity:
+    """Test ingredient-based recipe similarity"""
+
+    def test_ranked_by_shared_ingredients(self, session_fixture: Session):
+        base = _create(session_fixture, "Bacalhau com Natas", ["bacalhau", "natas", "batata", "cebola"])
+        close = _create(session_fixture, "Bacalhau à Brás", ["Bacalhau", "batata", "cebola", "ovos"])
+        farther = _create(session_fixture, "Batatas Fritas", ["batata", "óleo", "sal", "cebola"])
+        _create(session_fixture, "Bolo de Chocolate", ["farinha", "chocolate", "açúcar"])
+
+        results = recipe_similarity_service.similar(session_fixture, base.id, None)
+
+        assert [recipe_id for recipe_id, _ in results] == [close.id, farther.id]
+        assert results[0][1] == 0.6
+
+    def test_index_follows_ingredient_updates(self, session_fixture: Session):
+        base = _create(session_fixture, "Caldo Verde", ["couve", "batata", "chouriço"])
+        other = _create(session_fixture, "Sopa", ["água"])
+        assert _similar(session_fixture, base.id) == []
+
+        crud_recipe.update_with_ingredients(
+            session_fixture, db_obj=other,
+            obj_in=RecipeUpdate(ingredients=[
+                RecipeIngredientCreate(ingredient_name=name, required_quantity=1.0, required_unit="g")
+                for name in ("couve", "batata", "chouriço")
+            ])
+        )
+
+        assert _similar(session_fixture, base.id) == [other.id]
+
+    def test_bulk_created_recipes_are_indexed(self, session_fixture: Session):
+        base = _create(session_fixture, "Arroz de Pato", ["arroz", "pato", "chouriço"])
+        assert _similar(session_fixture, base.id) == []
+
+        (created_id, _), = crud_recipe.create_many_with_user(session_fixture, objs_in=[
+            RecipeCreate(recipe_name="Arroz de Frango", instructions="Cozer", ingredients=[
+                RecipeIngredientCreate(ingredient_name=name, required_quantity=1.0, required_unit="g")
+                for name in ("arroz", "frango", "chouriço")
+            ])
+        ])
+
+        assert _similar(session_fixture, base.id) == [created_id]
+
+    def test_writes_during_the_build_are_refreshed_without_a_rebuild(self, session_fixture: Session):
+        base = _create(session_fixture, "Caldo Verde", ["couve", "batata"])
+        load = similarity_module._load_ingredient_sets
+
+        def load_during_a_write(db, *, recipe_ids=None):
+            if recipe_ids is None:
+                recipe_similarity_service.invalidate([base.id])
+            return load(db, recipe_ids=recipe_ids)
+
+        with patch.object(similarity_module, "_load_ingredient_sets", side_effect=load_during_a_write) as loads:
+            _similar(session_fixture, base.id)
+            _similar(session_fixture, base.id)
+
+        assert [call.kwargs.get("recipe_ids") for call in loads.call_args_list] == [None, {base.id}]
+
+    def test_sync_picks_up_writes_from_other_processes(self, session_fixture: Session):
+        base = _create(session_fixture, "Caldo Verde", ["couve", "batata"])
+        assert _similar(session_fixture, base.id) == []
+        # Core statements skip the session listeners, like a write made by another worker
+        other_id = session_fixture.execute(
+            insert(Recipe).values(recipe_name="Sopa", instructions="Cozer")
+        ).inserted_primary_key[0]
+        session_fixture.execute(insert(RecipeIngredient), [
+            {"recipe_id": other_id, "ingredient_name": name, "normalized_name": name,
+             "required_quantity": 1.0, "required_unit": "g"}
+            for name in ("couve", "batata")
+        ])
+        session_fixture.commit()
+        assert _similar(session_fixture, base.id) == []
+
+        recipe_similarity_service._synced_at = 0.0
+        with patch.object(similarity_module, "_load_ingredient_sets", wraps=similarity_module._load_ingredient_sets) as loads:
+            with recipe_similarity_service._build_lock:
+                assert _similar(session_fixture, base.id) == []
+            assert _similar(session_fixture, base.id) == [other_id]
+
+        assert [call.kwargs.get("recipe_ids") for call in loads.call_args_list] == [{other_id}]
+
+    def test_endpoint_respects_visibility(self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User):
+        base = _create(session_fixture, "Base", ["arroz", "feijão"])
+        mine = _create(session_fixture, "Minha", ["arroz", "feijão", "sal"], user_id=test_user.id)
+        _create(session_fixture, "De Outro", ["arroz", "feijão"], user_id=test_user.id + 1)
+
+        response = client.get(
+            f"/api/v1/recipes/{base.id}/similar",
+            headers={"Authorization": f"Bearer {test_user_token}"}
+        )
+        anonymous = client.get(f"/api/v1/recipes/{base.id}/similar")
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["recipe"]["id"] for r in results] == [mine.id]
+        assert results[0]["similarity"] == round(2 / 3, 4)
+        assert anonymous.json()["results"] == []
+
+    def test_endpoint_checks_access(self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User):
+        other = _create(session_fixture, "De Outro", ["arroz"], user_id=test_user.id + 1)
+
+        headers = {"Authorization": f"Bearer {test_user_token}"}
+        assert client.get(f"/api/v1/recipes/{other.id}/similar", headers=headers).status_code == 403
+        assert client.get("/api/v1/recipes/999999/similar", headers=headers).status_code == 404
+
+
+class TestMinHashLSH:
+    """Test MinHash signatures and LSH candidate lookup"""
+
+    def test_identical_sets_always_collide(self):
+        index = MinHashLSH()
+        index.add(1, ["a", "b", "c"])
+        index.add(2, ["c", "b", "a"])
+
+        assert index.similar(1, 5) == [(2, 1.0)]
+
+    def test_dissimilar_sets_are_not_candidates(self):
+        index = MinHashLSH()
+        index.add(1, [f"x{i}" for i in range(20)])
+        index.add(2, [f"y{i}" for i in range(20)])
+
+        assert index.similar(1, 5) == []
+
+    def test_remove_and_empty_sets(self):
+        index = MinHashLSH()
+        index.add(1, ["a", "b"])
+        index.add(2, ["a", "b"])
+        index.add(3, [])
+
+        index.remove(2)
+        assert index.similar(1, 5) == []
+        assert index.similar(3, 5) == []
+        assert jaccard(frozenset("ab"), frozenset("bc")) == 1 / 3
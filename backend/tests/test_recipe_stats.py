@@ -0,0 +1,171 @@
+"""
+Unit tests for write-behind recipe popularity counters and GET /recipes/top.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, select
+
+from app.models.user_models import User
+from app.models.recipe_models import RecipeCreate
+from app.models.recipe_stats_models import RecipeStats
+from app.crud.crud_recipe import recipe as crud_recipe
+from app.crud.crud_user import user as crud_user
+from app.schemas.user import UserCreate
+from app.services.mealdb_service import MealDBIngredient, MealDBMeal
+from app.services.mealdb_import_service import MealDBImportService
+from app.services.recipe_stats_service import RecipeStatsService, recipe_stats_service
+
+
+def _recipe(session: Session, name: str, user_id=None):
+    return crud_recipe.create_with_user(
+        session, obj_in=RecipeCreate(recipe_name=name, instructions="Misturar"), user_id=user_id
+    )
+
+
+def _stats(session: Session):
+    session.expire_all()
+    return {
+        row.recipe_id: (row.views, row.imports, row.cooked)
+        for row in session.exec(select(RecipeStats)).all()
+    }
+
+
+class TestRecipeStatsService:
+    """Test in-memory aggregation and batched flushes"""
+
+    def test_events_are_aggregated_until_flush(self, session_fixture: Session):
+        first = _recipe(session_fixture, "Bolo")
+        second = _recipe(session_fixture, "Pudim")
+        service = RecipeStatsService()
+        for _ in range(3):
+            service.record(first.id, "views")
+        service.record(first.id, "cooked")
+        service.record(second.id, "imports")
+
+        assert _stats(session_fixture) == {}
+        assert service.flush(session_fixture.get_bind()) == 2
+        assert _stats(session_fixture) == {first.id: (3, 0, 1), second.id: (0, 1, 0)}
+        assert service.pending() == {}
+
+    def test_flush_adds_to_stored_counts_in_one_statement(self, session_fixture: Session):
+        created = _recipe(session_fixture, "Bolo")
+        other = _recipe(session_fixture, "Pudim")
+        service = RecipeStatsService()
+        service.record(created.id, "views", 5)
+        service.flush(session_fixture.get_bind())
+
+        service.record(created.id, "views", 2)
+        service.record(other.id, "views")
+        statements = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            if "recipe_stats" in statement:
+                statements.append(statement)
+
+        engine = session_fixture.get_bind()
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            service.flush(engine)
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+
+        assert len(statements) == 1
+        assert _stats(session_fixture) == {created.id: (7, 0, 0), other.id: (1, 0, 0)}
+
+    def test_deleted_recipes_are_skipped(self, session_fixture: Session):
+        created = _recipe(session_fixture, "Bolo")
+        service = RecipeStatsService()
+        service.record(created.id, "views")
+        service.record(999999, "views")
+
+        assert service.flush(session_fixture.get_bind()) == 1
+        assert _stats(session_fixture) == {created.id: (1, 0, 0)}
+
+    def test_failed_flush_keeps_counts(self, session_fixture: Session):
+        created = _recipe(session_fixture, "Bolo")
+        service = RecipeStatsService()
+        service.record(created.id, "views", 2)
+
+        with patch.object(service, "_upsert", side_effect=OperationalError("upsert", {}, Exception("down"))):
+            assert service.flush(session_fixture.get_bind()) == 0
+        service.record(created.id, "views")
+
+        assert service.pending() == {created.id: {"views": 3, "imports": 0, "cooked": 0}}
+        service.flush(session_fixture.get_bind())
+        assert _stats(session_fixture) == {created.id: (3, 0, 0)}
+
+    def test_background_flusher_flushes_on_stop(self, session_fixture: Session):
+        created = _recipe(session_fixture, "Bolo")
+        service = RecipeStatsService(flush_seconds=60)
+        service.start(session_fixture.get_bind())
+        service.record(created.id, "cooked")
+
+        service.stop(session_fixture.get_bind())
+
+        assert _stats(session_fixture) == {created.id: (0, 0, 1)}
+
+
+class TestRecipeStatsEndpoints:
+    """Test event recording and the top recipes listing"""
+
+    def test_views_and_cooked_are_recorded(self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User):
+        created = _recipe(session_fixture, "Bolo", user_id=test_user.id)
+        headers = {"Authorization": f"Bearer {test_user_token}"}
+
+        etag = client.get(f"/api/v1/recipes/{created.id}", headers=headers).headers["etag"]
+        client.get(f"/api/v1/recipes/{created.id}", headers={**headers, "If-None-Match": etag})
+        response = client.post(f"/api/v1/recipes/{created.id}/cooked", headers=headers)
+
+        assert response.status_code == 202
+        assert recipe_stats_service.pending() == {created.id: {"views": 2, "imports": 0, "cooked": 1}}
+
+    def test_cooked_checks_access(self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User):
+        other = _recipe(session_fixture, "De Outro", user_id=test_user.id + 1)
+        headers = {"Authorization": f"Bearer {test_user_token}"}
+
+        assert client.post(f"/api/v1/recipes/{other.id}/cooked", headers=headers).status_code == 403
+        assert client.post("/api/v1/recipes/999999/cooked", headers=headers).status_code == 404
+        assert recipe_stats_service.pending() == {}
+
+    def test_top_recipes(self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User):
+        mine = _recipe(session_fixture, "Minha", user_id=test_user.id)
+        system = _recipe(session_fixture, "Do Sistema")
+        other = _recipe(session_fixture, "De Outro", user_id=test_user.id + 1)
+        unviewed = _recipe(session_fixture, "Sem Visitas")
+        recipe_stats_service.record(mine.id, "views", 2)
+        recipe_stats_service.record(system.id, "views", 5)
+        recipe_stats_service.record(system.id, "cooked")
+        recipe_stats_service.record(other.id, "views", 9)
+        recipe_stats_service.record(unviewed.id, "cooked", 4)
+        recipe_stats_service.flush(session_fixture.get_bind())
+
+        response = client.get("/api/v1/recipes/top", headers={"Authorization": f"Bearer {test_user_token}"})
+        cooked = client.get("/api/v1/recipes/top?metric=cooked&limit=1")
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["recipe"]["recipe_name"] for r in results] == ["Do Sistema", "Minha"]
+        assert (results[0]["views"], results[0]["cooked"]) == (5, 1)
+        assert [r["recipe"]["recipe_name"] for r in cooked.json()["results"]] == ["Sem Visitas"]
+
+    def test_imports_count_on_canonical_recipe(self, session_fixture: Session, test_user: User):
+        other = crud_user.create(
+            session_fixture, obj_in=UserCreate(email="other@example.com", username="other", password="otherpassword123")
+        )
+        meal = MealDBMeal(
+            id="52772", name="Teriyaki Chicken", category="Chicken", instructions="Cook",
+            ingredients=[MealDBIngredient(name="soy sauce", measure="1 cup")]
+        )
+        service = MealDBImportService()
+        with patch.object(service.mealdb_service, "get_meal_by_id", AsyncMock(return_value=meal)):
+            first = asyncio.run(service.import_meal_by_id(session_fixture, "52772", test_user))
+            second = asyncio.run(service.import_meal_by_id(session_fixture, "52772", other))
+        recipe_stats_service.flush(session_fixture.get_bind())
+
+        assert first["recipe_id"] != second["recipe_id"]
+        assert _stats(session_fixture) == {first["recipe_id"]: (0, 2, 0)}
@@ -0,0 +1,111 @@
+"""
+Unit tests for the view=summary projection of GET /recipes.
+"""
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.models.user_models import User
+from app.models.recipe_models import RecipeCreate, RecipeIngredientCreate
+from app.crud.crud_recipe import recipe as crud_recipe
+
+SUMMARY_FIELDS = {
+    "id", "recipe_name", "image_url", "estimated_calories", "preparation_time_minutes",
+    "created_by_user_id", "created_at", "ingredient_count",
+}
+
+
+def _create(session: Session, name: str, ingredient_count: int, user_id: int, calories: int = 100):
+    return crud_recipe.create_with_user(
+        session,
+        obj_in=RecipeCreate(
+            recipe_name=name,
+            instructions="Long instructions " * 50,
+            estimated_calories=calories,
+            ingredients=[
+                RecipeIngredientCreate(ingredient_name=f"Ingrediente {i}", required_quantity=1.0, required_unit="g")
+                for i in range(ingredient_count)
+            ]
+        ),
+        user_id=user_id
+    )
+
+
+class TestRecipeSummaryView:
+    """Test GET /recipes?view=summary"""
+
+    def test_summary_fields_only(self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User):
+        _create(session_fixture, "Sopa", 3, test_user.id)
+
+        response = client.get("/api/v1/recipes?view=summary", headers={"Authorization": f"Bearer {test_user_token}"})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 1
+        recipe = data["recipes"][0]
+        assert set(recipe) == SUMMARY_FIELDS
+        assert recipe["recipe_name"] == "Sopa"
+        assert recipe["ingredient_count"] is None
+
+    def test_ingredient_count(self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User):
+        _create(session_fixture, "Sopa", 3, test_user.id)
+        _create(session_fixture, "Pão", 0, test_user.id)
+
+        response = client.get(
+            "/api/v1/recipes?view=summary&include_ingredient_count=true&sort_by=name",
+            headers={"Authorization": f"Bearer {test_user_token}"}
+        )
+
+        counts = {r["recipe_name"]: r["ingredient_count"] for r in response.json()["recipes"]}
+        assert counts == {"Pão": 0, "Sopa": 3}
+
+    def test_summary_does_not_read_instructions_or_ingredients(self, session_fixture: Session, test_user: User):
+        _create(session_fixture, "Sopa", 3, test_user.id)
+        user_id = test_user.id
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = session_fixture.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            rows, total, _ = crud_recipe.get_multi_with_total(
+                session_fixture, user_id=user_id, summary=True, include_ingredient_count=True
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert total == 1 and rows[0].ingredient_count == 3
+        assert len(statements) == 1
+        assert "instructions" not in statements[0]
+
+    def test_summary_cursor_pagination(self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User):
+        for i in range(5):
+            _create(session_fixture, f"Recipe {i}", 1, test_user.id, calories=100 + i)
+        headers = {"Authorization": f"Bearer {test_user_token}"}
+
+        first = client.get("/api/v1/recipes?view=summary&sort_by=calories&limit=3", headers=headers).json()
+        second = client.get(
+            f"/api/v1/recipes?view=summary&sort_by=calories&limit=3&cursor={first['next_cursor']}", headers=headers
+        ).json()
+
+        names = [r["recipe_name"] for r in first["recipes"] + second["recipes"]]
+        assert names == [f"Recipe {i}" for i in range(5)]
+        assert second["total"] == 5 and second["next_cursor"] is None
+
+    def test_summary_with_search(self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User):
+        _create(session_fixture, "Sopa de Legumes", 1, test_user.id)
+        _create(session_fixture, "Bolo", 1, test_user.id)
+
+        response = client.get("/api/v1/recipes?view=summary&search=sopa", headers={"Authorization": f"Bearer {test_user_token}"})
+
+        assert [r["recipe_name"] for r in response.json()["recipes"]] == ["Sopa de Legumes"]
+
+    def test_full_view_is_default(self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User):
+        _create(session_fixture, "Sopa", 2, test_user.id)
+
+        recipe = client.get("/api/v1/recipes", headers={"Authorization": f"Bearer {test_user_token}"}).json()["recipes"][0]
+
+        assert len(recipe["ingredients"]) == 2 and "instructions" in recipe
@@ -0,0 +1,136 @@
+"""
+Unit tests for the NDJSON recipe export / import endpoints.
+"""
+
+import gzip
+import json
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.core.security import create_access_token
+from app.crud.crud_user import user as crud_user
+from app.models.user_models import User
+from app.schemas.user import UserCreate
+from app.models.recipe_models import Recipe, RecipeCreate, RecipeIngredientCreate
+from app.crud.crud_recipe import recipe as crud_recipe
+from app.services.recipe_transfer_service import iter_export_gzip
+
+
+def _create(session: Session, name: str, user_id=None):
+    return crud_recipe.create_with_user(
+        session,
+        obj_in=RecipeCreate(
+            recipe_name=name,
+            instructions="Misturar",
+            estimated_calories=100,
+            ingredients=[RecipeIngredientCreate(ingredient_name="Sal", required_quantity=1.0, required_unit="g")]
+        ),
+        user_id=user_id
+    )
+
+
+def _line(name: str) -> bytes:
+    return json.dumps({
+        "recipe_name": name,
+        "instructions": "Misturar",
+        "ingredients": [{"ingredient_name": "Sal", "required_quantity": 1, "required_unit": "g"}]
+    }).encode()
+
+
+class TestRecipeExport:
+    """Test GET /recipes/export"""
+
+    def test_export_streams_gzipped_ndjson(self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User):
+        for i in range(3):
+            _create(session_fixture, f"Recipe {i}", user_id=test_user.id)
+        _create(session_fixture, "System recipe")
+
+        response = client.get("/api/v1/recipes/export", headers={"Authorization": f"Bearer {test_user_token}"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/gzip"
+        lines = gzip.decompress(response.content).decode().splitlines()
+        recipes = [json.loads(line) for line in lines]
+        assert [r["recipe_name"] for r in recipes] == ["Recipe 0", "Recipe 1", "Recipe 2"]
+        assert recipes[0]["ingredients"][0]["ingredient_name"] == "Sal"
+
+    def test_export_in_small_batches(self, session_fixture: Session, test_user: User):
+        for i in range(5):
+            _create(session_fixture, f"Recipe {i}", user_id=test_user.id)
+
+        data = b"".join(iter_export_gzip(session_fixture.get_bind(), test_user.id, batch_size=2))
+
+        assert len(gzip.decompress(data).splitlines()) == 5
+
+    def test_export_empty_collection(self, session_fixture: Session, test_user: User):
+        data = b"".join(iter_export_gzip(session_fixture.get_bind(), test_user.id))
+        assert gzip.decompress(data) == b""
+
+    def test_export_requires_authentication(self, client: TestClient):
+        assert client.get("/api/v1/recipes/export").status_code in (401, 403)
+
+
+class TestRecipeImport:
+    """Test POST /recipes/import"""
+
+    def test_round_trip(self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User):
+        headers = {"Authorization": f"Bearer {test_user_token}"}
+        for i in range(3):
+            _create(session_fixture, f"Recipe {i}", user_id=test_user.id)
+        exported = client.get("/api/v1/recipes/export", headers=headers).content
+        other = crud_user.create(
+            session_fixture, obj_in=UserCreate(email="other@example.com", username="other", password="otherpassword123")
+        )
+        other_token = create_access_token(data={"sub": other.email, "user_id": other.id})
+
+        response = client.post(
+            "/api/v1/recipes/import", content=exported, headers={"Authorization": f"Bearer {other_token}"}
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"imported": 3, "failed": 0, "errors": []}
+        names = session_fixture.exec(select(Recipe.recipe_name).where(Recipe.created_by_user_id == other.id)).all()
+        assert sorted(names) == [f"Recipe {i}" for i in range(3)]
+
+    def test_reimport_into_same_account_skips_duplicates(self, client: TestClient, test_user_token: str, session_fixture: Session, test_user: User):
+        headers = {"Authorization": f"Bearer {test_user_token}"}
+        created = _create(session_fixture, "Recipe 0", user_id=test_user.id)
+        exported = client.get("/api/v1/recipes/export", headers=headers).content
+
+        response = client.post("/api/v1/recipes/import", content=exported, headers=headers)
+
+        assert response.json() == {
+            "imported": 0, "failed": 1, "errors": [{"line": 1, "error": f"Duplicate of recipe {created.id}"}]
+        }
+
+    def test_plain_ndjson_with_bad_lines(self, client: TestClient, test_user_token: str, session_fixture: Session):
+        body = b"\n".join([_line("A"), b"{not json", b"", b'{"instructions": "x"}', _line("B")])
+
+        response = client.post(
+            "/api/v1/recipes/import", content=body, headers={"Authorization": f"Bearer {test_user_token}"}
+        )
+
+        data = response.json()
+        assert data["imported"] == 2 and data["failed"] == 2
+        assert [e["line"] for e in data["errors"]] == [2, 4]
+        assert "recipe_name" in data["errors"][1]["error"]
+
+    def test_corrupt_gzip_is_rejected(self, client: TestClient, test_user_token: str):
+        response = client.post(
+            "/api/v1/recipes/import",
+            content=b"\x1f\x8b" + b"garbage" * 10,
+            headers={"Authorization": f"Bearer {test_user_token}"}
+        )
+        assert response.status_code == 400
+
+    def test_oversized_gzip_line_is_rejected_without_inflating_it(self, client: TestClient, test_user_token: str):
+        # ~50 MB of one line compresses to ~50 KB
+        body = gzip.compress(b"x" * (50 * 1024 * 1024))
+
+        response = client.post(
+            "/api/v1/recipes/import", content=body, headers={"Authorization": f"Bearer {test_user_token}"}
+        )
+
+        assert response.status_code == 400
+        assert "exceeds" in response.json()["detail"]
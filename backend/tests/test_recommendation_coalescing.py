@@ -0,0 +1,130 @@
+"""
+Unit tests for single-flight coalescing of concurrent recommendation requests.
+"""
+
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.singleflight import SingleFlight
+from app.schemas.recommendations import RecommendationFilters, RecommendationSort
+from app.services.recommendation_service import _recommendation_key
+
+
+def _run_concurrently(flight: SingleFlight, key, fn, callers: int):
+    results = [None] * callers
+    errors = [None] * callers
+
+    def worker(i):
+        try:
+            results[i] = flight.do(key, fn)
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    return results, errors
+
+
+class TestSingleFlight:
+    """Test the SingleFlight primitive"""
+
+    def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        calls = []
+        release = threading.Event()
+
+        def compute():
+            calls.append(1)
+            release.wait(timeout=5)
+            return {"value": 42}
+
+        holder = threading.Thread(target=lambda: flight.do("k", compute))
+        holder.start()
+        while flight.stats()["in_flight"] == 0:
+            time.sleep(0.001)
+
+        def join():
+            return flight.do("k", compute)
+
+        followers = [threading.Thread(target=join) for _ in range(2)]
+        for thread in followers:
+            thread.start()
+        while flight.stats()["coalesced"] < 2:
+            time.sleep(0.001)
+        release.set()
+        holder.join(timeout=5)
+        for thread in followers:
+            thread.join(timeout=5)
+
+        stats = flight.stats()
+        assert len(calls) == 1
+        assert stats["executions"] == 1
+        assert stats["coalesced"] == 2
+        assert stats["in_flight"] == 0
+        assert stats["coalesce_rate"] == pytest.approx(2 / 3, abs=1e-3)
+
+    def test_sequential_calls_are_not_cached(self):
+        flight = SingleFlight()
+        counter = iter(range(10))
+
+        assert flight.do("k", lambda: next(counter)) == 0
+        assert flight.do("k", lambda: next(counter)) == 1
+        assert flight.stats()["coalesced"] == 0
+
+    def test_different_keys_run_independently(self):
+        flight = SingleFlight()
+
+        assert flight.do("a", lambda: "a") == "a"
+        assert flight.do("b", lambda: "b") == "b"
+        assert flight.stats()["executions"] == 2
+
+    def test_error_is_propagated_to_all_waiters(self):
+        flight = SingleFlight()
+
+        def compute():
+            time.sleep(0.05)
+            raise ValueError("boom")
+
+        results, errors = _run_concurrently(flight, "k", compute, callers=3)
+        assert all(isinstance(error, ValueError) for error in errors)
+        assert flight.stats()["in_flight"] == 0
+
+
+class TestRecommendationCoalescingKey:
+    """Test normalization of recommendation parameters into a coalescing key"""
+
+    def test_default_objects_match_none(self):
+        explicit = _recommendation_key(1, RecommendationFilters(), RecommendationSort(), True, None, None, False)
+        implicit = _recommendation_key(1, None, None, True, None, None, False)
+        assert explicit == implicit
+
+    def test_key_depends_on_user_and_parameters(self):
+        base = _recommendation_key(1, None, None, True, None, None, False)
+        assert base != _recommendation_key(2, None, None, True, None, None, False)
+        assert base != _recommendation_key(1, RecommendationFilters(max_calories=500), None, True, None, None, False)
+        assert base != _recommendation_key(1, None, None, True, None, 10, False)
+
+
+class TestRecommendationMetricsEndpoint:
+    """Test the coalescing metrics endpoint"""
+
+    def test_metrics_requires_auth(self, client: TestClient):
+        response = client.get("/api/v1/recommendations/metrics")
+        assert response.status_code == 403
+
+    def test_metrics_count_executions(self, client: TestClient, test_user_token: str):
+        headers = {"Authorization": f"Bearer {test_user_token}"}
+        before = client.get("/api/v1/recommendations/metrics", headers=headers).json()
+
+        response = client.get("/api/v1/recommendations", headers=headers)
+        assert response.status_code == 200
+
+        after = client.get("/api/v1/recommendations/metrics", headers=headers).json()
+        assert after["executions"] == before["executions"] + 1
+        assert set(after) == {"total_calls", "executions", "coalesced", "in_flight", "coalesce_rate"}